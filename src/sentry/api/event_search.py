@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import re
-from collections import namedtuple
+import threading
+from collections import OrderedDict, namedtuple
+from copy import deepcopy
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from functools import reduce
 from typing import Any, List, Mapping, NamedTuple, Sequence, Set, Tuple, Union
 
+from django.conf import settings
 from django.utils.functional import cached_property
 from parsimonious.exceptions import IncompleteParseError
 from parsimonious.expressions import Optional
@@ -37,6 +40,7 @@ from sentry.search.utils import (
     parse_size,
 )
 from sentry.snuba.dataset import Dataset
+from sentry.utils import metrics
 from sentry.utils.snuba import is_duration_measurement, is_measurement, is_span_op_breakdown
 from sentry.utils.validators import is_event_id, is_span_id
 
@@ -450,6 +454,17 @@ class AggregateKey(NamedTuple):
     name: str
 
 
+class SimpleTerm(NamedTuple):
+    """
+    A term of a query read by `tokenize_simple_query`: either a ``key:value`` filter, or free
+    text if ``key`` is ``None``.
+    """
+
+    negated: bool
+    key: str | None
+    value: str
+
+
 @dataclass
 class SearchConfig:
     """
@@ -514,6 +529,8 @@ class SearchVisitor(NodeVisitor):
             config = SearchConfig()
         self.config = config
         self.params = params if params is not None else {}
+        # Whether the results depend on the current time (relative date filters).
+        self.is_time_relative = False
         if builder is None:
             # Avoid circular import
             from sentry.search.events.builder import UnresolvedQuery
@@ -585,7 +602,10 @@ class SearchVisitor(NodeVisitor):
     def visit_free_text(self, node, children):
         if not children[0]:
             return None
-        return SearchFilter(SearchKey(self.config.free_text_key), "=", SearchValue(children[0]))
+        return self._handle_free_text(children[0])
+
+    def _handle_free_text(self, text):
+        return SearchFilter(SearchKey(self.config.free_text_key), "=", SearchValue(text))
 
     def visit_paren_group(self, node, children):
         if not self.config.allow_boolean:
@@ -676,6 +696,7 @@ class SearchVisitor(NodeVisitor):
                 from_val, to_val = parse_datetime_range(value.text)
             except InvalidQuery as exc:
                 raise InvalidSearchQuery(str(exc))
+            self.is_time_relative = True
 
             # TODO: Handle negations
             if from_val is not None:
@@ -885,6 +906,7 @@ class SearchVisitor(NodeVisitor):
                 from_val, to_val = parse_datetime_range(search_value.text)
             except InvalidQuery as exc:
                 raise InvalidSearchQuery(str(exc))
+            self.is_time_relative = True
 
             if from_val is not None:
                 operator = ">="
@@ -909,12 +931,17 @@ class SearchVisitor(NodeVisitor):
                 'Invalid format for "has" search: was expecting a field or tag instead'
             )
 
-        operator = "=" if is_negated(negation) else "!="
+        return self._handle_has_filter(is_negated(negation), search_key)
+
+    def _handle_has_filter(self, negated, search_key):
+        operator = "=" if negated else "!="
         return SearchFilter(search_key, operator, SearchValue(""))
 
     def visit_is_filter(self, node, children):
         negation, _, _, _, search_value = children
+        return self._handle_is_filter(is_negated(negation), search_value)
 
+    def _handle_is_filter(self, negated, search_value):
         translators = self.config.is_filter_translation
 
         if not translators:
@@ -931,7 +958,7 @@ class SearchVisitor(NodeVisitor):
 
         search_key, search_value = translators[search_value.raw_value]
 
-        operator = "!=" if is_negated(negation) else "="
+        operator = "!=" if negated else "="
         search_key = SearchKey(search_key)
         search_value = SearchValue(search_value)
 
@@ -975,6 +1002,31 @@ class SearchVisitor(NodeVisitor):
 
     # --- End of filter visitors
 
+    def visit_simple_terms(self, terms: Sequence[SimpleTerm]) -> list[SearchFilter]:
+        """
+        Interprets the terms of a query read by `tokenize_simple_query`, in the same way as the
+        filters they are parsed to by the grammar.
+        """
+        search_filters = []
+        for term in terms:
+            if term.key is None:
+                search_filters.append(self._handle_free_text(term.value))
+                continue
+
+            search_key = self.visit_search_key(None, [term.key])
+            if term.key == "has":
+                search_filters.append(
+                    self._handle_has_filter(term.negated, self.visit_search_key(None, [term.value]))
+                )
+            elif term.key == "is":
+                search_filters.append(self._handle_is_filter(term.negated, SearchValue(term.value)))
+            else:
+                operator = OPERATOR_NEGATION_MAP["="] if term.negated else "="
+                search_filters.append(
+                    self._handle_text_filter(search_key, operator, SearchValue(term.value))
+                )
+        return search_filters
+
     def visit_key(self, node, children):
         return node.text
 
@@ -1167,11 +1219,62 @@ default_config = SearchConfig(
 )
 
 
-def parse_search_query(
-    query, config=None, params=None, builder=None, config_overrides=None
-) -> list[SearchFilter]:
-    if config is None:
-        config = default_config
+class ParseCache:
+    """
+    A bounded, in-process LRU used to memoize `parse_search_query`.
+
+    The same query strings are parsed over and over (issue stream polling, dashboard refreshes,
+    alert rule snapshots). Entries are never handed out directly, so callers are free to modify
+    the results they get.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._data: OrderedDict[Any, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+        metrics.incr(
+            "event_search.parse_cache",
+            tags={"cache": self.name, "cache_hit": "true" if value is not None else "false"},
+            sample_rate=0.1,
+        )
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        max_size = settings.SENTRY_EVENT_SEARCH_PARSE_CACHE_SIZE
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Parsimonious trees of query strings, which only depend on the query.
+_parse_tree_cache = ParseCache("tree")
+# Fully visited queries, for parses that do not depend on a query builder. Keyed by the query and
+# the identity of the config; the config itself is stored along with the results to guard against
+# a different config reusing the id of a collected one.
+_search_filter_cache = ParseCache("filters")
+
+
+def _parse_tree(query: str) -> Node:
+    use_cache = settings.SENTRY_EVENT_SEARCH_PARSE_CACHE_SIZE > 0
+    if use_cache:
+        tree = _parse_tree_cache.get(query)
+        if tree is not None:
+            return tree
 
     try:
         tree = event_search_grammar.parse(query)
@@ -1186,6 +1289,122 @@ def parse_search_query(
             )
         )
 
+    if use_cache:
+        _parse_tree_cache.set(query, tree)
+    return tree
+
+
+_SIMPLE_KEY_RE = re.compile(r"[a-zA-Z0-9_.-]+")
+# Unquoted values may not start with anything that could begin a number, date, duration,
+# operator or list, since the grammar parses those as different kinds of filters.
+_SIMPLE_VALUE_RE = re.compile(r'[^\s()\[\]"0-9+\-<>=!][^\s()\[\]"]*')
+_SIMPLE_FREE_TEXT_RE = re.compile(r'[^\s()\[\]":]+')
+_BOOLEAN_WORDS = frozenset(["and", "or", "true", "false"])
+
+
+def tokenize_simple_query(query: str) -> list[SimpleTerm] | None:
+    """
+    Reads queries made of space separated (optionally negated) ``key:value`` filters with plain
+    or quoted values, ``has:`` and ``is:`` filters and free text, without the grammar.
+
+    Returns ``None`` for anything else (boolean operators, parentheses, lists, aggregates,
+    numeric, date or boolean values, malformed terms), which has to be parsed by the grammar.
+    """
+    terms: list[SimpleTerm] = []
+    # Consecutive words of free text form a single term.
+    free_text_start = free_text_end = -1
+    length = len(query)
+    pos = 0
+    while True:
+        while pos < length and query[pos] == " ":
+            pos += 1
+        if pos == length:
+            break
+
+        negated = query[pos] == "!"
+        key_match = _SIMPLE_KEY_RE.match(query, pos + negated)
+        if key_match is None or query[key_match.end() : key_match.end() + 1] != ":":
+            word_match = _SIMPLE_FREE_TEXT_RE.match(query, pos)
+            if word_match is None or query[word_match.end() : word_match.end() + 1] not in (
+                "",
+                " ",
+            ):
+                return None
+            if word_match.group().lower() in _BOOLEAN_WORDS:
+                return None
+            if free_text_start == -1:
+                free_text_start = pos
+            free_text_end = pos = word_match.end()
+            continue
+
+        if free_text_start != -1:
+            terms.append(SimpleTerm(False, None, query[free_text_start:free_text_end]))
+            free_text_start = -1
+
+        key = key_match.group()
+        pos = key_match.end() + 1
+        if query[pos : pos + 1] == '"':
+            if key in ("has", "is"):
+                return None
+            # Same as the `quoted_value` rule: escaped quotes don't end the value.
+            end = pos + 1
+            while end < length and query[end] != '"':
+                end += 2 if query[end : end + 2] == '\\"' else 1
+            if end >= length or query[end + 1 : end + 2] not in ("", " "):
+                return None
+            value = query[pos + 1 : end].replace('\\"', '"')
+            pos = end + 1
+        else:
+            value_match = _SIMPLE_VALUE_RE.match(query, pos)
+            if value_match is None or query[value_match.end() : value_match.end() + 1] not in (
+                "",
+                " ",
+            ):
+                return None
+            value = value_match.group()
+            if value.lower() in _BOOLEAN_WORDS:
+                return None
+            if key == "has" and _SIMPLE_KEY_RE.fullmatch(value) is None:
+                return None
+            pos = value_match.end()
+
+        terms.append(SimpleTerm(negated, key, value))
+
+    if free_text_start != -1:
+        terms.append(SimpleTerm(False, None, query[free_text_start:free_text_end]))
+    return terms
+
+
+def parse_search_query(
+    query, config=None, params=None, builder=None, config_overrides=None
+) -> list[SearchFilter]:
+    if config is None:
+        config = default_config
+
+    # With a builder (or overrides) the results depend on the builder's state, such as the custom
+    # measurements of the queried projects. Without one, `params` are only used to set up the
+    # default builder, which does not look at them to interpret the query.
+    cache_key = None
+    if builder is None and not config_overrides and settings.SENTRY_EVENT_SEARCH_PARSE_CACHE_SIZE:
+        cache_key = (query, id(config))
+        cached = _search_filter_cache.get(cache_key)
+        if cached is not None and cached[0] is config:
+            return deepcopy(cached[1])
+
+    # Most queries (such as `is:unresolved assigned:me`) are simple enough to skip the grammar.
+    terms = tokenize_simple_query(query)
+    tree = _parse_tree(query) if terms is None else None
+    metrics.incr(
+        "event_search.simple_query",
+        tags={"simple": str(terms is not None).lower()},
+        sample_rate=0.1,
+    )
+
     if config_overrides:
         config = SearchConfig.create_from(config, **config_overrides)
-    return SearchVisitor(config, params=params, builder=builder).visit(tree)
+    visitor = SearchVisitor(config, params=params, builder=builder)
+    search_filters = visitor.visit(tree) if terms is None else visitor.visit_simple_terms(terms)
+
+    if cache_key is not None and not visitor.is_time_relative:
+        _search_filter_cache.set(cache_key, (config, deepcopy(search_filters)))
+    return search_filters
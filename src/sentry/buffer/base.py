@@ -1,9 +1,21 @@
-from django.db.models import F
+from __future__ import annotations
+
+from typing import Any, Mapping, Sequence, Tuple, Type
+
+from django.db.models import Case, F, Model, Value, When
+from django.db.models.signals import post_save
 
 from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
 from sentry.utils.services import Service
 
+# (model, columns, filters, extra, signal_only) as handed to `Buffer.process`
+BufferedIncr = Tuple[Type[Model], Mapping[str, int], Mapping[str, Any], Any, Any]
+
+# Filters that address a single row by its primary key and can therefore be
+# combined into one multi-row UPDATE.
+_PK_FILTERS = frozenset(["id", "pk"])
+
 
 class Buffer(Service):
     """
@@ -19,7 +31,7 @@ class Buffer(Service):
     keep up with the updates.
     """
 
-    __all__ = ("get", "incr", "process", "process_pending", "validate")
+    __all__ = ("get", "incr", "incr_many", "process", "process_pending", "validate")
 
     def get(self, model, columns, filters):
         """
@@ -45,6 +57,14 @@ class Buffer(Service):
             }
         )
 
+    def incr_many(self, items: Sequence[BufferedIncr]) -> None:
+        """
+        Increments many ``(model, columns, filters, extra, signal_only)`` tuples. Backends that can
+        send them in one round trip should override this.
+        """
+        for model, columns, filters, extra, signal_only in items:
+            self.incr(model, columns, filters, extra, signal_only)
+
     def process_pending(self, partition=None):
         return []
 
@@ -93,3 +113,80 @@ class Buffer(Service):
             created=created,
             sender=model,
         )
+
+    def process_batch(self, batch: Sequence[BufferedIncr]) -> None:
+        """
+        Applies many buffered increments at once. Group increments addressed by primary key are
+        written with a single multi-row UPDATE, everything else goes through `process` one by one.
+        """
+        from sentry.models.group import Group
+
+        groups: dict[int, BufferedIncr] = {}
+        for item in batch:
+            model, columns, filters, extra, signal_only = item
+            if (
+                model is Group
+                and not signal_only
+                and len(filters) == 1
+                and next(iter(filters)) in _PK_FILTERS
+                and next(iter(filters.values())) not in groups
+            ):
+                groups[next(iter(filters.values()))] = item
+            else:
+                Buffer.process(self, model, columns, filters, extra, signal_only)
+
+        if groups:
+            self._bulk_update_groups(groups)
+
+    def _bulk_update_groups(self, groups: Mapping[int, BufferedIncr]) -> None:
+        from sentry.event_manager import ScoreClause
+        from sentry.models.group import Group
+
+        columns: dict[str, list[When]] = {}
+        extras: dict[str, list[When]] = {}
+        scores: list[When] = []
+        for group_id, (_, incr, _, extra, _) in groups.items():
+            for column, amount in incr.items():
+                columns.setdefault(column, []).append(When(id=group_id, then=Value(amount)))
+            for column, value in (extra or {}).items():
+                field = Group._meta.get_field(column)
+                extras.setdefault(column, []).append(
+                    When(id=group_id, then=Value(value, output_field=field))
+                )
+            if extra and "last_seen" in extra and "times_seen" in incr:
+                scores.append(
+                    When(
+                        id=group_id,
+                        then=ScoreClause(
+                            group=None, times_seen=incr["times_seen"], last_seen=extra["last_seen"]
+                        ),
+                    )
+                )
+
+        update_kwargs: dict[str, Any] = {}
+        for column, whens in columns.items():
+            field = Group._meta.get_field(column)
+            update_kwargs[column] = F(column) + Case(*whens, default=Value(0), output_field=field)
+        for column, whens in extras.items():
+            field = Group._meta.get_field(column)
+            update_kwargs[column] = Case(*whens, default=F(column), output_field=field)
+        if scores:
+            field = Group._meta.get_field("score")
+            update_kwargs["score"] = Case(*scores, default=F("score"), output_field=field)
+
+        if update_kwargs:
+            Group.objects.filter(id__in=list(groups)).update(**update_kwargs)
+            # `QuerySet.update` doesn't fire `post_save`, which is what keeps the group cache
+            # fresh (see the comment in `process`), so reload the rows and send it ourselves.
+            for group in Group.objects.filter(id__in=list(groups)):
+                post_save.send(sender=Group, instance=group, created=False)
+
+        for _, (model, incr, filters, extra, _) in groups.items():
+            buffer_incr_complete.send_robust(
+                model=model,
+                columns=incr,
+                filters=filters,
+                extra=extra,
+                created=False,
+                sender=model,
+            )
@@ -0,0 +1,248 @@
+"""
+In-process write combining for `Buffer.incr`.
+
+A hot group can receive thousands of events per second in a single ingest consumer, and every one
+of them used to be its own round trip to the buffer backend. `IncrCoalescer` merges increments for
+the same ``(model, filters)`` in memory and hands them to `Buffer.incr_many` in one go once a time
+window, an increment count or a key count threshold is reached. Whatever is left is flushed on
+process shutdown.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from typing import Any, Callable, Mapping, MutableMapping, Optional, Tuple, Type
+
+from django.db.models import Model
+
+from sentry import options
+from sentry.buffer.base import BufferedIncr
+from sentry.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+CoalescingKey = Tuple[Type[Model], Tuple[Tuple[str, Any], ...]]
+
+# Upper bound, in seconds, of the backoff between flushes after a failed one.
+MAX_FLUSH_BACKOFF = 30.0
+
+
+class _PendingIncr:
+    __slots__ = ("model", "columns", "filters", "extra", "signal_only")
+
+    def __init__(self, model: Type[Model], filters: Mapping[str, Any]) -> None:
+        self.model = model
+        self.filters = filters
+        self.columns: MutableMapping[str, int] = {}
+        self.extra: MutableMapping[str, Any] = {}
+        self.signal_only: Optional[bool] = None
+
+    def merge(
+        self,
+        columns: Mapping[str, int],
+        extra: Optional[Mapping[str, Any]],
+        signal_only: Optional[bool],
+    ) -> None:
+        for column, amount in columns.items():
+            self.columns[column] = self.columns.get(column, 0) + amount
+        if extra:
+            # Same semantics as the Redis hash: last write wins.
+            self.extra.update(extra)
+        if signal_only is True:
+            self.signal_only = True
+
+    def as_incr(self) -> BufferedIncr:
+        return self.model, self.columns, self.filters, self.extra or None, self.signal_only
+
+
+class IncrCoalescer:
+    """
+    Merges buffer increments per ``(model, filters)`` and flushes them through ``flush_func``.
+
+    Flushes happen when the oldest pending increment is older than ``window`` seconds, when
+    ``max_increments`` increments were merged, or when ``max_keys`` distinct keys are pending,
+    which bounds the memory held by the coalescer. A daemon thread takes care of flushing idle
+    windows.
+
+    Increments of a failed flush are kept, up to ``max_keys``, and retried once a backoff has
+    passed. While backing off with ``max_keys`` pending, increments for new keys are passed
+    straight through to ``flush_func``, so that its errors reach the caller.
+    """
+
+    def __init__(
+        self,
+        flush_func: Callable[[list[BufferedIncr]], None],
+        window: float = 1.0,
+        max_increments: int = 1000,
+        max_keys: int = 1000,
+    ) -> None:
+        self.flush_func = flush_func
+        self.window = window
+        self.max_increments = max_increments
+        self.max_keys = max_keys
+
+        self._lock = threading.Lock()
+        self._pending: dict[CoalescingKey, _PendingIncr] = {}
+        self._increments = 0
+        self._window_start: Optional[float] = None
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        self._flusher: Optional[threading.Thread] = None
+        self._shutdown = threading.Event()
+
+    def incr(
+        self,
+        model: Type[Model],
+        columns: Mapping[str, int],
+        filters: Mapping[str, Any],
+        extra: Optional[Mapping[str, Any]] = None,
+        signal_only: Optional[bool] = None,
+    ) -> None:
+        try:
+            key: CoalescingKey = (model, tuple(sorted(filters.items())))
+            hash(key)
+        except TypeError:
+            # Filters we can't use as a key are passed straight through.
+            self.flush_func([(model, columns, filters, extra, signal_only)])
+            return
+
+        self._ensure_flusher()
+
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                if len(self._pending) >= self.max_keys:
+                    # Only happens while backing off from a failed flush.
+                    pending = None
+                else:
+                    pending = self._pending[key] = _PendingIncr(model, filters)
+            if pending is not None:
+                pending.merge(columns, extra, signal_only)
+                self._increments += 1
+                if self._window_start is None:
+                    self._window_start = time.monotonic()
+
+            should_flush = not self._backing_off() and (
+                self._increments >= self.max_increments or len(self._pending) >= self.max_keys
+            )
+
+        if pending is None:
+            metrics.incr("buffer.coalesce.pass-through", skip_internal=True)
+            self.flush_func([(model, columns, filters, extra, signal_only)])
+        elif should_flush:
+            self.flush(reason="threshold")
+
+    def flush(self, reason: str = "manual") -> None:
+        with self._lock:
+            pending, increments = self._pending, self._increments
+            self._pending = {}
+            self._increments = 0
+            self._window_start = None
+
+        if not pending:
+            return
+
+        metrics.incr("buffer.coalesce.flush", tags={"reason": reason}, skip_internal=True)
+        metrics.distribution("buffer.coalesce.increments", increments)
+        metrics.distribution("buffer.coalesce.keys", len(pending))
+        metrics.distribution("buffer.coalesce.ratio", increments / len(pending))
+
+        try:
+            self.flush_func([item.as_incr() for item in pending.values()])
+        except Exception:
+            logger.exception("buffer.coalesce.flush-failed", extra={"keys": len(pending)})
+            self._requeue(pending, increments)
+        else:
+            with self._lock:
+                self._backoff = 0.0
+                self._retry_at = 0.0
+
+    def _requeue(self, pending: dict[CoalescingKey, _PendingIncr], increments: int) -> None:
+        """
+        Puts the increments of a failed flush back, as far as ``max_keys`` allows, so that the
+        next flush retries them, and backs off from flushing.
+        """
+        dropped = 0
+        with self._lock:
+            for key, item in pending.items():
+                newer = self._pending.get(key)
+                if newer is not None:
+                    # Increments merged since the failed flush are newer, so their extra wins.
+                    item.merge(newer.columns, newer.extra, newer.signal_only)
+                elif len(self._pending) >= self.max_keys:
+                    dropped += 1
+                    continue
+                self._pending[key] = item
+            self._increments += increments
+            if self._window_start is None:
+                self._window_start = time.monotonic()
+
+            self._backoff = min(max(self._backoff * 2, self.window), MAX_FLUSH_BACKOFF)
+            self._retry_at = time.monotonic() + self._backoff
+
+        if dropped:
+            metrics.incr("buffer.coalesce.dropped", amount=dropped, skip_internal=True)
+            logger.error("buffer.coalesce.dropped", extra={"keys": dropped})
+
+    def _backing_off(self) -> bool:
+        return time.monotonic() < self._retry_at
+
+    def _window_expired(self) -> bool:
+        window_start = self._window_start
+        return window_start is not None and time.monotonic() - window_start >= self.window
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(
+                target=self._run_flusher, name="buffer-coalescer", daemon=True
+            )
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def _run_flusher(self) -> None:
+        while not self._shutdown.wait(self.window / 2):
+            if self._window_expired() and not self._backing_off():
+                self.flush(reason="window")
+
+    def close(self) -> None:
+        self._shutdown.set()
+        self.flush(reason="shutdown")
+        if self._pending:
+            # Nothing is left to retry the failed final flush.
+            metrics.incr("buffer.coalesce.dropped", amount=len(self._pending), skip_internal=True)
+            logger.error("buffer.coalesce.shutdown-dropped", extra={"keys": len(self._pending)})
+
+
+_coalescer: Optional[IncrCoalescer] = None
+_coalescer_lock = threading.Lock()
+
+
+def _flush_to_buffer(items: list[BufferedIncr]) -> None:
+    from sentry import buffer
+
+    buffer.incr_many(items)
+
+
+def get_coalescer() -> IncrCoalescer:
+    """
+    Returns the process-wide coalescer, creating it from the current options on first use.
+    """
+    global _coalescer
+
+    if _coalescer is None:
+        with _coalescer_lock:
+            if _coalescer is None:
+                _coalescer = IncrCoalescer(
+                    _flush_to_buffer,
+                    window=options.get("buffer.coalesce-incr.window"),
+                    max_increments=options.get("buffer.coalesce-incr.max-increments"),
+                    max_keys=options.get("buffer.coalesce-incr.max-keys"),
+                )
+    return _coalescer
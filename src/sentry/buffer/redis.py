@@ -9,7 +9,8 @@ from time import time
 from django.db import models
 from django.utils.encoding import force_bytes, force_str
 
-from sentry.buffer.base import Buffer
+from sentry import options
+from sentry.buffer.base import Buffer, BufferedIncr
 from sentry.tasks.process_buffer import process_incr, process_pending
 from sentry.utils import json, metrics
 from sentry.utils.compat import crc32
@@ -208,7 +209,6 @@ class RedisBuffer(Buffer):
         """
 
         key = self._make_key(model, filters)
-        pending_key = self._make_pending_key_from_key(key)
         # We can't use conn.map() due to wanting to support multiple pending
         # keys (one per Redis partition)
         if self.is_redis_cluster:
@@ -217,6 +217,46 @@ class RedisBuffer(Buffer):
             conn = self.cluster.get_local_client_for_key(key)
 
         pipe = conn.pipeline()
+        self._incr_pipe(pipe, key, model, columns, filters, extra, signal_only)
+        pipe.execute()
+
+        metrics.incr(
+            "buffer.incr",
+            skip_internal=True,
+            tags={"module": model.__module__, "model": model.__name__},
+        )
+
+    def incr_many(self, items):
+        """
+        Like `incr`, but for many ``(model, columns, filters, extra, signal_only)`` tuples at
+        once, using a single pipeline per Redis host.
+        """
+        pipes = {}
+        for model, columns, filters, extra, signal_only in items:
+            key = self._make_key(model, filters)
+            if self.is_redis_cluster:
+                host_id = None
+            else:
+                host_id = self.cluster.get_router().get_host_for_key(key)
+            if host_id not in pipes:
+                if self.is_redis_cluster:
+                    pipes[host_id] = self.cluster.pipeline()
+                else:
+                    pipes[host_id] = self.cluster.get_local_client(host_id).pipeline()
+            self._incr_pipe(pipes[host_id], key, model, columns, filters, extra, signal_only)
+
+            metrics.incr(
+                "buffer.incr",
+                skip_internal=True,
+                tags={"module": model.__module__, "model": model.__name__},
+            )
+
+        for pipe in pipes.values():
+            pipe.execute()
+
+    def _incr_pipe(self, pipe, key, model, columns, filters, extra=None, signal_only=None):
+        pending_key = self._make_pending_key_from_key(key)
+
         pipe.hsetnx(key, "m", f"{model.__module__}.{model.__name__}")
         _validate_json_roundtrip(filters, model)
 
@@ -244,13 +284,6 @@ class RedisBuffer(Buffer):
 
         pipe.expire(key, self.key_expire)
         pipe.zadd(pending_key, {key: time()})
-        pipe.execute()
-
-        metrics.incr(
-            "buffer.incr",
-            skip_internal=True,
-            tags={"module": model.__module__, "model": model.__name__},
-        )
 
     def process_pending(self, partition=None):
         if partition is None and self.pending_partitions > 1:
@@ -318,12 +351,94 @@ class RedisBuffer(Buffer):
         if key is not None:
             batch_keys = [key]
 
+        if len(batch_keys) > 1 and options.get("buffer.process-incr-bulk"):
+            self._process_batch_incr(batch_keys)
+            return
+
         for key in batch_keys:
             self._process_single_incr(key)
 
     def _process(self, model, columns, filters, extra=None, signal_only=None):
         return super().process(model, columns, filters, extra, signal_only)
 
+    def _execute_many(self, commands):
+        """
+        Runs ``(command, args, kwargs)`` tuples in as few round trips as possible and returns
+        their results in order. Commands are routed to their hosts by their first argument and
+        are not run in a transaction.
+        """
+        if self.is_redis_cluster:
+            pipe = self.cluster.pipeline(transaction=False)
+            for command, args, kwargs in commands:
+                getattr(pipe, command)(*args, **kwargs)
+            return pipe.execute()
+
+        with self.cluster.map() as conn:
+            promises = [
+                getattr(conn, command)(*args, **kwargs) for command, args, kwargs in commands
+            ]
+        return [promise.value for promise in promises]
+
+    def _pop_many(self, keys):
+        """
+        Reads and clears the hashes of ``keys``, returning their contents in order. Like
+        `_process_single_incr`, each host's keys are read and deleted in one transaction so
+        that no increment lands between the read and the delete.
+        """
+        if self.is_redis_cluster:
+            pipes = {None: self.cluster.pipeline(transaction=False)}
+            hosts = [None] * len(keys)
+        else:
+            router = self.cluster.get_router()
+            hosts = [router.get_host_for_key(key) for key in keys]
+            pipes = {
+                host_id: self.cluster.get_local_client(host_id).pipeline(transaction=True)
+                for host_id in set(hosts)
+            }
+
+        for key, host_id in zip(keys, hosts):
+            pipe = pipes[host_id]
+            pipe.hgetall(key)
+            pipe.zrem(self._make_pending_key_from_key(key), key)
+            pipe.delete(key)
+
+        results = {host_id: iter(pipe.execute()[::3]) for host_id, pipe in pipes.items()}
+        return [next(results[host_id]) for host_id in hosts]
+
+    def _load_buffered_values(self, values) -> BufferedIncr:
+        """
+        Turns the raw contents of a buffer hash back into arguments for `Buffer.process`.
+        """
+        # XXX(python3): In python2 this isn't as important since redis will
+        # return string tyes (be it, byte strings), but in py3 we get bytes
+        # back, and really we just want to deal with keys as strings.
+        values = {force_str(k): v for k, v in values.items()}
+
+        model = import_string(force_str(values.pop("m")))
+
+        if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
+            filters = self._load_values(json.loads(force_str(values.pop("f"))))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(force_bytes(values.pop("f")))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"[" if not self.is_redis_cluster else "["):
+                    extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(force_bytes(v))
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return model, incr_values, filters, extra_values, signal_only
+
     def _process_single_incr(self, key):
         if self.is_redis_cluster:
             client = self.cluster
@@ -352,39 +467,51 @@ class RedisBuffer(Buffer):
             pipe.delete(key)
             values = pipe.execute()[0]
 
-            # XXX(python3): In python2 this isn't as important since redis will
-            # return string tyes (be it, byte strings), but in py3 we get bytes
-            # back, and really we just want to deal with keys as strings.
-            values = {force_str(k): v for k, v in values.items()}
-
             if not values:
                 metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
                 logger.debug("buffer.revoked.empty", extra={"redis_key": key})
                 return
 
-            model = import_string(force_str(values.pop("m")))
+            self._process(*self._load_buffered_values(values))
+        finally:
+            client.delete(lock_key)
 
-            if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
-                filters = self._load_values(json.loads(force_str(values.pop("f"))))
+    def _process_batch_incr(self, keys):
+        """
+        Flushes a whole batch of keys: locks are taken, hashes read and cleared with one
+        pipeline per host instead of per-key round trips, and the increments are applied
+        together through `Buffer.process_batch`.
+        """
+        metrics.distribution("buffer.bulk.batch-size", len(keys))
+
+        with metrics.timer("buffer.bulk.redis"):
+            acquired = self._execute_many(
+                [("set", (self._make_lock_key(key), "1"), {"nx": True, "ex": 10}) for key in keys]
+            )
+        locked_keys = []
+        for key, ok in zip(keys, acquired):
+            if ok:
+                locked_keys.append(key)
             else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(force_bytes(values.pop("f")))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"[" if not self.is_redis_cluster else "["):
-                        extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(force_bytes(v))
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._process(model, incr_values, filters, extra_values, signal_only)
+                metrics.incr("buffer.revoked", tags={"reason": "locked"}, skip_internal=False)
+                logger.debug("buffer.revoked.locked", extra={"redis_key": key})
+
+        if not locked_keys:
+            return
+
+        try:
+            with metrics.timer("buffer.bulk.redis"):
+                results = self._pop_many(locked_keys)
+
+            batch = []
+            for key, values in zip(locked_keys, results):
+                if not values:
+                    metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+                    logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+                    continue
+                batch.append(self._load_buffered_values(values))
+
+            with metrics.timer("buffer.bulk.db"):
+                self.process_batch(batch)
         finally:
-            client.delete(lock_key)
+            self._execute_many([("delete", (self._make_lock_key(key),), {}) for key in locked_keys])
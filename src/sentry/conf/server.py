@@ -2207,6 +2207,9 @@ SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
 # Node storage backend
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
 SENTRY_NODESTORE_OPTIONS: dict[str, Any] = {}
+# Process-local cache of node payloads in front of the node stores. ``max_bytes`` bounds the
+# (compressed) bytes held, 0 disables it. Nodes are kept for at most ``ttl`` seconds.
+SENTRY_NODESTORE_LOCAL_CACHE_OPTIONS: dict[str, Any] = {"max_bytes": 0, "ttl": 60}
 
 # Node storage backend used for ArtifactBundle indexing (aka FlatFileIndex aka BundleIndex)
 SENTRY_INDEXSTORE = "sentry.nodestore.django.DjangoNodeStorage"
@@ -2226,6 +2229,23 @@ SENTRY_SEARCH_OPTIONS: dict[str, Any] = {}
 #     'timeout': 5,
 # }
 
+# Number of parsed event search queries kept in process (see `sentry.api.event_search`), 0
+# disables the cache.
+SENTRY_EVENT_SEARCH_PARSE_CACHE_SIZE = 1000
+
+# Options for the in-process cache of resolved Discover query builders (see
+# `sentry.search.events.builder.templates`). Templates keep what was resolved from the database
+# for up to `ttl` seconds, a `max_size` of 0 disables the cache.
+SENTRY_QUERY_BUILDER_TEMPLATE_OPTIONS: dict[str, Any] = {"max_size": 0, "ttl": 60}
+
+# Number of compiled ownership rulesets kept in process (see `sentry.ownership.compiled`), 0 tests
+# every rule against every event instead.
+SENTRY_OWNERSHIP_COMPILED_RULES_CACHE_SIZE = 100
+
+# Number of crontab schedules whose upcoming fire times are kept in process (see
+# `sentry.monitors.schedule`), 0 computes every fire time with a new `croniter`.
+SENTRY_MONITORS_SCHEDULE_CACHE_SIZE = 1000
+
 # Time-series storage backend
 SENTRY_TSDB = "sentry.tsdb.dummy.DummyTSDB"
 SENTRY_TSDB_OPTIONS: dict[str, Any] = {}
@@ -3583,6 +3603,10 @@ SENTRY_GROUPING_AUTO_UPDATE_ENABLED = False
 # How long the migration phase for grouping lasts
 SENTRY_GROUPING_UPDATE_MIGRATION_PHASE = 7 * 24 * 3600  # 7 days
 
+# Match stack trace enhancement rules through the pre-indexed `CompiledRules` instead of testing
+# every rule against every frame.
+SENTRY_GROUPING_COMPILED_ENHANCEMENTS = True
+
 SENTRY_USE_UWSGI = True
 
 # When copying attachments for to-be-reprocessed events into processing store,
@@ -3783,6 +3807,9 @@ ORGANIZATION_VITALS_OVERVIEW_PROJECT_LIMIT = 300
 # Default string indexer cache options
 SENTRY_STRING_INDEXER_CACHE_OPTIONS = {
     "cache_name": "default",
+    # Maximum number of entries per namespace and use case held in memory in front of the cache.
+    # 0 disables the in-process tier.
+    "local_cache_size": 0,
 }
 SENTRY_POSTGRES_INDEXER_RETRY_COUNT = 2
 
@@ -54,10 +54,72 @@ def multiprocessing_options(
     ]
 
 
+def ingest_occurrences_options() -> List[click.Option]:
+    """Return a list of ingest-occurrences options."""
+    options = multiprocessing_options(default_max_batch_size=20)
+    options.append(
+        click.Option(
+            ["--mode"],
+            type=click.Choice(["parallel", "batched"]),
+            default="parallel",
+            help="Process messages one at a time in parallel processes, or in batches that share lookups and writes.",
+        )
+    )
+    return options
+
+
+def ingest_monitors_options() -> List[click.Option]:
+    """Return a list of ingest-monitors options."""
+    options = [
+        click.Option(
+            ["--mode"],
+            type=click.Choice(["serial", "parallel"]),
+            default="serial",
+            help="Process check-ins one at a time, or in batches processing distinct monitors in parallel threads.",
+        ),
+        click.Option(
+            ["--max-batch-size"],
+            type=int,
+            default=500,
+            help="Maximum number of check-ins to batch in parallel mode.",
+        ),
+        click.Option(
+            ["--max-batch-time-ms", "max_batch_time"],
+            type=int,
+            default=1000,
+            callback=convert_max_batch_time,
+            help="Maximum time (in milliseconds) to wait before processing a batch in parallel mode.",
+        ),
+        click.Option(
+            ["--max-workers"],
+            type=int,
+            default=None,
+            help="Maximum number of threads processing check-ins in parallel mode.",
+        ),
+    ]
+    return options
+
+
 def ingest_replay_recordings_options() -> List[click.Option]:
     """Return a list of ingest-replay-recordings options."""
     options = multiprocessing_options(default_max_batch_size=10)
     options.append(click.Option(["--threads", "num_threads"], type=int, default=4))
+    options.append(
+        click.Option(
+            ["--mode"],
+            type=click.Choice(["message", "batched"]),
+            default="message",
+            help="Ingest each recording on its own, or batches of recordings with concurrent uploads.",
+        )
+    )
+    options.append(
+        click.Option(
+            ["--parse-processes", "num_parse_processes"],
+            type=int,
+            default=0,
+            help="Number of processes parsing large recordings in batched mode.",
+        )
+    )
     return options
 
 
@@ -127,6 +189,7 @@ KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {
     "ingest-monitors": {
         "topic": settings.KAFKA_INGEST_MONITORS,
         "strategy_factory": "sentry.monitors.consumers.monitor_consumer.StoreMonitorCheckInStrategyFactory",
+        "click_options": ingest_monitors_options(),
     },
     "billing-metrics-consumer": {
         "topic": settings.KAFKA_SNUBA_GENERIC_METRICS,
@@ -138,7 +201,7 @@ KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {
     "ingest-occurrences": {
         "topic": settings.KAFKA_INGEST_OCCURRENCES,
         "strategy_factory": "sentry.issues.run.OccurrenceStrategyFactory",
-        "click_options": multiprocessing_options(default_max_batch_size=20),
+        "click_options": ingest_occurrences_options(),
     },
     "events-subscription-results": {
         "topic": settings.KAFKA_EVENTS_SUBSCRIPTIONS_RESULTS,
@@ -1,7 +1,9 @@
 import codecs
 import csv
+import io
 import logging
 import tempfile
+import time
 from hashlib import sha1
 
 import celery
@@ -20,6 +22,7 @@ from django.core.files.base import ContentFile
 from django.db import IntegrityError, router
 from django.utils import timezone
 
+from sentry import options
 from sentry.models.files.file import File
 from sentry.models.files.fileblob import FileBlob
 from sentry.models.files.fileblobindex import FileBlobIndex
@@ -62,6 +65,7 @@ def assemble_download(
     environment_id=None,
     export_retries=3,
     countdown=60,
+    streaming=None,
     **kwargs,
 ):
     with sentry_sdk.start_span(op="assemble"):
@@ -90,15 +94,29 @@ def assemble_download(
             scope.set_tag("export.type", ExportQueryType.as_str(data_export.query_type))
             scope.set_extra("export.query", data_export.query_info)
 
+        # ensure that the export limit is set and capped at EXPORTED_ROWS_LIMIT
+        if export_limit is None:
+            export_limit = EXPORTED_ROWS_LIMIT
+        else:
+            export_limit = min(export_limit, EXPORTED_ROWS_LIMIT)
+
+        if streaming is None:
+            streaming = first_page and options.get("data-export.streaming")
+        if streaming:
+            return stream_download(
+                data_export,
+                export_limit=export_limit,
+                batch_size=batch_size,
+                offset=offset,
+                bytes_written=bytes_written,
+                environment_id=environment_id,
+                export_retries=export_retries,
+                countdown=countdown,
+            )
+
         base_bytes_written = bytes_written
 
         try:
-            # ensure that the export limit is set and capped at EXPORTED_ROWS_LIMIT
-            if export_limit is None:
-                export_limit = EXPORTED_ROWS_LIMIT
-            else:
-                export_limit = min(export_limit, EXPORTED_ROWS_LIMIT)
-
             processor = get_processor(data_export, environment_id)
 
             with tempfile.TemporaryFile(mode="w+b") as tf:
@@ -208,6 +226,174 @@ def assemble_download(
                 merge_export_blobs.delay(data_export_id)
 
 
+def stream_download(
+    data_export,
+    export_limit,
+    batch_size,
+    offset,
+    bytes_written,
+    environment_id,
+    export_retries,
+    countdown,
+):
+    """
+    Exports all rows from ``offset`` on within the current task, storing the CSV output as
+    blobs of the export while the rows are being fetched.
+
+    Only the current page and at most one blob worth of output are held in memory. When the
+    task fails it is retried from the last page whose output was stored.
+    """
+    writer = ExportBlobWriter(data_export, offset, bytes_written, DEFAULT_BLOB_SIZE)
+    started = time.monotonic()
+
+    try:
+        processor = get_processor(data_export, environment_id)
+
+        # Anything stored after the checkpoint belongs to an attempt that did not finish.
+        ExportedDataBlob.objects.filter(data_export=data_export, offset__gte=bytes_written).delete()
+
+        csv_writer = csv.DictWriter(writer.stream, processor.header_fields, extrasaction="ignore")
+        if offset == 0:
+            csv_writer.writeheader()
+
+        next_offset = offset
+        for next_offset, rows in iter_export_pages(
+            processor, data_export, export_limit, batch_size, offset
+        ):
+            csv_writer.writerows(rows)
+            # the next page is only fetched once the output of the previous pages is stored
+            if writer.buffered_bytes >= writer.blob_size:
+                writer.flush(next_offset)
+        writer.flush(next_offset)
+    except ExportDataFileTooBig:
+        # the export is cut off at the last page that fit, like in `assemble_download`
+        pass
+    except ExportError as error:
+        if error.recoverable and export_retries > 0:
+            assemble_download.apply_async(
+                args=[data_export.id],
+                kwargs={
+                    "export_limit": export_limit,
+                    "batch_size": batch_size // 2,
+                    "offset": writer.offset,
+                    "bytes_written": writer.bytes_written,
+                    "environment_id": environment_id,
+                    "export_retries": export_retries - 1,
+                    "streaming": True,
+                },
+                countdown=countdown,
+            )
+            return
+        return data_export.email_failure(message=str(error))
+    except Exception as error:
+        metrics.incr("dataexport.error", tags={"error": str(error)}, sample_rate=1.0)
+        logger.error(
+            "dataexport.error: %s",
+            str(error),
+            extra={"query": data_export.payload, "org": data_export.organization_id},
+        )
+        capture_exception(error)
+
+        try:
+            current_task.retry(
+                args=[data_export.id],
+                kwargs={
+                    "export_limit": export_limit,
+                    "batch_size": batch_size,
+                    "offset": writer.offset,
+                    "bytes_written": writer.bytes_written,
+                    "environment_id": environment_id,
+                    "export_retries": export_retries,
+                    "streaming": True,
+                },
+            )
+        except MaxRetriesExceededError:
+            metrics.incr(
+                "dataexport.end",
+                tags={"success": False, "error": str(error)},
+                sample_rate=1.0,
+            )
+            return data_export.email_failure(message="Internal processing failure")
+        return
+
+    elapsed = time.monotonic() - started
+    if elapsed > 0:
+        metrics.distribution(
+            "dataexport.stream.rows_per_second",
+            (writer.offset - offset) / elapsed,
+            sample_rate=1.0,
+        )
+        metrics.distribution(
+            "dataexport.stream.bytes_per_second",
+            (writer.bytes_written - bytes_written) / elapsed,
+            sample_rate=1.0,
+            unit="byte",
+        )
+    metrics.distribution("dataexport.row_count", writer.offset, sample_rate=1.0)
+    metrics.distribution("dataexport.file_size", writer.bytes_written, sample_rate=1.0, unit="byte")
+    merge_export_blobs.delay(data_export.id)
+
+
+def iter_export_pages(processor, data_export, export_limit, batch_size, offset):
+    """
+    Yields the rows of the export page by page, starting at ``offset``, along with the offset
+    following each page. A page is only queried once the previous one has been consumed.
+    """
+    while offset < export_limit:
+        rows = process_rows(processor, data_export, min(batch_size, export_limit - offset), offset)
+        if not rows:
+            return
+        offset += len(rows)
+        yield offset, rows
+        if len(rows) < batch_size:
+            return
+
+
+class ExportBlobWriter:
+    """
+    Buffers the CSV output of a streaming export and stores it as blobs of the export.
+
+    Output is only stored after whole pages, so ``offset`` (in rows) and ``bytes_written``
+    always describe a point from which the export can be resumed.
+    """
+
+    def __init__(self, data_export, offset, bytes_written, blob_size):
+        self.data_export = data_export
+        self.offset = offset
+        self.bytes_written = bytes_written
+        self.blob_size = blob_size
+        self.buffer = io.BytesIO()
+        # the csv module only writes strings, see `assemble_download`
+        self.stream = codecs.getwriter("utf-8")(self.buffer)
+
+    @property
+    def buffered_bytes(self):
+        return self.buffer.tell()
+
+    def flush(self, offset):
+        """
+        Stores the buffered output, which contains all rows up to ``offset``.
+        """
+        buffered_bytes = self.buffered_bytes
+        if not buffered_bytes:
+            self.offset = offset
+            return
+
+        self.buffer.seek(0)
+        try:
+            new_bytes_written = store_export_chunk_as_blob(
+                self.data_export, self.bytes_written, self.buffer, self.blob_size
+            )
+        finally:
+            self.buffer.seek(0)
+            self.buffer.truncate()
+
+        if not new_bytes_written:
+            raise ExportDataFileTooBig()
+        self.offset = offset
+        self.bytes_written += new_bytes_written
+
+
 def get_processor(data_export, environment_id):
     try:
         if data_export.query_type == ExportQueryType.ISSUES_BY_TAG:
@@ -11,6 +11,7 @@ from django.db.models.signals import post_delete
 
 from sentry import nodestore
 from sentry.db.models.utils import Creator
+from sentry.nodestore.lazy import LazyNodeData
 from sentry.utils import json
 from sentry.utils.cache import memoize
 from sentry.utils.canonical import CANONICAL_TYPES, CanonicalKeyDict
@@ -49,9 +50,13 @@ class NodeData(MutableMapping):
         if data is not None and self.wrapper is not None:
             data = self.wrapper(data)
         self._node_data = data
+        # Data bound from nodestore that has not been decoded yet, see `bind_data`.
+        self._lazy_node_data = None
 
     def __getstate__(self):
+        self._decode_lazy_node_data()
         data = dict(self.__dict__)
+        data.pop("_lazy_node_data", None)
         # downgrade this into a normal dict in case it's a shim dict.
         # This is needed as older workers might not know about newer
         # collection types.  For instance we have events where this is a
@@ -67,6 +72,7 @@ class NodeData(MutableMapping):
         state.pop("data", None)
         if state.pop("_node_data_CANONICAL", False):
             state["_node_data"] = CanonicalKeyDict(state["_node_data"])
+        state["_lazy_node_data"] = None
         self.__dict__ = state
 
     def __getitem__(self, key):
@@ -104,7 +110,7 @@ class NodeData(MutableMapping):
         Get the current data object, fetching from nodestore if necessary.
         """
 
-        if self._node_data is not None:
+        if self._decode_lazy_node_data() or self._node_data is not None:
             return self._node_data
 
         elif self.id:
@@ -123,9 +129,33 @@ class NodeData(MutableMapping):
             raise NodeIntegrityFailure(
                 f"Node reference for {self.id} is invalid: {ref} != {self.ref}"
             )
+        if isinstance(data, LazyNodeData) and not data.is_decoded:
+            # Wrapping (and with it renormalizing event payloads) needs the full payload, so this
+            # waits until the data is actually used.
+            self._node_data = None
+            self._lazy_node_data = data
+            return
+
+        self._lazy_node_data = None
+        if self.wrapper is not None:
+            data = self.wrapper(data)
+        self._node_data = data
+
+    def _decode_lazy_node_data(self):
+        """
+        Decodes and wraps data bound through `bind_data` that was not decoded yet. Returns whether
+        there was any.
+        """
+        lazy_node_data = getattr(self, "_lazy_node_data", None)
+        if lazy_node_data is None:
+            return False
+
+        self._lazy_node_data = None
+        data = lazy_node_data.decode()
         if self.wrapper is not None:
             data = self.wrapper(data)
         self._node_data = data
+        return True
 
     def bind_ref(self, instance):
         ref = self.get_ref(instance)
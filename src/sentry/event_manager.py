@@ -115,6 +115,7 @@ from sentry.signals import (
     first_transaction_received,
     issue_unresolved,
 )
+from sentry.spans.table import SpanTable
 from sentry.tasks.commits import fetch_commits
 from sentry.tasks.integrations import kick_off_status_syncs
 from sentry.tasks.process_buffer import buffer_incr
@@ -2594,6 +2595,13 @@ def _calculate_event_grouping(
         return hashes
 
 
+def _get_span_table(job: Job) -> SpanTable:
+    # Shared by span grouping and performance detection so the spans are only read once.
+    if "span_table" not in job:
+        job["span_table"] = SpanTable.from_event(job["data"])
+    return job["span_table"]
+
+
 @metrics.wraps("save_event.calculate_span_grouping")
 def _calculate_span_grouping(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
     for job in jobs:
@@ -2602,7 +2610,7 @@ def _calculate_span_grouping(jobs: Sequence[Job], projects: ProjectsMapping) ->
         try:
             event = job["event"]
             with metrics.timer("event_manager.save.get_span_groupings.default"):
-                groupings = event.get_span_groupings()
+                groupings = event.get_span_groupings(span_table=_get_span_table(job))
             groupings.write_to_event(event.data)
 
             metrics.distribution("save_event.transaction.span_count", len(groupings.results))
@@ -2623,7 +2631,7 @@ def _calculate_span_grouping(jobs: Sequence[Job], projects: ProjectsMapping) ->
 def _detect_performance_problems(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
     for job in jobs:
         job["performance_problems"] = detect_performance_problems(
-            job["data"], projects[job["project_id"]]
+            job["data"], projects[job["project_id"]], span_table=_get_span_table(job)
         )
 
 
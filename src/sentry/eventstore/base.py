@@ -5,7 +5,7 @@ from typing import Optional, Sequence
 import sentry_sdk
 from snuba_sdk import Condition
 
-from sentry import nodestore
+from sentry import nodestore, options
 from sentry.eventstore.models import Event
 from sentry.snuba.dataset import Dataset
 from sentry.snuba.events import Columns
@@ -269,7 +269,9 @@ class EventStorage(Service):
             if not node_ids:
                 return
 
-            node_results = nodestore.backend.get_multi(node_ids)
+            node_results = nodestore.backend.get_multi(
+                node_ids, lazy=options.get("nodedata.lazy-decode")
+            )
 
             for item, node in object_node_list:
                 data = node_results.get(node.id) or {}
@@ -52,6 +52,7 @@ if TYPE_CHECKING:
     from sentry.models.organization import Organization
     from sentry.models.project import Project
     from sentry.spans.grouping.result import SpanGroupingResults
+    from sentry.spans.table import SpanTable
 
 
 def ref_func(x: Event) -> int:
@@ -478,10 +479,12 @@ class BaseEvent(metaclass=abc.ABCMeta):
         return None
 
     def get_span_groupings(
-        self, force_config: str | Mapping[str, Any] | None = None
+        self,
+        force_config: str | Mapping[str, Any] | None = None,
+        span_table: SpanTable | None = None,
     ) -> SpanGroupingResults:
         config = load_span_grouping_config(force_config)
-        return config.execute_strategy(self.data)
+        return config.execute_strategy(self.data, span_table)
 
     @property
     def organization(self) -> Organization:
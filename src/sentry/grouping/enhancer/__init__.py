@@ -4,11 +4,13 @@ import base64
 import logging
 import os
 import zlib
+from functools import cached_property, lru_cache
 from hashlib import md5
-from typing import Any, Sequence
+from typing import Any, Iterator, Sequence
 
 import msgpack
 import sentry_sdk
+from django.conf import settings
 from django.core.cache import cache
 from parsimonious.exceptions import ParseError
 from parsimonious.grammar import Grammar
@@ -23,6 +25,7 @@ from sentry.utils.safe import get_path, set_path
 from sentry.utils.strings import unescape_string
 
 from .actions import Action, FlagAction, VarAction
+from .compiled import CompiledRules
 from .exceptions import InvalidEnhancerConfig
 from .matchers import (
     CalleeMatch,
@@ -128,6 +131,7 @@ class Enhancements:
             bases = []
         self.bases = bases
 
+        self._dumped: str | None = None
         self._modifier_rules: list[Rule] = []
         self._updater_rules: list[Rule] = []
         for rule in self.iter_rules():
@@ -136,6 +140,39 @@ class Enhancements:
             if updater_rule := rule._as_updater_rule():
                 self._updater_rules.append(updater_rule)
 
+    @cached_property
+    def _compiled_modifier_rules(self) -> CompiledRules:
+        return CompiledRules(self._modifier_rules)
+
+    @cached_property
+    def _compiled_updater_rules(self) -> CompiledRules:
+        return CompiledRules(self._updater_rules)
+
+    def _iter_matching_frame_actions(
+        self,
+        rules: list[Rule],
+        match_frames: Sequence[dict[str, Any]],
+        platform: str,
+        exception_data: dict[str, Any],
+        in_memory_cache: dict[str, str],
+    ) -> Iterator[tuple[Rule, int, Action]]:
+        if settings.SENTRY_GROUPING_COMPILED_ENHANCEMENTS:
+            compiled = (
+                self._compiled_modifier_rules
+                if rules is self._modifier_rules
+                else self._compiled_updater_rules
+            )
+            yield from compiled.iter_matching_frame_actions(
+                match_frames, platform, exception_data, in_memory_cache
+            )
+            return
+
+        for rule in rules:
+            for idx, action in rule.get_matching_frame_actions(
+                match_frames, platform, exception_data, in_memory_cache
+            ):
+                yield rule, idx, action
+
     def apply_modifications_to_frame(
         self,
         frames: Sequence[dict[str, Any]],
@@ -163,12 +200,11 @@ class Enhancements:
                 return
 
         with sentry_sdk.start_span(op="stacktrace_processing", description="apply_rules_to_frames"):
-            for rule in self._modifier_rules:
-                for idx, action in rule.get_matching_frame_actions(
-                    match_frames, platform, exception_data, in_memory_cache
-                ):
-                    # Both frames and match_frames are updated
-                    action.apply_modifications_to_frame(frames, match_frames, idx, rule=rule)
+            for rule, idx, action in self._iter_matching_frame_actions(
+                self._modifier_rules, match_frames, platform, exception_data, in_memory_cache
+            ):
+                # Both frames and match_frames are updated
+                action.apply_modifications_to_frame(frames, match_frames, idx, rule=rule)
 
         if use_cache:
             _cache_changed_frame_values(frames, cache_key, platform)
@@ -180,13 +216,11 @@ class Enhancements:
 
         stacktrace_state = StacktraceState()
         # Apply direct frame actions and update the stack state alongside
-        for rule in self._updater_rules:
-
-            for idx, action in rule.get_matching_frame_actions(
-                match_frames, platform, exception_data, in_memory_cache
-            ):
-                action.update_frame_components_contributions(components, frames, idx, rule=rule)
-                action.modify_stacktrace_state(stacktrace_state, rule)
+        for rule, idx, action in self._iter_matching_frame_actions(
+            self._updater_rules, match_frames, platform, exception_data, in_memory_cache
+        ):
+            action.update_frame_components_contributions(components, frames, idx, rule=rule)
+            action.modify_stacktrace_state(stacktrace_state, rule)
 
         # Use the stack state to update frame contributions again to trim
         # down to max-frames.  min-frames is handled on the other hand for
@@ -264,11 +298,15 @@ class Enhancements:
         ]
 
     def dumps(self):
-        return (
-            base64.urlsafe_b64encode(zlib.compress(msgpack.dumps(self._to_config_structure())))
-            .decode("ascii")
-            .strip("=")
-        )
+        # This is called for every stacktrace to build its cache key, and instances are shared
+        # through the `loads` cache, so only serialize once.
+        if getattr(self, "_dumped", None) is None:
+            self._dumped = (
+                base64.urlsafe_b64encode(zlib.compress(msgpack.dumps(self._to_config_structure())))
+                .decode("ascii")
+                .strip("=")
+            )
+        return self._dumped
 
     def iter_rules(self):
         for base in self.bases:
@@ -290,8 +328,16 @@ class Enhancements:
 
     @classmethod
     def loads(cls, data):
+        """
+        Loads enhancements from their `dumps` representation. Results are cached per process so
+        that the compiled rules are shared by all events using the same config.
+        """
         if isinstance(data, str):
             data = data.encode("ascii", "ignore")
+        return _loads_cached(cls, data)
+
+    @classmethod
+    def _loads(cls, data):
         padded = data + b"=" * (4 - (len(data) % 4))
         try:
             return cls._from_config_structure(
@@ -314,6 +360,11 @@ class Enhancements:
         return EnhancementsVisitor(bases, id).visit(tree)
 
 
+@lru_cache(maxsize=1000)
+def _loads_cached(cls, data: bytes) -> Enhancements:
+    return cls._loads(data)
+
+
 class Rule:
     def __init__(self, matchers, actions):
         self.matchers = matchers
@@ -0,0 +1,192 @@
+"""
+Compiled form of enhancement rules.
+
+`Rule.get_matching_frame_actions` evaluates every matcher of every rule against every frame. With
+the built-in bases plus large custom configs most of that work is repeated: the same interned
+matcher is tested against the same frame by many rules, and rules for other platform families are
+walked just to find out they can't match.
+
+`CompiledRules` pre-indexes rules once per `Enhancements` instance (which are shared across events
+through the `Enhancements.loads` cache):
+
+- rules that require a frame family are skipped when no frame of that family is present,
+- rules with a literal ``function:`` or ``module:`` matcher only look at frames carrying that
+  value,
+- matchers are ordered cheapest first so that a rule bails out as early as possible.
+
+Per stacktrace, `MatchingContext` memoizes the results of matchers over fields that actions never
+modify (family, path, package, function, module), so each distinct matcher runs at most once per
+frame no matter how many rules share it. ``app`` and ``category`` are re-evaluated every time as
+earlier rules may have changed them.
+
+The glob semantics are not reimplemented here; the individual matchers remain the single source of
+truth and are only called less often.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Sequence
+
+from .actions import Action
+from .matchers import (
+    CalleeMatch,
+    CallerMatch,
+    FamilyMatch,
+    FrameFieldMatch,
+    FunctionMatch,
+    InAppMatch,
+    Match,
+    ModuleMatch,
+    PathLikeMatch,
+)
+
+if TYPE_CHECKING:
+    from . import Rule
+
+# Matchers over fields that are never changed by actions, so their result for a given frame can be
+# reused for the whole stacktrace.
+_MEMOIZABLE_MATCHERS = (FamilyMatch, PathLikeMatch, FunctionMatch, ModuleMatch)
+
+# Fields that can be used to look up candidate frames by exact value.
+_INDEXABLE_MATCHERS = (FunctionMatch, ModuleMatch)
+
+_GLOB_CHARS = frozenset("*?[]{}!\\")
+
+
+def _matcher_cost(matcher: Match) -> int:
+    if isinstance(matcher, (CallerMatch, CalleeMatch)):
+        return _matcher_cost(matcher.caller) + 1
+    if isinstance(matcher, (FamilyMatch, InAppMatch)):
+        return 0
+    if isinstance(matcher, FrameFieldMatch):
+        return 1
+    return 2
+
+
+def _is_literal(pattern: str) -> bool:
+    return not _GLOB_CHARS.intersection(pattern)
+
+
+class CompiledRule:
+    def __init__(self, rule: Rule):
+        self.rule = rule
+        self.exception_matchers = rule._exception_matchers
+        self.frame_matchers = sorted(rule._other_matchers, key=_matcher_cost)
+
+        # Families at least one frame needs to have for this rule to possibly match.
+        self.families: Optional[frozenset[bytes]] = None
+        # A literal matcher that allows looking up candidate frames by value.
+        self.anchor: Optional[FrameFieldMatch] = None
+        for matcher in rule._other_matchers:
+            if isinstance(matcher, FamilyMatch) and not matcher.negated:
+                if b"all" not in matcher._flags:
+                    flags = frozenset(matcher._flags)
+                    self.families = flags if self.families is None else self.families & flags
+            elif (
+                self.anchor is None
+                and isinstance(matcher, _INDEXABLE_MATCHERS)
+                and not matcher.negated
+                and _is_literal(matcher.pattern)
+            ):
+                self.anchor = matcher
+
+    def get_matching_frame_actions(self, context: MatchingContext) -> list[tuple[int, Action]]:
+        """Same as `Rule.get_matching_frame_actions`, using the indexes and memoized results."""
+        if not self.rule.matchers:
+            return []
+
+        if self.families is not None and self.families.isdisjoint(context.families):
+            return []
+
+        for m in self.exception_matchers:
+            if not m.matches_frame(
+                context.match_frames,
+                None,
+                context.platform,
+                context.exception_data,
+                context.cache,
+            ):
+                return []
+
+        if self.anchor is not None:
+            candidates: Sequence[int] = context.frames_with(
+                self.anchor.field, self.anchor._encoded_pattern
+            )
+        else:
+            candidates = range(len(context.match_frames))
+
+        rv = []
+        for idx in candidates:
+            if all(context.matches(m, idx) for m in self.frame_matchers):
+                for action in self.rule.actions:
+                    rv.append((idx, action))
+
+        return rv
+
+
+class MatchingContext:
+    """Per-stacktrace state shared by all compiled rules."""
+
+    def __init__(
+        self,
+        match_frames: Sequence[dict[str, Any]],
+        platform: str,
+        exception_data: dict[str, Any],
+        cache: dict[Any, Any],
+    ):
+        self.match_frames = match_frames
+        self.platform = platform
+        self.exception_data = exception_data
+        self.cache = cache
+        self.families = frozenset(frame["family"] for frame in match_frames)
+        self._results: dict[tuple[Match, int], bool] = {}
+        self._frame_index: dict[str, dict[Any, list[int]]] = {}
+
+    def frames_with(self, field: str, value: bytes) -> list[int]:
+        index = self._frame_index.get(field)
+        if index is None:
+            index = self._frame_index[field] = {}
+            for idx, frame in enumerate(self.match_frames):
+                index.setdefault(frame[field], []).append(idx)
+        return index.get(value, [])
+
+    def matches(self, matcher: Match, idx: int) -> bool:
+        if isinstance(matcher, CallerMatch):
+            return idx > 0 and self.matches(matcher.caller, idx - 1)
+        if isinstance(matcher, CalleeMatch):
+            return idx < len(self.match_frames) - 1 and self.matches(matcher.caller, idx + 1)
+
+        if not isinstance(matcher, _MEMOIZABLE_MATCHERS):
+            return matcher.matches_frame(
+                self.match_frames, idx, self.platform, self.exception_data, self.cache
+            )
+
+        key = (matcher, idx)
+        rv = self._results.get(key)
+        if rv is None:
+            rv = self._results[key] = matcher.matches_frame(
+                self.match_frames, idx, self.platform, self.exception_data, self.cache
+            )
+        return rv
+
+
+class CompiledRules:
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules = [CompiledRule(rule) for rule in rules]
+
+    def iter_matching_frame_actions(
+        self,
+        match_frames: Sequence[dict[str, Any]],
+        platform: str,
+        exception_data: dict[str, Any],
+        cache: dict[Any, Any],
+    ) -> Iterator[tuple[Rule, int, Action]]:
+        """
+        Yields ``(rule, frame index, action)`` for all matching rules in order. Matches for a rule
+        are computed only after the actions of the previous rules have been applied, exactly like
+        iterating over `Rule.get_matching_frame_actions`.
+        """
+        context = MatchingContext(match_frames, platform, exception_data, cache)
+        for compiled_rule in self.rules:
+            for idx, action in compiled_rule.get_matching_frame_actions(context):
+                yield compiled_rule.rule, idx, action
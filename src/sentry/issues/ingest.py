@@ -47,13 +47,28 @@ def save_issue_occurrence(
     # sure that this is somehow validated.
     occurrence.save()
 
+    return occurrence, save_issue_from_stored_occurrence(occurrence, event)
+
+
+def save_issue_from_stored_occurrence(
+    occurrence: IssueOccurrence,
+    event: Event,
+    grouphashes: Optional[Mapping[Tuple[int, str], GroupHash]] = None,
+) -> Optional[GroupInfo]:
+    """
+    Creates or updates the issue of an occurrence that has already been saved to nodestore, and
+    sends the occurrence to the eventstream.
+
+    ``grouphashes`` can hold the grouphashes of the occurrence's project and fingerprint if they
+    were fetched in bulk, in which case a missing grouphash is considered to not exist.
+    """
     try:
         release = Release.get(event.project, event.release)
     except Release.DoesNotExist:
         # The release should always exist here since event has been ingested at this point, but just
         # in case it has been deleted
         release = None
-    group_info = save_issue_from_occurrence(occurrence, event, release)
+    group_info = save_issue_from_occurrence(occurrence, event, release, grouphashes)
     if group_info:
         environment = event.get_environment()
         _get_or_create_group_environment(environment, release, [group_info])
@@ -62,7 +77,7 @@ def save_issue_occurrence(
         )
         _get_or_create_group_release(environment, release, event, [group_info])
         send_issue_occurrence_to_eventstream(event, occurrence, group_info)
-    return occurrence, group_info
+    return group_info
 
 
 def process_occurrence_data(data: Mapping[str, Any]) -> None:
@@ -150,7 +165,10 @@ def materialize_metadata(occurrence: IssueOccurrence, event: Event) -> Occurrenc
 
 @metrics.wraps("issues.ingest.save_issue_from_occurrence")
 def save_issue_from_occurrence(
-    occurrence: IssueOccurrence, event: Event, release: Optional[Release]
+    occurrence: IssueOccurrence,
+    event: Event,
+    release: Optional[Release],
+    grouphashes: Optional[Mapping[Tuple[int, str], GroupHash]] = None,
 ) -> Optional[GroupInfo]:
     project = event.project
     issue_kwargs = _create_issue_kwargs(occurrence, event, release)
@@ -162,11 +180,14 @@ def save_issue_from_occurrence(
     # Note that additional fingerprints won't be used to generated additional issues, they'll be
     # used to map the occurrence to a specific issue.
     new_grouphash = occurrence.fingerprint[0]
-    existing_grouphash = (
-        GroupHash.objects.filter(project=project, hash=new_grouphash)
-        .select_related("group")
-        .first()
-    )
+    if grouphashes is not None:
+        existing_grouphash = grouphashes.get((project.id, new_grouphash))
+    else:
+        existing_grouphash = (
+            GroupHash.objects.filter(project=project, hash=new_grouphash)
+            .select_related("group")
+            .first()
+        )
 
     if not existing_grouphash:
         cluster_key = settings.SENTRY_ISSUE_PLATFORM_RATE_LIMITER_OPTIONS.get("cluster", "default")
@@ -165,6 +165,17 @@ class IssueOccurrence:
     def save(self) -> None:
         nodestore.set(self.build_storage_identifier(self.id, self.project_id), self.to_dict())
 
+    @classmethod
+    def save_many(cls, occurrences: Sequence[IssueOccurrence]) -> None:
+        nodestore.set_multi(
+            {
+                cls.build_storage_identifier(
+                    occurrence.id, occurrence.project_id
+                ): occurrence.to_dict()
+                for occurrence in occurrences
+            }
+        )
+
     @classmethod
     def fetch(cls, id_: str, project_id: int) -> Optional[IssueOccurrence]:
         results = nodestore.get(cls.build_storage_identifier(id_, project_id))
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Mapping, Optional, Tuple
+from collections import defaultdict
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple
 from uuid import UUID
 
 import jsonschema
@@ -13,11 +14,16 @@ from sentry import nodestore
 from sentry.event_manager import GroupInfo
 from sentry.eventstore.models import Event
 from sentry.issues.grouptype import get_group_type_by_type_id
-from sentry.issues.ingest import process_occurrence_data, save_issue_occurrence
+from sentry.issues.ingest import (
+    process_occurrence_data,
+    save_issue_from_stored_occurrence,
+    save_issue_occurrence,
+)
 from sentry.issues.issue_occurrence import DEFAULT_LEVEL, IssueOccurrence, IssueOccurrenceData
 from sentry.issues.json_schemas import EVENT_PAYLOAD_SCHEMA, LEGACY_EVENT_PAYLOAD_SCHEMA
 from sentry.issues.producer import PayloadType
 from sentry.issues.status_change_consumer import process_status_change_message
+from sentry.models.grouphash import GroupHash
 from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.utils import metrics
@@ -283,3 +289,249 @@ def _process_message(
             txn.set_tag("result", "error")
             raise InvalidEventPayloadError(e)
     return
+
+
+def _process_message_batch(messages: Sequence[Mapping[str, Any]]) -> None:
+    """
+    Processes a batch of messages with the same outcome as calling `_process_message` on each of
+    them in order, logging and skipping the messages that fail.
+
+    Consecutive occurrences are processed together: projects, events and grouphashes are fetched
+    and occurrences are written to nodestore in bulk, and occurrences for the same project and
+    fingerprint are processed in the order they were received. Status changes are processed
+    one at a time, after the occurrences received before them. If processing a group of
+    occurrences together fails, its messages are processed one at a time instead.
+    """
+    with metrics.timer("occurrence_consumer.process_batch"):
+        metrics.distribution("occurrence_consumer.process_batch.size", len(messages))
+
+        occurrence_messages: List[Mapping[str, Any]] = []
+        for message in messages:
+            payload_type = message.get("payload_type", PayloadType.OCCURRENCE.value)
+            if payload_type == PayloadType.OCCURRENCE.value:
+                occurrence_messages.append(message)
+                continue
+
+            _process_occurrence_batch_or_fallback(occurrence_messages)
+            occurrence_messages = []
+            try:
+                _process_message(message)
+            except Exception:
+                logger.exception("failed to process message payload")
+        _process_occurrence_batch_or_fallback(occurrence_messages)
+
+
+def _process_occurrence_batch_or_fallback(messages: Sequence[Mapping[str, Any]]) -> None:
+    saved_events: Dict[str, Tuple[IssueOccurrenceData, Event]] = {}
+    handled: Set[str] = set()
+    try:
+        _process_occurrence_batch(messages, saved_events, handled)
+    except Exception:
+        logger.exception("failed to process occurrence batch")
+        metrics.incr("occurrence_consumer.process_batch.fallback", sample_rate=1.0)
+        # Only the occurrences the batch didn't get to are processed again. Those whose event
+        # was already saved reuse it rather than saving it a second time.
+        for message in messages:
+            occurrence_id = _get_occurrence_id(message)
+            if occurrence_id in handled:
+                continue
+            try:
+                if occurrence_id in saved_events:
+                    save_issue_occurrence(*saved_events[occurrence_id])
+                else:
+                    _process_message(message)
+            except Exception:
+                logger.exception("failed to process message payload")
+
+
+def _get_occurrence_id(message: Mapping[str, Any]) -> Optional[str]:
+    try:
+        return UUID(message["id"]).hex
+    except Exception:
+        return None
+
+
+def _process_occurrence_batch(
+    messages: Sequence[Mapping[str, Any]],
+    saved_events: Dict[str, Tuple[IssueOccurrenceData, Event]],
+    handled: Set[str],
+) -> None:
+    """
+    Processes consecutive occurrence messages together. Occurrences that reached their final
+    outcome are added to ``handled`` and events saved along the way to ``saved_events``, both by
+    occurrence id, so that a failure of the whole batch can be recovered from.
+    """
+    if not messages:
+        return
+
+    with sentry_sdk.start_transaction(
+        op="_process_occurrence_batch",
+        name="issues.occurrence_consumer",
+        sampled=True,
+    ) as txn:
+        txn.set_data("batch_size", len(messages))
+
+        all_kwargs = []
+        for message in messages:
+            try:
+                with metrics.timer("occurrence_consumer._process_message._get_kwargs"):
+                    kwargs = _get_kwargs(message)
+            except Exception:
+                logger.exception("failed to process message payload")
+                continue
+            metrics.incr(
+                "occurrence_ingest.messages",
+                sample_rate=1.0,
+                tags={"occurrence_type": kwargs["occurrence_data"]["type"]},
+            )
+            all_kwargs.append(kwargs)
+
+        projects = {
+            project.id: project
+            for project in Project.objects.get_many_from_cache(
+                {kwargs["occurrence_data"]["project_id"] for kwargs in all_kwargs}
+            )
+        }
+        organizations = {
+            organization.id: organization
+            for organization in Organization.objects.get_many_from_cache(
+                {project.organization_id for project in projects.values()}
+            )
+        }
+
+        ingested_kwargs = []
+        for kwargs in all_kwargs:
+            occurrence_data = kwargs["occurrence_data"]
+            project = projects.get(occurrence_data["project_id"])
+            organization = organizations.get(project.organization_id) if project else None
+            if organization is None:
+                logger.error(
+                    "failed to process message payload",
+                    extra={"project_id": occurrence_data["project_id"]},
+                )
+                handled.add(occurrence_data["id"])
+                continue
+
+            group_type = get_group_type_by_type_id(occurrence_data["type"])
+            if not group_type.allow_ingest(organization):
+                metrics.incr(
+                    "occurrence_ingest.dropped_feature_disabled",
+                    sample_rate=1.0,
+                    tags={"occurrence_type": occurrence_data["type"]},
+                )
+                handled.add(occurrence_data["id"])
+                continue
+            ingested_kwargs.append(kwargs)
+
+        events = _get_occurrence_events(ingested_kwargs, saved_events)
+
+        occurrences = []
+        for kwargs in ingested_kwargs:
+            event = events.get(kwargs["occurrence_data"]["id"])
+            if event is None:
+                handled.add(kwargs["occurrence_data"]["id"])
+                continue
+            try:
+                occurrence = IssueOccurrence.from_dict(kwargs["occurrence_data"])
+                if occurrence.event_id != event.event_id:
+                    raise ValueError(
+                        "IssueOccurrence must have the same event_id as the passed Event"
+                    )
+            except Exception:
+                logger.exception("failed to process message payload")
+                handled.add(kwargs["occurrence_data"]["id"])
+                continue
+            occurrences.append((occurrence, event))
+
+        with metrics.timer("occurrence_consumer.process_batch.save_occurrences"):
+            IssueOccurrence.save_many([occurrence for occurrence, _ in occurrences])
+
+        # Occurrences of the same issue have to be processed in order, as the first one may
+        # create the issue the others are added to.
+        occurrences_by_hash: Dict[
+            Tuple[int, str], List[Tuple[IssueOccurrence, Event]]
+        ] = defaultdict(list)
+        for occurrence, event in occurrences:
+            occurrences_by_hash[(occurrence.project_id, occurrence.fingerprint[0])].append(
+                (occurrence, event)
+            )
+
+        grouphashes = {
+            (grouphash.project_id, grouphash.hash): grouphash
+            for grouphash in GroupHash.objects.filter(
+                project_id__in={project_id for project_id, _ in occurrences_by_hash},
+                hash__in={fingerprint for _, fingerprint in occurrences_by_hash},
+            ).select_related("group")
+        }
+
+        for hash_occurrences in occurrences_by_hash.values():
+            for i, (occurrence, event) in enumerate(hash_occurrences):
+                try:
+                    with metrics.timer(
+                        "occurrence_consumer._process_message.save_issue_occurrence",
+                        tags={"method": "process_occurrence_batch"},
+                    ):
+                        # Only the first occurrence can use the grouphash fetched for the batch,
+                        # as it may create or change the group.
+                        save_issue_from_stored_occurrence(
+                            occurrence, event, grouphashes if i == 0 else None
+                        )
+                except Exception:
+                    logger.exception("failed to process message payload")
+                handled.add(occurrence.id)
+
+
+def _get_occurrence_events(
+    kwargs_list: Sequence[Mapping[str, Any]],
+    saved_events: Dict[str, Tuple[IssueOccurrenceData, Event]],
+) -> Dict[str, Event]:
+    """
+    Returns the events of the occurrences by occurrence id. Events sent along with their
+    occurrence are saved, and added to ``saved_events`` as soon as they are, the others are
+    fetched from nodestore in bulk.
+    """
+    events = {}
+    lookups = []
+    for kwargs in kwargs_list:
+        occurrence_data = kwargs["occurrence_data"]
+        if "event_data" not in kwargs:
+            lookups.append(occurrence_data)
+            continue
+
+        event_data = kwargs["event_data"]
+        try:
+            if occurrence_data["event_id"] != event_data["event_id"]:
+                raise ValueError(
+                    f"event_id in occurrence({occurrence_data['event_id']}) is different from event_id in event_data({event_data['event_id']})"
+                )
+            event = save_event_from_occurrence(event_data)
+            events[occurrence_data["id"]] = event
+            saved_events[occurrence_data["id"]] = (occurrence_data, event)
+        except Exception:
+            logger.exception("failed to process message payload")
+
+    node_ids = {
+        occurrence_data["id"]: Event.generate_node_id(
+            occurrence_data["project_id"], occurrence_data["event_id"]
+        )
+        for occurrence_data in lookups
+    }
+    with metrics.timer("occurrence_consumer.process_batch.lookup_events"):
+        node_data = nodestore.get_multi(list(set(node_ids.values())))
+
+    for occurrence_data in lookups:
+        data = node_data.get(node_ids[occurrence_data["id"]])
+        if data is None:
+            logger.error(
+                "failed to process message payload",
+                exc_info=EventLookupError(
+                    f"Failed to lookup event({occurrence_data['event_id']}) for project_id({occurrence_data['project_id']})"
+                ),
+            )
+            continue
+        event = Event(
+            event_id=occurrence_data["event_id"], project_id=occurrence_data["project_id"]
+        )
+        event.data = data
+        events[occurrence_data["id"]] = event
+    return events
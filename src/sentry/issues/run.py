@@ -1,5 +1,5 @@
 import logging
-from typing import Mapping
+from typing import Literal, Mapping
 
 import rapidjson
 from arroyo import Topic
@@ -7,10 +7,13 @@ from arroyo.backends.kafka import KafkaConsumer, KafkaPayload, build_kafka_consu
 from arroyo.commit import ONCE_PER_SECOND
 from arroyo.processing import StreamProcessor
 from arroyo.processing.strategies import (
+    BatchStep,
     CommitOffsets,
     ProcessingStrategy,
     ProcessingStrategyFactory,
+    RunTask,
 )
+from arroyo.processing.strategies.batching import ValuesBatch
 from arroyo.types import Commit, Message, Partition
 
 from sentry.utils.arroyo import RunTaskWithMultiprocessing
@@ -91,6 +94,7 @@ class OccurrenceStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         num_processes: int,
         input_block_size: int,
         output_block_size: int,
+        mode: Literal["parallel", "batched"] = "parallel",
     ):
         super().__init__()
         self.max_batch_size = max_batch_size
@@ -98,12 +102,24 @@ class OccurrenceStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         self.num_processes = num_processes
         self.input_block_size = input_block_size
         self.output_block_size = output_block_size
+        self.batched = mode == "batched"
 
     def create_with_partitions(
         self,
         commit: Commit,
         partitions: Mapping[Partition, int],
     ) -> ProcessingStrategy[KafkaPayload]:
+        if self.batched:
+            # Offsets are committed once the whole batch has been processed
+            return BatchStep(
+                max_batch_size=self.max_batch_size,
+                max_batch_time=self.max_batch_time,
+                next_step=RunTask(
+                    function=process_batch,
+                    next_step=CommitOffsets(commit),
+                ),
+            )
+
         return RunTaskWithMultiprocessing(
             function=process_message,
             next_step=CommitOffsets(commit),
@@ -134,3 +150,21 @@ def process_message(message: Message[KafkaPayload]) -> None:
         Exception,
     ):
         logger.exception("failed to process message payload")
+
+
+def process_batch(message: Message[ValuesBatch[KafkaPayload]]) -> None:
+    from sentry.issues.occurrence_consumer import _process_message_batch
+    from sentry.utils import json, metrics
+
+    payloads = []
+    for item in message.payload:
+        try:
+            payloads.append(json.loads(item.payload.value, use_rapid_json=True))
+        except rapidjson.JSONDecodeError:
+            logger.exception("failed to process message payload")
+
+    try:
+        with metrics.timer("occurrence_consumer.process_batch_message"):
+            _process_message_batch(payloads)
+    except Exception:
+        logger.exception("failed to process message batch")
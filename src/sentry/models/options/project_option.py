@@ -121,6 +121,33 @@ class ProjectOptionManager(OptionManager["ProjectOption"]):
 
         return self._option_cache.get(cache_key, {})
 
+    def prefetch_all_values(self, project_ids: Sequence[int]) -> None:
+        """
+        Loads the options of many projects into the local cache at once, with a single cache and
+        database lookup instead of one `get_all_values` lookup per project.
+        """
+        cache_keys = {
+            self._make_key(project_id): project_id
+            for project_id in project_ids
+            if self._make_key(project_id) not in self._option_cache
+        }
+        if not cache_keys:
+            return
+
+        cached = cache.get_many(list(cache_keys))
+        self._option_cache.update(cached)
+
+        missing = [
+            project_id for cache_key, project_id in cache_keys.items() if cache_key not in cached
+        ]
+        if missing:
+            results: dict[int, dict[str, Value]] = {project_id: {} for project_id in missing}
+            for option in self.filter(project__in=missing):
+                results[option.project_id][option.key] = option.value
+            loaded = {self._make_key(project_id): result for project_id, result in results.items()}
+            cache.set_many(loaded)
+            self._option_cache.update(loaded)
+
     def reload_cache(self, project_id: int, update_reason: str) -> Mapping[str, Value]:
         from sentry.tasks.relay import schedule_invalidate_project_config
 
@@ -2,17 +2,21 @@ from __future__ import annotations
 
 import logging
 import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Dict, Mapping, Optional
+from functools import partial
+from typing import Dict, List, Literal, Mapping, Optional, Sequence, Tuple
 
 import msgpack
 import sentry_sdk
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.processing.strategies.abstract import ProcessingStrategy, ProcessingStrategyFactory
+from arroyo.processing.strategies.batching import BatchStep, ValuesBatch
 from arroyo.processing.strategies.commit import CommitOffsets
 from arroyo.processing.strategies.run_task import RunTask
 from arroyo.types import BrokerValue, Commit, Message, Partition
-from django.db import router, transaction
+from django.db import close_old_connections, router, transaction
 from django.utils.text import slugify
 from sentry_sdk.tracing import Span, Transaction
 
@@ -580,6 +584,10 @@ def _process_message(
     if wrapper["message_type"] == "clock_pulse":
         return
 
+    _process_checkin_message(ts, wrapper)
+
+
+def _process_checkin_message(ts: datetime, wrapper: CheckinMessage) -> None:
     with sentry_sdk.start_transaction(
         op="_process_message",
         name="monitors.monitor_consumer",
@@ -592,12 +600,127 @@ def _process_message(
         _process_checkin(params, ts, start_time, project_id, source_sdk, txn)
 
 
+def _checkin_group_key(wrapper: CheckinMessage) -> Tuple[int, str]:
+    """
+    The project and (normalized) slug of the monitor a check-in belongs to.
+    """
+    params: CheckinPayload = json.loads(wrapper["payload"])
+    monitor_slug = slugify(params["monitor_slug"])[:MAX_SLUG_LENGTH].strip("-")
+    return int(wrapper["project_id"]), monitor_slug
+
+
+def _process_checkin_group(checkins: Sequence[Tuple[datetime, CheckinMessage]]) -> None:
+    """
+    Processes the check-ins of a single monitor, in the order they were consumed.
+    """
+    # Worker threads outlive the batch, treat every group like a request of its own.
+    close_old_connections()
+    try:
+        for ts, wrapper in checkins:
+            try:
+                _process_checkin_message(ts, wrapper)
+            except Exception:
+                logger.exception("Failed to process message payload")
+    finally:
+        close_old_connections()
+
+
+def _process_checkin_groups(
+    executor: ThreadPoolExecutor,
+    checkin_groups: Mapping[Tuple[int, str], Sequence[Tuple[datetime, CheckinMessage]]],
+) -> None:
+    if not checkin_groups:
+        return
+
+    metrics.distribution("monitors.checkin.parallel_batch_groups", len(checkin_groups))
+    futures = [
+        executor.submit(_process_checkin_group, checkins) for checkins in checkin_groups.values()
+    ]
+    wait(futures)
+
+
+def process_batch(
+    executor: ThreadPoolExecutor, message: Message[ValuesBatch[KafkaPayload]]
+) -> None:
+    """
+    Processes a batch of check-ins, concurrently for distinct monitors.
+
+    The check-ins of a monitor are processed in order on a single thread. The monitor tasks are
+    triggered in the order of the messages, and all check-ins consumed before the clock of a
+    partition moves to the next minute are processed before the tasks for it are triggered.
+    """
+    checkin_groups: Dict[Tuple[int, str], List[Tuple[datetime, CheckinMessage]]] = defaultdict(list)
+    current_minute = None
+
+    for item in message.payload:
+        assert isinstance(item, BrokerValue)
+
+        minute = item.timestamp.replace(second=0, microsecond=0)
+        if minute != current_minute:
+            _process_checkin_groups(executor, checkin_groups)
+            checkin_groups.clear()
+            current_minute = minute
+
+        try:
+            wrapper: CheckinMessage | ClockPulseMessage = msgpack.unpackb(item.payload.value)
+
+            try:
+                try_monitor_tasks_trigger(item.timestamp, item.partition.index)
+            except Exception:
+                logger.exception("Failed to trigger monitor tasks", exc_info=True)
+
+            # Nothing else to do with clock pulses
+            if wrapper["message_type"] == "clock_pulse":
+                continue
+
+            checkin_groups[_checkin_group_key(wrapper)].append((item.timestamp, wrapper))
+        except Exception:
+            logger.exception("Failed to process message payload")
+
+    _process_checkin_groups(executor, checkin_groups)
+
+
 class StoreMonitorCheckInStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
+    """
+    Processes check-ins one at a time (``serial``), or in batches in which the check-ins of
+    distinct monitors are processed concurrently (``parallel``). In parallel mode offsets are
+    committed once the whole batch has been processed.
+    """
+
+    parallel_executor: Optional[ThreadPoolExecutor] = None
+
+    def __init__(
+        self,
+        mode: Literal["serial", "parallel"] = "serial",
+        max_batch_size: int = 500,
+        max_batch_time: int = 1,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        if mode == "parallel":
+            self.parallel_executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        self.max_batch_size = max_batch_size
+        self.max_batch_time = max_batch_time
+
+    def shutdown(self) -> None:
+        if self.parallel_executor:
+            self.parallel_executor.shutdown()
+
     def create_with_partitions(
         self,
         commit: Commit,
         partitions: Mapping[Partition, int],
     ) -> ProcessingStrategy[KafkaPayload]:
+        if self.parallel_executor:
+            return BatchStep(
+                max_batch_size=self.max_batch_size,
+                max_batch_time=self.max_batch_time,
+                next_step=RunTask(
+                    function=partial(process_batch, self.parallel_executor),
+                    next_step=CommitOffsets(commit),
+                ),
+            )
+
         def process_message(message: Message[KafkaPayload]) -> None:
             assert isinstance(message.value, BrokerValue)
             try:
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import dataclasses
 import logging
 import uuid
 from datetime import datetime
+from typing import Dict, Hashable, List, Sequence, Tuple
 
+from django.db import router, transaction
 from django.db.models import Q
 from django.utils import timezone
 
@@ -27,6 +30,12 @@ from sentry.monitors.models import (
 
 logger = logging.getLogger(__name__)
 
+# The status of a monitor environment for the status of a failed check-in
+FAILED_STATUS_MAP = {
+    CheckInStatus.MISSED: MonitorStatus.MISSED_CHECKIN,
+    CheckInStatus.TIMEOUT: MonitorStatus.TIMEOUT,
+}
+
 
 def mark_failed(
     failed_checkin: MonitorCheckIn,
@@ -73,11 +82,7 @@ def mark_failed(
     # Additionally update status when not using thresholds. The threshold based
     # failure will only update status once it has passed the threshold.
     if not failure_issue_threshold:
-        failed_status_map = {
-            CheckInStatus.MISSED: MonitorStatus.MISSED_CHECKIN,
-            CheckInStatus.TIMEOUT: MonitorStatus.TIMEOUT,
-        }
-        field_updates["status"] = failed_status_map.get(failed_checkin.status, MonitorStatus.ERROR)
+        field_updates["status"] = FAILED_STATUS_MAP.get(failed_checkin.status, MonitorStatus.ERROR)
 
     affected = monitors_to_update.update(**field_updates)
 
@@ -101,6 +106,111 @@ def mark_failed(
         return mark_failed_no_threshold(failed_checkin)
 
 
+def mark_failed_bulk(failed_checkins: Sequence[Tuple[MonitorCheckIn, datetime]]):
+    """
+    Equivalent to calling `mark_failed` for each of the failed check-ins and their reference
+    times, but updates the monitor environments with a single statement. Used by the tasks
+    marking many monitors as missed or timed out at once.
+
+    Next check-in times are only computed once for monitors sharing a schedule. Check-ins of a
+    monitor environment that already has a failed check-in earlier in ``failed_checkins`` are
+    passed to `mark_failed` afterwards.
+    """
+    next_checkins: Dict[Hashable, Tuple[datetime, datetime]] = {}
+    updated_checkins: List[MonitorCheckIn] = []
+    updated_environment_ids = set()
+    remaining_checkins: List[Tuple[MonitorCheckIn, datetime]] = []
+
+    monitor_environment_ids = {checkin.monitor_environment_id for checkin, _ in failed_checkins}
+
+    with transaction.atomic(router.db_for_write(MonitorEnvironment)):
+        # Lock the monitor environments so that no check-in can be processed between reading
+        # their last check-in and updating them.
+        monitor_environments = {
+            monitor_env.id: monitor_env
+            for monitor_env in MonitorEnvironment.objects.select_for_update(of=("self",))
+            .select_related("monitor")
+            .filter(id__in=monitor_environment_ids)
+        }
+
+        for failed_checkin, ts in failed_checkins:
+            monitor_env = monitor_environments.get(failed_checkin.monitor_environment_id)
+            if monitor_env is None:
+                continue
+            if monitor_env.id in updated_environment_ids:
+                remaining_checkins.append((failed_checkin, ts))
+                continue
+
+            monitor = monitor_env.monitor
+            failure_issue_threshold = monitor.config.get("failure_issue_threshold", 0)
+
+            # See `mark_failed`, the `last_checkin` is not moved forward for missed check-ins
+            if failed_checkin.status == CheckInStatus.MISSED:
+                last_checkin = failed_checkin.monitor_environment.last_checkin
+            else:
+                last_checkin = failed_checkin.date_added
+
+            # We ONLY want to update the monitor if there have not been newer check-ins.
+            if monitor_env.last_checkin is not None and (
+                last_checkin is None or monitor_env.last_checkin > last_checkin
+            ):
+                continue
+
+            try:
+                key = (
+                    dataclasses.astuple(monitor.schedule),
+                    monitor.timezone.zone,
+                    monitor.config.get("checkin_margin"),
+                    ts,
+                )
+                if key not in next_checkins:
+                    next_checkins[key] = (
+                        monitor.get_next_expected_checkin(ts),
+                        monitor.get_next_expected_checkin_latest(ts),
+                    )
+            except Exception:
+                logger.exception(
+                    "monitors.mark_failed_bulk.next_checkin",
+                    extra={"monitor_environment_id": monitor_env.id},
+                )
+                continue
+
+            monitor_env.last_checkin = last_checkin
+            monitor_env.next_checkin, monitor_env.next_checkin_latest = next_checkins[key]
+            if not failure_issue_threshold:
+                monitor_env.status = FAILED_STATUS_MAP.get(
+                    failed_checkin.status, MonitorStatus.ERROR
+                )
+
+            failed_checkin.monitor_environment = monitor_env
+            updated_checkins.append(failed_checkin)
+            updated_environment_ids.add(monitor_env.id)
+
+        MonitorEnvironment.objects.bulk_update(
+            [checkin.monitor_environment for checkin in updated_checkins],
+            fields=["last_checkin", "next_checkin", "next_checkin_latest", "status"],
+        )
+
+    # Create incidents + issues
+    for failed_checkin in updated_checkins:
+        failure_issue_threshold = failed_checkin.monitor_environment.monitor.config.get(
+            "failure_issue_threshold", 0
+        )
+        try:
+            if failure_issue_threshold:
+                mark_failed_threshold(failed_checkin, failure_issue_threshold)
+            else:
+                mark_failed_no_threshold(failed_checkin)
+        except Exception:
+            logger.exception(
+                "monitors.mark_failed_bulk.failed",
+                extra={"checkin_id": failed_checkin.id},
+            )
+
+    for failed_checkin, ts in remaining_checkins:
+        mark_failed(failed_checkin, ts=ts)
+
+
 def mark_failed_threshold(failed_checkin: MonitorCheckIn, failure_issue_threshold: int):
     from sentry.signals import monitor_environment_failed
 
@@ -1,8 +1,14 @@
-from datetime import datetime
-from typing import Dict
+from __future__ import annotations
 
-from croniter import croniter
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta, tzinfo
+from typing import Callable, Dict, Hashable, List, Optional
+
+from croniter import CroniterBadDateError, croniter
 from dateutil import rrule
+from django.conf import settings
 
 from sentry.monitors.types import IntervalUnit, ScheduleConfig
 
@@ -15,6 +21,212 @@ SCHEDULE_INTERVAL_MAP: Dict[IntervalUnit, int] = {
     "minute": rrule.MINUTELY,
 }
 
+# Number of fire times computed at once when extending the fire times of a crontab schedule
+CRONTAB_WINDOW_SIZE = 8
+
+# Maximum number of fire times kept for a crontab schedule
+CRONTAB_MAX_FIRE_TIMES = 64
+
+# Maximum number of windows computed towards a reference time before starting over from it
+CRONTAB_MAX_WINDOWS = 4
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _take(
+    get_fire_time: Callable[[type], datetime], count: int, utcoffset: Optional[timedelta]
+) -> List[datetime]:
+    """
+    Returns up to ``count`` fire times from a `croniter` positioned at a time with the UTC offset
+    ``utcoffset``. Around a change of the UTC offset (daylight saving time) croniter's results
+    depend on where it started from, so iteration stops before one.
+    """
+    fire_times: List[datetime] = []
+    try:
+        while len(fire_times) < count:
+            fire_time = get_fire_time(datetime)
+            if fire_time.utcoffset() != utcoffset:
+                break
+            fire_times.append(fire_time)
+    except CroniterBadDateError:
+        # Fire times further away than croniter searches for are left to a new croniter
+        pass
+    return fire_times
+
+
+def _same_utcoffset(fire_time: datetime, reference_ts: datetime) -> Optional[datetime]:
+    return fire_time if fire_time.utcoffset() == reference_ts.utcoffset() else None
+
+
+class CrontabFireTimes:
+    """
+    The fire times of a crontab schedule (in one timezone) computed so far, so that the next and
+    previous fire times of reference times close to each other are found by binary search
+    instead of by a new `croniter` each.
+
+    ``times`` holds every fire time after ``start`` and up to and including ``end``. The range
+    is extended by a few fire times at a time as the reference times move, and started over
+    from the reference time when it is far outside of the range.
+    """
+
+    def __init__(self, crontab: str) -> None:
+        self.crontab = crontab
+        self.lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, reference_ts: Optional[datetime]) -> None:
+        self.times: List[datetime] = []
+        self.start = reference_ts
+        self.end = reference_ts
+        # Iterators positioned at `end` and just after `start`
+        self._forward: Optional[croniter] = None
+        self._backward: Optional[croniter] = None
+
+    def _extend_forward(self) -> bool:
+        """
+        Adds fire times after ``end``, returns whether there were any.
+        """
+        assert self.end is not None
+        # A single fire time is enough for reference times that are not seen again
+        window_size = CRONTAB_WINDOW_SIZE if self.times else 1
+        later: List[datetime] = []
+        if self._forward is not None:
+            later = _take(self._forward.get_next, window_size, self.end.utcoffset())
+        if not later:
+            self._forward = None
+            forward = croniter(self.crontab, self.end)
+            later = _take(forward.get_next, window_size, self.end.utcoffset())
+            if not later:
+                return False
+            self._forward = forward
+        if len(later) < window_size:
+            self._forward = None
+        self.times.extend(later)
+        self.end = self.times[-1]
+
+        if len(self.times) > CRONTAB_MAX_FIRE_TIMES:
+            del self.times[:-CRONTAB_MAX_FIRE_TIMES]
+            self.start = self.times[0] - _MICROSECOND
+            self._backward = None
+        return True
+
+    def _extend_backward(self) -> bool:
+        """
+        Adds fire times before ``start``, returns whether there were any.
+        """
+        assert self.start is not None
+        window_size = CRONTAB_WINDOW_SIZE if self.times else 1
+        earlier: List[datetime] = []
+        if self._backward is not None:
+            earlier = _take(self._backward.get_prev, window_size, self.start.utcoffset())
+        if not earlier:
+            self._backward = None
+            # Includes `start` itself
+            backward = croniter(self.crontab, self.start + _MICROSECOND)
+            earlier = _take(backward.get_prev, window_size, self.start.utcoffset())
+            if not earlier:
+                return False
+            self._backward = backward
+        if len(earlier) < window_size:
+            self._backward = None
+        earlier.reverse()
+        self.times[:0] = earlier
+        self.start = self.times[0] - _MICROSECOND
+
+        if len(self.times) > CRONTAB_MAX_FIRE_TIMES:
+            del self.times[CRONTAB_MAX_FIRE_TIMES:]
+            self.end = self.times[-1]
+            self._forward = None
+        return True
+
+    def _includes(self, reference_ts: datetime) -> bool:
+        return (
+            self.start is not None
+            and self.end is not None
+            and self.start <= reference_ts <= self.end
+        )
+
+    def _seek(self, reference_ts: datetime) -> None:
+        """
+        Extends the range until it includes ``reference_ts``.
+        """
+        for _ in range(CRONTAB_MAX_WINDOWS):
+            if self.start is None or self._includes(reference_ts):
+                break
+            if reference_ts > self.end:
+                extended = self._extend_forward()
+            else:
+                extended = self._extend_backward()
+            if not extended:
+                break
+
+        if not self._includes(reference_ts):
+            self._reset(reference_ts)
+
+    def get_next(self, reference_ts: datetime) -> Optional[datetime]:
+        """
+        The first fire time after ``reference_ts``, like ``croniter.get_next``, or ``None`` if it
+        is not known (around changes of the UTC offset and far away fire times).
+        """
+        with self.lock:
+            self._seek(reference_ts)
+            while True:
+                index = bisect_right(self.times, reference_ts)
+                if index < len(self.times):
+                    return _same_utcoffset(self.times[index], reference_ts)
+                if not self._extend_forward():
+                    return None
+
+    def get_prev(self, reference_ts: datetime) -> Optional[datetime]:
+        """
+        The last fire time before ``reference_ts``, like ``croniter.get_prev``, or ``None`` if it
+        is not known.
+        """
+        with self.lock:
+            self._seek(reference_ts)
+            while True:
+                index = bisect_left(self.times, reference_ts)
+                if index > 0:
+                    return _same_utcoffset(self.times[index - 1], reference_ts)
+                if not self._extend_backward():
+                    return None
+
+
+class _CrontabFireTimesCache:
+    def __init__(self) -> None:
+        self._data: OrderedDict[Hashable, CrontabFireTimes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, crontab: str, tz: Optional[tzinfo], max_size: int) -> CrontabFireTimes:
+        # pytz uses a different tzinfo for each offset of a timezone
+        key = (crontab, getattr(tz, "zone", tz))
+        with self._lock:
+            fire_times = self._data.get(key)
+            if fire_times is None:
+                fire_times = self._data[key] = CrontabFireTimes(crontab)
+                while len(self._data) > max_size:
+                    self._data.popitem(last=False)
+            self._data.move_to_end(key)
+            return fire_times
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_crontab_fire_times_cache = _CrontabFireTimesCache()
+
+
+def get_crontab_fire_times(crontab: str, tz: Optional[tzinfo]) -> Optional[CrontabFireTimes]:
+    """
+    Returns the cached fire times of a crontab schedule in the timezone ``tz``, or ``None`` if
+    caching is disabled.
+    """
+    max_size = settings.SENTRY_MONITORS_SCHEDULE_CACHE_SIZE
+    if not max_size:
+        return None
+    return _crontab_fire_times_cache.get(crontab, tz, max_size)
+
 
 def get_next_schedule(
     reference_ts: datetime,
@@ -39,8 +251,12 @@ def get_next_schedule(
     # of granularity we're able to support
 
     if schedule.type == "crontab":
-        iterator = croniter(schedule.crontab, reference_ts)
-        return iterator.get_next(datetime).replace(second=0, microsecond=0)
+        fire_times = get_crontab_fire_times(schedule.crontab, reference_ts.tzinfo)
+        next_ts = fire_times.get_next(reference_ts) if fire_times is not None else None
+        if next_ts is None:
+            iterator = croniter(schedule.crontab, reference_ts)
+            next_ts = iterator.get_next(datetime)
+        return next_ts.replace(second=0, microsecond=0)
 
     if schedule.type == "interval":
         rule = rrule.rrule(
@@ -78,11 +294,11 @@ def get_prev_schedule(
     >>> 05:30
     """
     if schedule.type == "crontab":
-        return (
-            croniter(schedule.crontab, reference_ts)
-            .get_prev(datetime)
-            .replace(second=0, microsecond=0)
-        )
+        fire_times = get_crontab_fire_times(schedule.crontab, reference_ts.tzinfo)
+        prev_ts = fire_times.get_prev(reference_ts) if fire_times is not None else None
+        if prev_ts is None:
+            prev_ts = croniter(schedule.crontab, reference_ts).get_prev(datetime)
+        return prev_ts.replace(second=0, microsecond=0)
 
     if schedule.type == "interval":
         rule = rrule.rrule(
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import dataclasses
 import logging
 from datetime import datetime
 from functools import lru_cache
-from typing import Mapping
+from typing import Dict, Hashable, List, Mapping, Sequence, Tuple
 
 import msgpack
 import sentry_sdk
@@ -11,15 +12,18 @@ from arroyo import Partition, Topic
 from arroyo.backends.kafka import KafkaPayload, KafkaProducer, build_kafka_configuration
 from confluent_kafka.admin import AdminClient, PartitionMetadata
 from django.conf import settings
+from django.db.models import Max
 from django.utils import timezone
 
-from sentry.monitors.logic.mark_failed import mark_failed
+from sentry import options
+from sentry.monitors.logic.mark_failed import mark_failed, mark_failed_bulk
 from sentry.monitors.schedule import get_prev_schedule
 from sentry.monitors.types import ClockPulseMessage
 from sentry.silo import SiloMode
 from sentry.tasks.base import instrumented_task
 from sentry.utils import metrics, redis
 from sentry.utils.arroyo_producer import SingletonProducer
+from sentry.utils.iterators import chunked
 from sentry.utils.kafka_config import (
     get_kafka_admin_cluster_options,
     get_kafka_producer_cluster_options,
@@ -28,6 +32,7 @@ from sentry.utils.kafka_config import (
 
 from .models import (
     CheckInStatus,
+    Monitor,
     MonitorCheckIn,
     MonitorEnvironment,
     MonitorObjectStatus,
@@ -49,6 +54,10 @@ MONITOR_LIMIT = 10_000
 # monitors the larger the number of checkins to check will exist.
 CHECKINS_LIMIT = 10_000
 
+# This is the number of monitor environments or check-ins marked as missed or
+# timed out by a single task when `crons.bulk-failure-evaluation` is enabled.
+BULK_EVALUATION_CHUNK_SIZE = 500
+
 # This key is used to store the last timestamp that the tasks were triggered.
 MONITOR_TASKS_LAST_TRIGGERED_KEY = "sentry.monitors.last_tasks_ts"
 
@@ -253,6 +262,14 @@ def check_missing(current_datetime: datetime):
     )
 
     metrics.gauge("sentry.monitors.tasks.check_missing.count", qs.count(), sample_rate=1.0)
+
+    if options.get("crons.bulk-failure-evaluation"):
+        for monitor_environment_ids in chunked(
+            qs.values_list("id", flat=True), BULK_EVALUATION_CHUNK_SIZE
+        ):
+            mark_environments_missing.delay(monitor_environment_ids, current_datetime)
+        return
+
     for monitor_environment in qs:
         mark_environment_missing.delay(monitor_environment.id, current_datetime)
 
@@ -323,6 +340,82 @@ def mark_environment_missing(monitor_environment_id: int, ts: datetime):
     mark_failed(checkin, ts=most_recent_expected_ts)
 
 
+@instrumented_task(
+    name="sentry.monitors.tasks.mark_environments_missing",
+    max_retries=0,
+    record_timing=True,
+)
+def mark_environments_missing(monitor_environment_ids: Sequence[int], ts: datetime):
+    """
+    Bulk version of `mark_environment_missing`: creates the missed check-ins with a single
+    statement and marks the monitor environments as failed through `mark_failed_bulk`.
+    """
+    logger.info(
+        "monitor.missed-checkins", extra={"monitor_environment_ids": monitor_environment_ids}
+    )
+
+    with metrics.timer("sentry.monitors.tasks.mark_environments_missing.evaluate"):
+        monitor_environments = MonitorEnvironment.objects.select_related("monitor").filter(
+            id__in=monitor_environment_ids
+        )
+
+        # See `mark_environment_missing` for how these are computed
+        checkins = MonitorCheckIn.objects.bulk_create(
+            [
+                MonitorCheckIn(
+                    project_id=monitor_environment.monitor.project_id,
+                    monitor=monitor_environment.monitor,
+                    monitor_environment=monitor_environment,
+                    status=CheckInStatus.MISSED,
+                    date_added=monitor_environment.next_checkin,
+                    expected_time=monitor_environment.next_checkin,
+                    monitor_config=monitor_environment.monitor.get_validated_config(),
+                )
+                for monitor_environment in monitor_environments
+            ]
+        )
+
+        most_recent_expected = _PrevScheduleCache(ts)
+        failed_checkins = []
+        for checkin in checkins:
+            try:
+                most_recent_expected_ts = most_recent_expected.get(
+                    checkin.monitor, checkin.expected_time
+                )
+            except Exception:
+                logger.exception(
+                    "monitor.missed-checkin.failed",
+                    extra={"monitor_environment_id": checkin.monitor_environment_id},
+                )
+                continue
+            failed_checkins.append((checkin, most_recent_expected_ts))
+
+        mark_failed_bulk(failed_checkins)
+
+
+class _PrevScheduleCache:
+    """
+    Computes the most recent expected check-in times for a reference time, once per schedule
+    and start time.
+    """
+
+    def __init__(self, reference_ts: datetime) -> None:
+        self.reference_ts = reference_ts
+        self._cache: Dict[Hashable, datetime] = {}
+
+    def get(self, monitor: Monitor, start_ts: datetime) -> datetime:
+        key = (dataclasses.astuple(monitor.schedule), monitor.timezone.zone, start_ts)
+        if key not in self._cache:
+            # When computing our timestamps MUST be in the correct timezone of the
+            # monitor to compute the previous schedule
+            self._cache[key] = get_prev_schedule(
+                start_ts.astimezone(monitor.timezone),
+                self.reference_ts.astimezone(monitor.timezone),
+                monitor.schedule,
+            )
+        return self._cache[key]
+
+
 @instrumented_task(
     name="sentry.monitors.tasks.check_timeout",
     time_limit=15,
@@ -336,6 +429,12 @@ def check_timeout(current_datetime: datetime):
         status=CheckInStatus.IN_PROGRESS, timeout_at__lte=current_datetime
     )[:CHECKINS_LIMIT]
     metrics.gauge("sentry.monitors.tasks.check_timeout.count", qs.count(), sample_rate=1)
+
+    if options.get("crons.bulk-failure-evaluation"):
+        for checkin_ids in chunked(qs.values_list("id", flat=True), BULK_EVALUATION_CHUNK_SIZE):
+            mark_checkins_timeout.delay(checkin_ids, current_datetime)
+        return
+
     # check for any monitors which are still running and have exceeded their maximum runtime
     for checkin in qs:
         mark_checkin_timeout.delay(checkin.id, current_datetime)
@@ -391,3 +490,60 @@ def mark_checkin_timeout(checkin_id: int, ts: datetime, **kwargs):
         )
 
         mark_failed(checkin, ts=most_recent_expected_ts)
+
+
+@instrumented_task(
+    name="sentry.monitors.tasks.mark_checkins_timeout",
+    max_retries=0,
+    record_timing=True,
+)
+def mark_checkins_timeout(checkin_ids: Sequence[int], ts: datetime):
+    """
+    Bulk version of `mark_checkin_timeout`: updates the check-ins and looks up newer results
+    with a single statement each, and marks the monitor environments as failed through
+    `mark_failed_bulk`.
+    """
+    logger.info("checkin.timeouts", extra={"checkin_ids": checkin_ids})
+
+    with metrics.timer("sentry.monitors.tasks.mark_checkins_timeout.evaluate"):
+        checkins = list(
+            MonitorCheckIn.objects.select_related("monitor_environment__monitor")
+            .filter(id__in=checkin_ids)
+            .order_by("date_added")
+        )
+        MonitorCheckIn.objects.filter(id__in=[checkin.id for checkin in checkins]).update(
+            status=CheckInStatus.TIMEOUT
+        )
+
+        # The most recent completed check-in of each monitor environment
+        latest_results: Dict[int, datetime] = dict(
+            MonitorCheckIn.objects.filter(
+                monitor_environment__in={checkin.monitor_environment_id for checkin in checkins},
+                status__in=[CheckInStatus.OK, CheckInStatus.ERROR],
+            )
+            .values_list("monitor_environment")
+            .annotate(Max("date_added"))
+        )
+
+        most_recent_expected = _PrevScheduleCache(ts)
+        failed_checkins: List[Tuple[MonitorCheckIn, datetime]] = []
+        for checkin in checkins:
+            checkin.status = CheckInStatus.TIMEOUT
+
+            # we only mark the monitor as failed if a newer checkin wasn't responsible for the
+            # state change
+            latest_result = latest_results.get(checkin.monitor_environment_id)
+            if latest_result is not None and latest_result > checkin.date_added:
+                continue
+
+            # See `mark_checkin_timeout` for how this is computed
+            try:
+                most_recent_expected_ts = most_recent_expected.get(
+                    checkin.monitor_environment.monitor, checkin.date_added
+                )
+            except Exception:
+                logger.exception("checkin.timeout.failed", extra={"checkin_id": checkin.id})
+                continue
+            failed_checkins.append((checkin, most_recent_expected_ts))
+
+        mark_failed_bulk(failed_checkins)
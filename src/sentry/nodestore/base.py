@@ -5,6 +5,8 @@ from threading import local
 import sentry_sdk
 from django.core.cache import InvalidCacheBackendError, caches
 
+from sentry.nodestore.lazy import LazyNodeData
+from sentry.nodestore.local_cache import get_local_cache
 from sentry.utils import json
 from sentry.utils.cache import memoize
 from sentry.utils.services import Service
@@ -67,6 +69,7 @@ class NodeStorage(local, Service):
         "get_bytes",
         "get_multi",
         "set",
+        "set_multi",
         "set_bytes",
         "set_subkeys",
         "cleanup",
@@ -116,6 +119,11 @@ class NodeStorage(local, Service):
         except StopIteration:
             return None
 
+    def _decode_lazy(self, value):
+        if not value:
+            return None
+        return LazyNodeData(buffer=value.split(b"\n", 1)[0])
+
     def get_bytes(self, id):
         """
         >>> nodestore._get_bytes('key1')
@@ -141,8 +149,17 @@ class NodeStorage(local, Service):
                     return item_from_cache
 
             span.set_tag("subkey", str(subkey))
-            bytes_data = self._get_bytes(id)
-            rv = self._decode(bytes_data, subkey=subkey)
+            local_cache = get_local_cache()
+            cached_node = local_cache.get_many([id]).get(id) if local_cache is not None else None
+            if cached_node is not None:
+                bytes_data = None
+                rv = cached_node.decode(subkey)
+                span.set_tag("origin", "from_local_cache")
+            else:
+                bytes_data = self._get_bytes(id)
+                rv = self._decode(bytes_data, subkey=subkey)
+                if local_cache is not None:
+                    local_cache.set_many({id: bytes_data})
             if subkey is None:
                 # set cache item only after we know decoding did not fail
                 self._set_cache_item(id, rv)
@@ -164,17 +181,23 @@ class NodeStorage(local, Service):
         """
         return {id: self._get_bytes(id) for id in id_list}
 
-    def get_multi(self, id_list, subkey=None):
+    def get_multi(self, id_list, subkey=None, lazy=False):
         """
         >>> nodestore.get_multi(['key1', 'key2')
         {
             "key1": {"message": "hello world"},
             "key2": {"message": "hello world"}
         }
+
+        With ``lazy=True`` the main payloads of nodes that are not in the cache are returned as
+        `LazyNodeData`, which is only decoded once it is used. Those are not written back to the
+        cache, as that would require decoding them.
         """
+        lazy = lazy and subkey is None
         with sentry_sdk.start_span(op="nodestore.get_multi") as span:
             span.set_tag("subkey", str(subkey))
             span.set_tag("num_ids", len(id_list))
+            span.set_tag("lazy", lazy)
 
             if subkey is None:
                 cache_items = self._get_cache_items(id_list)
@@ -186,12 +209,28 @@ class NodeStorage(local, Service):
             else:
                 uncached_ids = id_list
 
-            items = {
-                id: self._decode(value, subkey=subkey)
-                for id, value in self._get_bytes_multi(uncached_ids).items()
-            }
+            local_cache = get_local_cache()
+            if local_cache is not None:
+                cached_nodes = local_cache.get_many(uncached_ids)
+                bytes_items = self._get_bytes_multi(
+                    [id for id in uncached_ids if id not in cached_nodes]
+                )
+                local_cache.set_many(bytes_items)
+            else:
+                cached_nodes = {}
+                bytes_items = self._get_bytes_multi(uncached_ids)
+
+            if lazy:
+                items = {id: node.decode_lazy() for id, node in cached_nodes.items()}
+                items.update((id, self._decode_lazy(value)) for id, value in bytes_items.items())
+            else:
+                items = {id: node.decode(subkey) for id, node in cached_nodes.items()}
+                items.update(
+                    (id, self._decode(value, subkey=subkey)) for id, value in bytes_items.items()
+                )
             if subkey is None:
-                self._set_cache_items(items)
+                if not lazy:
+                    self._set_cache_items(items)
                 items.update(cache_items)
 
             span.set_tag("result", "from_service")
@@ -219,7 +258,9 @@ class NodeStorage(local, Service):
         """
         >>> nodestore.set_bytes('key1', b"{'foo': 'bar'}")
         """
-        return self._set_bytes(id, data, ttl)
+        rv = self._set_bytes(id, data, ttl)
+        self._delete_local_cache_items([id])
+        return rv
 
     def _set_bytes(self, id, data, ttl=None):
         raise NotImplementedError
@@ -233,6 +274,27 @@ class NodeStorage(local, Service):
         """
         return self.set_subkeys(id, {None: data}, ttl=ttl)
 
+    def _set_bytes_multi(self, items: dict[str, bytes], ttl=None) -> None:
+        """
+        >>> nodestore._set_bytes_multi({'key1': b"{'foo': 'bar'}", 'key2': b"{'foo': 'baz'}"})
+        """
+        for id, data in items.items():
+            self._set_bytes(id, data, ttl)
+
+    def set_multi(self, items, ttl=None):
+        """
+        Set values for multiple ids at once. Like `set`, this deletes existing subkeys.
+
+        >>> nodestore.set_multi({'key1': {'foo': 'bar'}, 'key2': {'foo': 'baz'}})
+        """
+        with sentry_sdk.start_span(op="nodestore.set_multi") as span:
+            span.set_tag("num_ids", len(items))
+            bytes_items = {id: self._encode({None: data}) for id, data in items.items()}
+            self._set_bytes_multi(bytes_items, ttl=ttl)
+            self._delete_local_cache_items(list(items))
+            # set cache only after encoding and write to nodestore has succeeded
+            self._set_cache_items({id: data for id, data in items.items() if data})
+
     def set_subkeys(self, id, data, ttl=None):
         """
         Set value for `id` and its subkeys.
@@ -254,6 +316,7 @@ class NodeStorage(local, Service):
             cache_item = data.get(None)
             bytes_data = self._encode(data)
             self._set_bytes(id, bytes_data, ttl=ttl)
+            self._delete_local_cache_items([id])
             # set cache only after encoding and write to nodestore has succeeded
             self._set_cache_item(id, cache_item)
 
@@ -283,10 +346,17 @@ class NodeStorage(local, Service):
     def _delete_cache_item(self, id):
         if self.cache:
             self.cache.delete(id)
+        self._delete_local_cache_items([id])
 
     def _delete_cache_items(self, id_list):
         if self.cache:
             self.cache.delete_many([id for id in id_list])
+        self._delete_local_cache_items(id_list)
+
+    def _delete_local_cache_items(self, id_list):
+        local_cache = get_local_cache()
+        if local_cache is not None:
+            local_cache.delete_many(id_list)
 
     @memoize
     def cache(self):
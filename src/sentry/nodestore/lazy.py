@@ -0,0 +1,181 @@
+"""
+Deferred decoding of node payloads.
+
+`NodeStorage.get_multi` used to turn every node into a dict up front, even though callers such as
+`eventstore.bind_nodes` fetch payloads for whole pages of events of which many are never read (or
+only through columns Snuba already returned). For large native or minified JavaScript events that
+is megabytes of objects per node.
+
+`LazyNodeData` instead keeps the raw (or still compressed) JSON bytes and only decodes them when
+the payload is actually used. A handful of leading top-level keys (such as ``_ref``) can be read
+without decoding the rest of the node: nodes are written with sorted keys (see
+`NodeStorage._encode`), so the top level is only scanned until the requested keys are found.
+Scanning is done in Python and is only worthwhile for the first few keys; whenever the scan can't
+answer cheaply the whole payload is decoded at once, which is far cheaper with the C JSON parser
+than walking every token in Python.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from collections.abc import MutableMapping
+from typing import Any, Collection, Iterator, Optional
+
+from sentry.utils import json
+
+# Strings (including escaped quotes) or structural characters of a JSON document.
+_TOKEN_RE = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\],:]')
+
+_OPEN = frozenset(b"{[")
+_CLOSE = frozenset(b"}]")
+_QUOTE = ord('"')
+_COLON = ord(":")
+
+_MISSING = object()
+
+
+class LazyNodeData(MutableMapping):
+    """
+    A node payload that is decoded on first use.
+
+    Holds either the raw JSON ``buffer`` or its zlib-``compressed`` form. Reading, iterating
+    or modifying the mapping decodes the full payload, except for `pop` and `peek`, which read
+    leading top-level keys directly from the buffer.
+    """
+
+    def __init__(self, buffer: Optional[bytes] = None, compressed: Optional[bytes] = None) -> None:
+        self._buffer = buffer
+        self._compressed = compressed
+        self._data: Optional[dict[str, Any]] = None
+        # Keys popped before the payload was decoded.
+        self._removed: set[str] = set()
+
+    @property
+    def is_decoded(self) -> bool:
+        return self._data is not None
+
+    def _get_buffer(self) -> bytes:
+        if self._buffer is None:
+            self._buffer = zlib.decompress(self._compressed) if self._compressed else b""
+            self._compressed = None
+        return self._buffer
+
+    def decode(self) -> dict[str, Any]:
+        """
+        Decodes the whole payload (once) and returns it as a plain dict.
+        """
+        if self._data is None:
+            buffer = self._get_buffer()
+            data = json.loads(buffer) if buffer else {}
+            if not isinstance(data, dict):
+                data = {}
+            for key in self._removed:
+                data.pop(key, None)
+            self._data = data
+            self._buffer = None
+        return self._data
+
+    def peek(self, keys: Collection[str]) -> dict[str, Any]:
+        """
+        Returns the values of those top-level ``keys`` that are present in the node.
+
+        Only the part of the buffer up to the last requested key is scanned. If a key is not found
+        before the scan passes it in sort order, the payload is decoded to tell whether the key is
+        missing or the node was not written with sorted keys.
+        """
+        if self._data is not None:
+            return {key: self._data[key] for key in keys if key in self._data}
+
+        wanted = set(keys) - self._removed
+        if not wanted:
+            return {}
+        last_wanted = max(wanted)
+
+        buffer = self._get_buffer()
+        rv: dict[str, Any] = {}
+        depth = 0
+        key: Optional[str] = None
+        value_start = 0
+        for match in _TOKEN_RE.finditer(buffer):
+            char = buffer[match.start()]
+            if char == _QUOTE:
+                if depth == 1 and key is None:
+                    key = json.loads(match.group(), skip_trace=True)
+                    if key > last_wanted:
+                        break
+                continue
+
+            if char in _OPEN:
+                depth += 1
+            elif char in _CLOSE:
+                depth -= 1
+                if depth == 0:
+                    if key in wanted:
+                        rv[key] = json.loads(buffer[value_start : match.start()], skip_trace=True)
+                    return rv
+            elif depth == 1:
+                if char == _COLON:
+                    value_start = match.end()
+                else:
+                    if key in wanted:
+                        rv[key] = json.loads(buffer[value_start : match.start()], skip_trace=True)
+                        if len(rv) == len(wanted):
+                            return rv
+                    key = None
+
+        data = self.decode()
+        return {key: data[key] for key in wanted if key in data}
+
+    def pop(self, key: str, default: Any = _MISSING) -> Any:
+        if self._data is None and key not in self._removed:
+            value = self.peek([key]).get(key, _MISSING)
+            if self._data is None:
+                self._removed.add(key)
+            else:
+                # `peek` had to decode the payload
+                self._data.pop(key, None)
+        elif self._data is not None:
+            value = self._data.pop(key, _MISSING)
+        else:
+            value = _MISSING
+
+        if value is _MISSING:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        return self.decode()[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.decode()[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.decode()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.decode())
+
+    def __len__(self) -> int:
+        return len(self.decode())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.decode()
+
+    def __reduce__(self) -> Any:
+        return dict, (self.decode(),)
+
+    def __bool__(self) -> bool:
+        if self._data is not None:
+            return bool(self._data)
+        return bool(self._buffer or self._compressed)
+
+    def __repr__(self) -> str:
+        if self._data is not None:
+            return f"<LazyNodeData: {self._data!r}>"
+        return "<LazyNodeData: (not decoded)>"
+
+    def copy(self) -> dict[str, Any]:
+        return dict(self.decode())
@@ -0,0 +1,157 @@
+"""
+Process-local read-through cache for nodestore payloads.
+
+Issue details, event list serializers and post_process all read the same recent events over and
+over. The Django ``nodedata`` cache only helps for the default subkey and still costs a network
+round trip and a full JSON decode for every read. This cache keeps the raw node bytes in process
+instead, bounded by the number of bytes held rather than the number of entries since node sizes
+vary by orders of magnitude.
+
+Each node is split into its subkey segments (see `NodeStorage._encode`) and every segment is
+compressed on its own. Nothing is decoded until a segment is accessed, so reading a subkey only
+decompresses and parses that subkey, not the whole node.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Iterable, Mapping, Optional, Tuple
+
+from django.conf import settings
+
+from sentry.nodestore.lazy import LazyNodeData
+from sentry.utils import json, metrics
+
+
+class CachedNode:
+    """
+    The compressed segments of a single node, decoded on access.
+    """
+
+    __slots__ = ("segments", "size")
+
+    def __init__(self, data: bytes) -> None:
+        lines = data.splitlines()
+        self.segments: dict[Optional[bytes], bytes] = {}
+        if lines:
+            self.segments[None] = zlib.compress(lines[0])
+            for key, value in zip(lines[1::2], lines[2::2]):
+                self.segments.setdefault(key.strip(), zlib.compress(value))
+        self.size = sum(len(key or b"") + len(value) for key, value in self.segments.items())
+
+    def decode(self, subkey: Optional[str] = None) -> Any:
+        segment = self.segments.get(subkey.encode("ascii") if subkey is not None else None)
+        if segment is None:
+            return None
+        return json.loads(zlib.decompress(segment))
+
+    def decode_lazy(self) -> Optional[LazyNodeData]:
+        segment = self.segments.get(None)
+        if segment is None:
+            return None
+        return LazyNodeData(compressed=segment)
+
+
+class NodeBytesCache:
+    """
+    An LRU of `CachedNode` instances bounded by the total size of the compressed segments.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes_held = 0
+        self._data: OrderedDict[str, Tuple[CachedNode, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_many(self, id_list: Iterable[str]) -> dict[str, CachedNode]:
+        rv = {}
+        now = time.monotonic()
+        requested = 0
+        with self._lock:
+            for id in id_list:
+                requested += 1
+                entry = self._data.get(id)
+                if entry is None:
+                    continue
+                node, expires_at = entry
+                if expires_at <= now:
+                    self._remove(id)
+                    continue
+                self._data.move_to_end(id)
+                rv[id] = node
+
+        if requested:
+            metrics.incr("nodestore.local_cache", tags={"cache_hit": "true"}, amount=len(rv))
+            metrics.incr(
+                "nodestore.local_cache", tags={"cache_hit": "false"}, amount=requested - len(rv)
+            )
+            metrics.distribution("nodestore.local_cache.hit_ratio", len(rv) / requested)
+        return rv
+
+    def set_many(self, items: Mapping[str, Optional[bytes]]) -> None:
+        nodes = {id: CachedNode(data) for id, data in items.items() if data}
+        if not nodes:
+            return
+
+        expires_at = time.monotonic() + self.ttl
+        evicted = 0
+        with self._lock:
+            for id, node in nodes.items():
+                if node.size > self.max_bytes:
+                    continue
+                self._remove(id)
+                self._data[id] = (node, expires_at)
+                self.bytes_held += node.size
+
+            while self.bytes_held > self.max_bytes and self._data:
+                id = next(iter(self._data))
+                self._remove(id)
+                evicted += 1
+            bytes_held = self.bytes_held
+
+        if evicted:
+            metrics.incr("nodestore.local_cache.evictions", amount=evicted)
+        metrics.gauge("nodestore.local_cache.bytes", bytes_held)
+
+    def delete_many(self, id_list: Iterable[str]) -> None:
+        with self._lock:
+            for id in id_list:
+                self._remove(id)
+
+    def _remove(self, id: str) -> None:
+        entry = self._data.pop(id, None)
+        if entry is not None:
+            self.bytes_held -= entry[0].size
+
+
+_local_cache: Optional[NodeBytesCache] = None
+_local_cache_lock = threading.Lock()
+
+
+def get_local_cache() -> Optional[NodeBytesCache]:
+    """
+    Returns the process-wide cache, or ``None`` if it is disabled. Like the ``nodedata`` cache it
+    is shared by all threads (`NodeStorage` instances are thread-local) and all node stores.
+    """
+    global _local_cache
+
+    cache_options = settings.SENTRY_NODESTORE_LOCAL_CACHE_OPTIONS
+    max_bytes = cache_options.get("max_bytes", 0)
+    if not max_bytes:
+        _local_cache = None
+        return None
+
+    with _local_cache_lock:
+        if _local_cache is None:
+            _local_cache = NodeBytesCache(max_bytes, cache_options.get("ttl", 60))
+        else:
+            _local_cache.max_bytes = max_bytes
+            _local_cache.ttl = cache_options.get("ttl", 60)
+        return _local_cache
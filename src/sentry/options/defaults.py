@@ -102,6 +102,25 @@ register(
 )
 register("redis.options", type=Dict, flags=FLAG_NOSTORE)
 
+# Buffers
+# Flush `process_incr` batches with pipelined Redis reads and grouped UPDATE statements
+# instead of one round trip and one UPDATE per buffered key.
+register(
+    "buffer.process-incr-bulk",
+    default=False,
+    flags=FLAG_MODIFIABLE_BOOL | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Merge `buffer_incr` calls for the same model and filters in-process and write them to the
+# buffer in batches. The window is in seconds, max-keys bounds the memory held per process.
+register(
+    "buffer.coalesce-incr.enabled",
+    default=False,
+    flags=FLAG_MODIFIABLE_BOOL | FLAG_AUTOMATOR_MODIFIABLE,
+)
+register("buffer.coalesce-incr.window", default=1.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("buffer.coalesce-incr.max-increments", default=1000, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("buffer.coalesce-incr.max-keys", default=1000, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # Processing worker caches
 register(
     "dsym.cache-path",
@@ -648,6 +667,34 @@ register(
     "nodedata.cache-on-save", default=False, flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE
 )
 
+# Run independent post process pipeline steps concurrently, see
+# `sentry.tasks.post_process.POST_PROCESS_STEP_DEPENDENCIES`
+register(
+    "post_process.parallel-pipeline-steps",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "post_process.parallel-pipeline-steps.workers",
+    default=8,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Defer decoding of node data fetched by eventstore.bind_nodes until it is used
+register(
+    "nodedata.lazy-decode",
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Stream data exports into file blobs page by page within a single task, see
+# `sentry.data_export.tasks.stream_download`
+register(
+    "data-export.streaming",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Use nodestore for eventstore.get_events
 register(
     "eventstore.use-nodestore",
@@ -802,6 +849,14 @@ register("store.background-grouping-sample-rate", default=0.0, flags=FLAG_AUTOMA
 # True if background grouping should run before secondary and primary grouping
 register("store.background-grouping-before", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Resolve event frequency rule condition windows that end before the event (e.g. percent comparison
+# windows) for all recently evaluated groups of a project with one query and cache the results
+register(
+    "rules.event-frequency.batch-queries",
+    default=False,
+    flags=FLAG_MODIFIABLE_BOOL | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Store release files bundled as zip files
 register(
     "processing.save-release-archives", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE
@@ -1534,6 +1589,10 @@ register(
 # Killswitch for monitor check-ins
 register("crons.organization.disable-check-in", type=Sequence, default=[])
 
+# Mark monitors as missed or timed out in chunks, see `sentry.monitors.tasks.mark_environments_missing`
+# and `sentry.monitors.tasks.mark_checkins_timeout`
+register("crons.bulk-failure-evaluation", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # Turns on and off the running for dynamic sampling collect_orgs.
 register("dynamic-sampling.tasks.collect_orgs", default=False, flags=FLAG_MODIFIABLE_BOOL)
 
@@ -0,0 +1,210 @@
+"""
+Compiled form of ownership rules.
+
+`Rule.test` re-extracts (and munges) the stack frames of the event for every rule, and then runs a
+glob match per frame value and rule. With large CODEOWNERS files (thousands of rules) that is
+millions of glob matches per event in post_process.
+
+`CompiledOwnershipRules` indexes a ruleset once per process:
+
+- the frames of an event and the values matchers look at are extracted once per event into a
+  `FrameIndex`,
+- path, codeowners, module and url rules are indexed by the longest literal part of their pattern,
+  which has to appear in one of the event's values for the rule to match at all. Only rules whose
+  literal is found are tested.
+
+The glob semantics are not reimplemented here; `Matcher.test` remains the single source of truth
+and is only called less often.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from functools import cached_property
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from sentry.ownership.grammar import CODEOWNERS, MODULE, PATH, URL, Matcher, Rule, load_schema
+from sentry.utils import json, metrics
+from sentry.utils.event_frames import find_stack_frames
+from sentry.utils.safe import PathSearchable, get_path
+
+# Parts of a pattern that can match values of varying content.
+_GROUP_RE = re.compile(r"\[[^\[\]]*\]|\{[^{}]*\}")
+_SEPARATOR_RE = re.compile(r"[*?\[\]{},!/]+")
+
+# Kinds of values a matcher type is tested against.
+_VALUE_KINDS = {PATH: PATH, CODEOWNERS: PATH, MODULE: MODULE, URL: URL}
+
+# Joins the values of an event, can't be part of a literal.
+_VALUE_SEPARATOR = "\0"
+
+
+def _pattern_literal(pattern: str) -> Optional[str]:
+    """
+    Returns a part of ``pattern`` that every value it matches contains (ignoring case), or
+    ``None`` if there is no such part.
+    """
+    # Escapes are interpreted differently by codeowners and glob patterns.
+    if "\\" in pattern:
+        return None
+    pattern = _GROUP_RE.sub("*", pattern)
+    # Unbalanced groups could mean anything.
+    if any(char in pattern for char in "[]{}"):
+        return None
+    literals = [
+        literal
+        for literal in _SEPARATOR_RE.split(pattern)
+        if literal and literal.isascii() and _VALUE_SEPARATOR not in literal
+    ]
+    if not literals:
+        return None
+    return max(literals, key=len).casefold()
+
+
+def _normalize(values: Sequence[Any]) -> Optional[str]:
+    if not all(isinstance(value, str) for value in values):
+        return None
+    return _VALUE_SEPARATOR.join(values).casefold()
+
+
+class FrameIndex:
+    """
+    The frames of an event and the values ownership matchers are tested against, extracted once
+    per event.
+    """
+
+    def __init__(self, data: PathSearchable) -> None:
+        self.data = data
+
+    @cached_property
+    def frames(self) -> Sequence[Mapping[str, Any]]:
+        return find_stack_frames(self.data)
+
+    @cached_property
+    def munged_frames_and_keys(self) -> Tuple[Sequence[Mapping[str, Any]], Sequence[str]]:
+        return Matcher.munge_if_needed(self.data, self.frames)
+
+    def _frame_values(self, frames: Sequence[Mapping[str, Any]], keys: Sequence[str]) -> List[Any]:
+        return [
+            frame[key]
+            for frame in frames
+            if isinstance(frame, Mapping)
+            for key in keys
+            if frame.get(key)
+        ]
+
+    @cached_property
+    def _values(self) -> Dict[str, Optional[str]]:
+        url = get_path(self.data, "request", "url") if isinstance(self.data, Mapping) else None
+        return {
+            PATH: _normalize(self._frame_values(*self.munged_frames_and_keys)),
+            MODULE: _normalize(self._frame_values(self.frames, ["module"])),
+            URL: _normalize([url] if url else []),
+        }
+
+    def values(self, kind: str) -> Optional[str]:
+        """
+        All values of ``kind`` joined into one normalized string, or ``None`` if some of them
+        are not strings.
+        """
+        return self._values[kind]
+
+
+class CompiledOwnershipRules:
+    """
+    A ruleset indexed by the literal parts of its patterns.
+    """
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self.rules = rules
+        # Indexes of rules that are tested against every event.
+        self._unindexed: List[int] = []
+        # Indexes of rules by the kind of values they test and the literal those have to contain.
+        self._indexed: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+
+        for i, rule in enumerate(rules):
+            kind = _VALUE_KINDS.get(rule.matcher.type)
+            literal = _pattern_literal(rule.matcher.pattern) if kind else None
+            if kind is None or literal is None:
+                self._unindexed.append(i)
+            else:
+                self._indexed[kind][literal].append(i)
+
+    def matching_rules(self, data: PathSearchable) -> List[Rule]:
+        """
+        Returns the rules matching the event ``data``, in the order of the ruleset.
+        """
+        frame_index = FrameIndex(data)
+        candidates = list(self._unindexed)
+        for kind, rules_by_literal in self._indexed.items():
+            values = frame_index.values(kind)
+            if values is None:
+                for indexes in rules_by_literal.values():
+                    candidates.extend(indexes)
+            elif values:
+                for literal, indexes in rules_by_literal.items():
+                    if literal in values:
+                        candidates.extend(indexes)
+
+        metrics.distribution(
+            "ownership.compiled_rules.candidates", len(candidates), sample_rate=0.1
+        )
+        return [
+            self.rules[i]
+            for i in sorted(candidates)
+            if self.rules[i].matcher.test(data, frame_index)
+        ]
+
+
+class _CompiledRulesCache:
+    def __init__(self) -> None:
+        self._data: OrderedDict[str, CompiledOwnershipRules] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CompiledOwnershipRules]:
+        with self._lock:
+            compiled = self._data.get(key)
+            if compiled is not None:
+                self._data.move_to_end(key)
+            return compiled
+
+    def set(self, key: str, compiled: CompiledOwnershipRules, max_size: int) -> None:
+        with self._lock:
+            self._data[key] = compiled
+            self._data.move_to_end(key)
+            while len(self._data) > max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_compiled_rules_cache = _CompiledRulesCache()
+
+
+def get_compiled_rules(schema: Mapping[str, Any]) -> Optional[CompiledOwnershipRules]:
+    """
+    Returns the compiled rules of an ownership ``schema``, cached in process by the schema's
+    contents, or ``None`` if compiled rules are disabled.
+    """
+    max_size = settings.SENTRY_OWNERSHIP_COMPILED_RULES_CACHE_SIZE
+    if not max_size:
+        return None
+
+    key = hashlib.md5(json.dumps(schema, sort_keys=True).encode("utf-8")).hexdigest()
+    compiled = _compiled_rules_cache.get(key)
+    metrics.incr(
+        "ownership.compiled_rules.cache",
+        tags={"cache_hit": "true" if compiled is not None else "false"},
+        sample_rate=0.1,
+    )
+    if compiled is None:
+        compiled = CompiledOwnershipRules(load_schema(schema))
+        _compiled_rules_cache.set(key, compiled, max_size)
+    return compiled
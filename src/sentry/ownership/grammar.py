@@ -2,7 +2,19 @@ from __future__ import annotations
 
 import re
 from collections import namedtuple
-from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from parsimonious.exceptions import ParseError
 from parsimonious.grammar import Grammar
@@ -19,6 +31,9 @@ from sentry.utils.event_frames import find_stack_frames, get_sdk_name, munged_fi
 from sentry.utils.glob import glob_match
 from sentry.utils.safe import PathSearchable, get_path
 
+if TYPE_CHECKING:
+    from sentry.ownership.compiled import FrameIndex
+
 __all__ = ("parse_rules", "dump_schema", "load_schema")
 
 VERSION = 1
@@ -86,8 +101,10 @@ class Rule(namedtuple("Rule", "matcher owners")):
     def load(cls, data: Mapping[str, Any]) -> Rule:
         return cls(Matcher.load(data["matcher"]), [Owner.load(o) for o in data["owners"]])
 
-    def test(self, data: Mapping[str, Any]) -> Union[bool, Any]:
-        return self.matcher.test(data)
+    def test(
+        self, data: Mapping[str, Any], frame_index: Optional[FrameIndex] = None
+    ) -> Union[bool, Any]:
+        return self.matcher.test(data, frame_index)
 
 
 class Matcher(namedtuple("Matcher", "type pattern")):
@@ -116,11 +133,14 @@ class Matcher(namedtuple("Matcher", "type pattern")):
         return cls(data["type"], data["pattern"])
 
     @staticmethod
-    def munge_if_needed(data: PathSearchable) -> Tuple[Sequence[Mapping[str, Any]], Sequence[str]]:
+    def munge_if_needed(
+        data: PathSearchable, frames: Optional[Sequence[Mapping[str, Any]]] = None
+    ) -> Tuple[Sequence[Mapping[str, Any]], Sequence[str]]:
         keys = ["filename", "abs_path"]
         platform = data.get("platform")
         sdk_name = get_sdk_name(data)
-        frames = find_stack_frames(data)
+        if frames is None:
+            frames = find_stack_frames(data)
         if platform:
             munged = munged_filename_and_frames(platform, frames, "munged_filename", sdk_name)
             if munged:
@@ -129,18 +149,30 @@ class Matcher(namedtuple("Matcher", "type pattern")):
 
         return frames, keys
 
-    def test(self, data: PathSearchable) -> bool:
+    def test(self, data: PathSearchable, frame_index: Optional[FrameIndex] = None) -> bool:
+        """
+        Tests the matcher against the event ``data``. The frames can be passed in as
+        ``frame_index`` when testing many matchers against the same event.
+        """
         if self.type == URL:
             return self.test_url(data)
         elif self.type == PATH:
-            return self.test_frames(*self.munge_if_needed(data))
+            return self.test_frames(
+                *(frame_index.munged_frames_and_keys if frame_index else self.munge_if_needed(data))
+            )
         elif self.type == MODULE:
-            return self.test_frames(find_stack_frames(data), ["module"])
+            return self.test_frames(
+                frame_index.frames if frame_index else find_stack_frames(data), ["module"]
+            )
         elif self.type.startswith("tags."):
             return self.test_tag(data)
         elif self.type == CODEOWNERS:
             return self.test_frames(
-                *self.munge_if_needed(data),
+                *(
+                    frame_index.munged_frames_and_keys
+                    if frame_index
+                    else self.munge_if_needed(data)
+                ),
                 # Codeowners has a slightly different syntax compared to issue owners
                 # As such we need to match it using gitignore logic.
                 # See syntax documentation here:
@@ -10,9 +10,10 @@ __all__ = (
     "get_rate_limit_value",
     "finish_request",
     "RateLimiter",
+    "RateLimitRequest",
 )
 
-from .base import RateLimiter
+from .base import RateLimiter, RateLimitRequest
 
 backend = LazyServiceWrapper(
     RateLimiter, settings.SENTRY_RATELIMITER, settings.SENTRY_RATELIMITER_OPTIONS
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple, Sequence
 
 from sentry.utils.services import Service
 
@@ -8,8 +8,23 @@ if TYPE_CHECKING:
     from sentry.models.project import Project
 
 
+class RateLimitRequest(NamedTuple):
+    """The arguments of a single `RateLimiter.is_limited_with_value` check."""
+
+    key: str
+    limit: int
+    project: Project | None = None
+    window: int | None = None
+
+
 class RateLimiter(Service):
-    __all__ = ("is_limited", "validate", "current_value", "is_limited_with_value")
+    __all__ = (
+        "is_limited",
+        "validate",
+        "current_value",
+        "is_limited_with_value",
+        "is_limited_many",
+    )
 
     window = 60
 
@@ -29,5 +44,18 @@ class RateLimiter(Service):
     ) -> tuple[bool, int, int]:
         return False, 0, 0
 
+    def is_limited_many(self, requests: Sequence[RateLimitRequest]) -> list[tuple[bool, int, int]]:
+        """
+        Checks (and counts) several rate limits at once, returning the results of
+        `is_limited_with_value` in the order of ``requests``. Backends may check all of them in a
+        single round trip.
+        """
+        return [
+            self.is_limited_with_value(
+                request.key, request.limit, project=request.project, window=request.window
+            )
+            for request in requests
+        ]
+
     def validate(self) -> None:
         raise NotImplementedError
@@ -2,13 +2,13 @@ from __future__ import annotations
 
 import logging
 from time import time
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Sequence
 
 from django.conf import settings
 from redis.exceptions import RedisError
 
 from sentry.exceptions import InvalidConfiguration
-from sentry.ratelimits.base import RateLimiter
+from sentry.ratelimits.base import RateLimiter, RateLimitRequest
 from sentry.utils import redis
 from sentry.utils.hashlib import md5_text
 
@@ -97,21 +97,41 @@ class RedisRateLimiter(RateLimiter):
         Does a rate limit check as well as returning the new rate limit value and when the next
         rate limit window will start
         """
+        return self.is_limited_many([RateLimitRequest(key, limit, project, window)])[0]
+
+    def is_limited_many(self, requests: Sequence[RateLimitRequest]) -> list[tuple[bool, int, int]]:
+        """
+        Does the rate limit checks of `is_limited_with_value` for all ``requests`` in a single
+        pipelined round trip to redis.
+        """
+        if not requests:
+            return []
+
         request_time = time()
-        if window is None or window == 0:
-            window = self.window
-        redis_key = self._construct_redis_key(key, project=project, window=window)
+        checks = []
+        pipeline = self.client.pipeline(transaction=False)
+        for request in requests:
+            window = request.window or self.window
+            redis_key = self._construct_redis_key(
+                request.key, project=request.project, window=window, request_time=request_time
+            )
+            expiration = window - int(request_time % window)
+            # Reset Time = next time bucket's start time
+            reset_time = _bucket_start_time(_time_bucket(request_time, window) + 1, window)
+            pipeline.incr(redis_key)
+            pipeline.expire(redis_key, expiration)
+            checks.append((request.limit, reset_time))
 
-        expiration = window - int(request_time % window)
-        # Reset Time = next time bucket's start time
-        reset_time = _bucket_start_time(_time_bucket(request_time, window) + 1, window)
         try:
-            result = self.client.incr(redis_key)
-            self.client.expire(redis_key, expiration)
+            # INCR and EXPIRE replies alternate
+            results = pipeline.execute()[::2]
         except RedisError:
             # We don't want rate limited endpoints to fail when ratelimits
             # can't be updated. We do want to know when that happens.
             logger.exception("Failed to retrieve current value from redis")
-            return False, 0, reset_time
+            return [(False, 0, reset_time) for _, reset_time in checks]
 
-        return result > limit, result, reset_time
+        return [
+            (result > limit, result, reset_time)
+            for result, (limit, reset_time) in zip(results, checks)
+        ]
@@ -10,6 +10,7 @@ from rest_framework.response import Response
 
 from sentry import features
 from sentry.constants import SentryAppInstallationStatus
+from sentry.ratelimits.base import RateLimitRequest
 from sentry.ratelimits.concurrent import ConcurrentRateLimiter
 from sentry.ratelimits.config import DEFAULT_RATE_LIMIT_CONFIG, RateLimitConfig
 from sentry.services.hybrid_cloud.auth import AuthenticatedToken
@@ -227,25 +228,30 @@ def for_organization_member_invite(
     if not features.has("organizations:invite-members-rate-limits", organization, actor=user):
         return False
 
-    return any(
-        (
-            ratelimiter.is_limited(
+    requests = []
+    if user or auth:
+        requests.append(
+            RateLimitRequest(
                 "members:invite-by-user:{}".format(
                     md5_text(user.id if user and user.is_authenticated else str(auth)).hexdigest()
                 ),
                 **config["members:invite-by-user"],
             )
-            if (user or auth)
-            else None,
-            ratelimiter.is_limited(
-                f"members:invite-by-org:{md5_text(organization.id).hexdigest()}",
-                **config["members:invite-by-org"],
-            ),
-            ratelimiter.is_limited(
-                "members:org-invite-to-email:{}-{}".format(
-                    organization.id, md5_text(email.lower()).hexdigest()
-                ),
-                **config["members:org-invite-to-email"],
+        )
+    requests.append(
+        RateLimitRequest(
+            f"members:invite-by-org:{md5_text(organization.id).hexdigest()}",
+            **config["members:invite-by-org"],
+        )
+    )
+    requests.append(
+        RateLimitRequest(
+            "members:org-invite-to-email:{}-{}".format(
+                organization.id, md5_text(email.lower()).hexdigest()
             ),
+            **config["members:org-invite-to-email"],
         )
     )
+
+    # all limits are counted, in a single round trip
+    return any(is_limited for is_limited, _, _ in ratelimiter.is_limited_many(requests))
@@ -39,6 +39,7 @@ from sentry.ingest.transaction_clusterer.rules import (
 from sentry.interfaces.security import DEFAULT_DISALLOWED_SOURCES
 from sentry.models.project import Project
 from sentry.models.projectkey import ProjectKey
+from sentry.quotas.base import QuotaScope
 from sentry.relay.config.metric_extraction import (
     get_metric_conditional_tagging_rules,
     get_metric_extraction_config,
@@ -211,6 +212,40 @@ def get_project_config(
             return _get_project_config(project, full_config=full_config, project_keys=project_keys)
 
 
+def get_project_key_configs(
+    project: Project, project_keys: Sequence[ProjectKey], full_config: bool = True
+) -> Dict[str, MutableMapping[str, Any]]:
+    """Constructs the configs of several keys of the same project at once.
+
+    The result maps each public key to the same config as
+    ``get_project_config(project, full_config, project_keys=[key]).to_dict()``. Everything but the
+    public key entry and the key quotas is shared by all keys of a project, so the project config
+    is only computed once.
+    """
+    config = get_project_config(
+        project, full_config=full_config, project_keys=project_keys
+    ).to_dict()
+    if config.get("disabled"):
+        return {key.public_key: dict(config) for key in project_keys}
+
+    rv = {}
+    quotas = config["config"].get("quotas")
+    for key, public_key_config in zip(project_keys, config["publicKeys"]):
+        key_config = {**config, "publicKeys": [public_key_config]}
+        if quotas is not None:
+            key_quotas = [
+                quota
+                for quota in quotas
+                if quota.get("scope") != QuotaScope.KEY.api_name()
+                or quota.get("scopeId") in (None, str(key.id))
+            ]
+            key_config["config"] = {**config["config"], "quotas": key_quotas}
+            if not key_quotas:
+                del key_config["config"]["quotas"]
+        rv[key.public_key] = key_config
+    return rv
+
+
 def get_dynamic_sampling_config(project: Project) -> Optional[Mapping[str, Any]]:
     if features.has("organizations:dynamic-sampling", project.organization):
         # For compatibility reasons we want to return an empty list of old rules. This has been done in order to make
@@ -28,12 +28,15 @@ from sentry.snuba.metrics.extraction import (
     MetricSpecType,
     OnDemandMetricSpec,
     RuleCondition,
+    derived_metric_tags_conditions,
     should_use_on_demand_metrics,
 )
+from sentry.snuba.metrics.utils import MetricOperationType
 from sentry.snuba.models import SnubaQuery
 from sentry.snuba.referrer import Referrer
 from sentry.utils import json, metrics
 from sentry.utils.cache import cache
+from sentry.utils.hashlib import md5_text
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +54,10 @@ _MAX_ON_DEMAND_WIDGETS = 100
 _WIDGET_QUERY_CARDINALITY_TTL = 3600 * 24  # 24h
 _WIDGET_QUERY_CARDINALITY_SOFT_DEADLINE_TTL = 3600 * 0.5  # 30m
 
+# TTL of the shared metric spec cache. Entries are keyed by everything a spec is built from, so a
+# changed alert or widget maps to a new entry and the previous one simply expires.
+_METRIC_SPEC_CACHE_TTL = 3600 * 24  # 24h
+
 HashedMetricSpec = Tuple[str, MetricSpec]
 
 
@@ -65,6 +72,65 @@ class MetricExtractionConfig(TypedDict):
     metrics: List[MetricSpec]
 
 
+class CachedMetricSpec(TypedDict):
+    """The project independent result of converting an aggregate and a query to a metric spec."""
+
+    # `None` if the aggregate and query don't need an on-demand metric.
+    query_hash: Optional[str]
+    op: Optional[MetricOperationType]
+    arguments: List[str]
+    spec: Optional[MetricSpec]
+
+
+class MetricSpecCache:
+    """
+    Cache of converted on-demand metric specs, shared by all projects.
+
+    Parsing the queries of alerts and widgets into metric specs does not depend on the project,
+    except for the tag conditions of derived metrics such as ``apdex()``, which are computed from
+    the project's transaction thresholds. The remainder is cached by the inputs of the conversion,
+    so it is reused across all projects of an organization and across config rebuilds.
+
+    Entries for all queries of a project config are read with a single `prefetch`.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Optional[CachedMetricSpec]] = {}
+
+    @staticmethod
+    def get_key(
+        dataset: str,
+        aggregate: str,
+        query: str,
+        environment: Optional[str],
+        prefilling: bool,
+        spec_type: MetricSpecType,
+        groupbys: Optional[Sequence[str]],
+    ) -> str:
+        inputs = json.dumps(
+            [dataset, aggregate, query, environment, prefilling, spec_type.value, groupbys or []]
+        )
+        return f"on-demand-metric-spec:{_METRIC_EXTRACTION_VERSION}:{md5_text(inputs).hexdigest()}"
+
+    def prefetch(self, keys: Sequence[str]) -> None:
+        missing = [key for key in keys if key not in self._entries]
+        if not missing:
+            return
+
+        entries = cache.get_many(missing)
+        for key in missing:
+            self._entries[key] = entries.get(key)
+
+    def get(self, key: str) -> Optional[CachedMetricSpec]:
+        if key not in self._entries:
+            self._entries[key] = cache.get(key)
+        return self._entries[key]
+
+    def set(self, key: str, entry: CachedMetricSpec) -> None:
+        self._entries[key] = entry
+        cache.set(key, entry, timeout=_METRIC_SPEC_CACHE_TTL)
+
+
 @metrics.wraps("on_demand_metrics.get_metric_extraction_config")
 def get_metric_extraction_config(project: Project) -> Optional[MetricExtractionConfig]:
     """
@@ -80,8 +146,9 @@ def get_metric_extraction_config(project: Project) -> Optional[MetricExtractionC
 
     prefilling = "organizations:on-demand-metrics-prefill" in enabled_features
 
-    alert_specs = _get_alert_metric_specs(project, enabled_features, prefilling)
-    widget_specs = _get_widget_metric_specs(project, enabled_features, prefilling)
+    spec_cache = MetricSpecCache()
+    alert_specs = _get_alert_metric_specs(project, enabled_features, prefilling, spec_cache)
+    widget_specs = _get_widget_metric_specs(project, enabled_features, prefilling, spec_cache)
 
     metric_specs = _merge_metric_specs(alert_specs, widget_specs)
     if not metric_specs:
@@ -111,7 +178,7 @@ def on_demand_metrics_feature_flags(organization: Organization) -> Set[str]:
 
 @metrics.wraps("on_demand_metrics._get_alert_metric_specs")
 def _get_alert_metric_specs(
-    project: Project, enabled_features: Set[str], prefilling: bool
+    project: Project, enabled_features: Set[str], prefilling: bool, spec_cache: MetricSpecCache
 ) -> List[HashedMetricSpec]:
     if not ("organizations:on-demand-metrics-extraction" in enabled_features or prefilling):
         return []
@@ -132,7 +199,10 @@ def _get_alert_metric_specs(
             status=AlertRuleStatus.PENDING.value,
             snuba_query__dataset__in=datasets,
         )
-        .select_related("snuba_query")
+        .select_related("snuba_query", "snuba_query__environment")
+    )
+    spec_cache.prefetch(
+        [_get_snuba_query_spec_key(alert.snuba_query, prefilling) for alert in alert_rules]
     )
 
     specs = []
@@ -144,7 +214,9 @@ def _get_alert_metric_specs(
                 tags={"prefilling": prefilling, "dataset": alert_snuba_query.dataset},
             )
 
-            if result := _convert_snuba_query_to_metric(project, alert_snuba_query, prefilling):
+            if result := _convert_snuba_query_to_metric(
+                project, alert_snuba_query, prefilling, spec_cache
+            ):
                 _log_on_demand_metric_spec(
                     project_id=project.id,
                     spec_for="alert",
@@ -172,7 +244,7 @@ def _get_alert_metric_specs(
 
 @metrics.wraps("on_demand_metrics._get_widget_metric_specs")
 def _get_widget_metric_specs(
-    project: Project, enabled_features: Set[str], prefilling: bool
+    project: Project, enabled_features: Set[str], prefilling: bool, spec_cache: MetricSpecCache
 ) -> List[HashedMetricSpec]:
     if "organizations:on-demand-metrics-extraction-widgets" not in enabled_features:
         return []
@@ -187,11 +259,18 @@ def _get_widget_metric_specs(
         widget__dashboard__organization=project.organization,
         widget__widget_type=DashboardWidgetTypes.DISCOVER,
     )
+    spec_cache.prefetch(
+        [
+            _get_widget_query_spec_key(widget_query, aggregate, prefilling)
+            for widget_query in widget_queries
+            for aggregate in widget_query.aggregates or ()
+        ]
+    )
 
     specs = []
     with metrics.timer("on_demand_metrics.widget_spec_convert"):
         for widget in widget_queries:
-            for result in _convert_widget_query_to_metric(project, widget, prefilling):
+            for result in _convert_widget_query_to_metric(project, widget, prefilling, spec_cache):
                 specs.append(result)
 
     max_widget_specs = options.get("on_demand.max_widget_specs") or _MAX_ON_DEMAND_WIDGETS
@@ -226,8 +305,35 @@ def _merge_metric_specs(
     return [metric for metric in metrics.values()]
 
 
+def _get_snuba_query_spec_key(snuba_query: SnubaQuery, prefilling: bool) -> str:
+    environment = snuba_query.environment.name if snuba_query.environment is not None else None
+    return MetricSpecCache.get_key(
+        snuba_query.dataset,
+        snuba_query.aggregate,
+        snuba_query.query,
+        environment,
+        prefilling,
+        MetricSpecType.SIMPLE_QUERY,
+        None,
+    )
+
+
+def _get_widget_query_spec_key(
+    widget_query: DashboardWidgetQuery, aggregate: str, prefilling: bool
+) -> str:
+    return MetricSpecCache.get_key(
+        Dataset.PerformanceMetrics.value,
+        aggregate,
+        widget_query.conditions,
+        None,
+        prefilling,
+        MetricSpecType.DYNAMIC_QUERY,
+        widget_query.columns,
+    )
+
+
 def _convert_snuba_query_to_metric(
-    project: Project, snuba_query: SnubaQuery, prefilling: bool
+    project: Project, snuba_query: SnubaQuery, prefilling: bool, spec_cache: MetricSpecCache
 ) -> Optional[HashedMetricSpec]:
     """
     If the passed snuba_query is a valid query for on-demand metric extraction,
@@ -241,11 +347,15 @@ def _convert_snuba_query_to_metric(
         snuba_query.query,
         environment,
         prefilling,
+        spec_cache=spec_cache,
     )
 
 
 def _convert_widget_query_to_metric(
-    project: Project, widget_query: DashboardWidgetQuery, prefilling: bool
+    project: Project,
+    widget_query: DashboardWidgetQuery,
+    prefilling: bool,
+    spec_cache: MetricSpecCache,
 ) -> Sequence[HashedMetricSpec]:
     """
     Converts a passed metrics widget query to one or more MetricSpecs.
@@ -276,6 +386,7 @@ def _convert_widget_query_to_metric(
             prefilling,
             groupbys=widget_query.columns,
             spec_type=MetricSpecType.DYNAMIC_QUERY,
+            spec_cache=spec_cache,
         ):
             _log_on_demand_metric_spec(
                 project_id=project.id,
@@ -403,36 +514,37 @@ def _convert_aggregate_and_query_to_metric(
     prefilling: bool,
     spec_type: MetricSpecType = MetricSpecType.SIMPLE_QUERY,
     groupbys: Optional[Sequence[str]] = None,
+    *,
+    spec_cache: MetricSpecCache,
 ) -> Optional[HashedMetricSpec]:
     """
     Converts an aggregate and a query to a metric spec with its hash value.
+
+    The project independent part of the conversion is looked up in, or stored to, ``spec_cache``.
     """
     try:
-        # We can avoid injection of the environment in the query, since it's supported by standard, thus it won't change
-        # the supported state of a query, since if it's standard, and we added environment it will still be standard
-        # and if it's on demand, it will always be on demand irrespectively of what we add.
-        if not should_use_on_demand_metrics(dataset, aggregate, query, groupbys, prefilling):
-            return None
-
-        on_demand_spec = OnDemandMetricSpec(
-            field=aggregate,
-            query=query,
-            environment=environment,
-            groupbys=groupbys,
-            spec_type=spec_type,
+        key = MetricSpecCache.get_key(
+            dataset, aggregate, query, environment, prefilling, spec_type, groupbys
         )
-
-        metric_spec = on_demand_spec.to_metric_spec(project)
-        # TODO: switch to validate_rule_condition
-        if (condition := metric_spec.get("condition")) is not None:
-            validate_sampling_condition(json.dumps(condition))
-        else:
-            metrics.incr(
-                "on_demand_metrics.missing_condition_spec",
-                tags={"prefilling": prefilling},
+        entry = spec_cache.get(key)
+        if entry is None:
+            entry = _build_cached_metric_spec(
+                dataset, aggregate, query, environment, prefilling, spec_type, groupbys
             )
+            spec_cache.set(key, entry)
+            metrics.incr("on_demand_metrics.spec_cache", tags={"result": "rebuilt"})
+        else:
+            metrics.incr("on_demand_metrics.spec_cache", tags={"result": "reused"})
 
-        return on_demand_spec.query_hash, metric_spec
+        query_hash, op, spec = entry["query_hash"], entry["op"], entry["spec"]
+        if query_hash is None or op is None or spec is None:
+            return None
+
+        metric_spec = spec.copy()
+        metric_spec["tags"] = (
+            derived_metric_tags_conditions(op, project, entry["arguments"]) + spec["tags"]
+        )
+        return query_hash, metric_spec
     except ValueError:
         # raised by validate_sampling_condition or metric_spec lacking "condition"
         metrics.incr(
@@ -460,6 +572,47 @@ def _convert_aggregate_and_query_to_metric(
         return None
 
 
+def _build_cached_metric_spec(
+    dataset: str,
+    aggregate: str,
+    query: str,
+    environment: Optional[str],
+    prefilling: bool,
+    spec_type: MetricSpecType,
+    groupbys: Optional[Sequence[str]],
+) -> CachedMetricSpec:
+    # We can avoid injection of the environment in the query, since it's supported by standard, thus it won't change
+    # the supported state of a query, since if it's standard, and we added environment it will still be standard
+    # and if it's on demand, it will always be on demand irrespectively of what we add.
+    if not should_use_on_demand_metrics(dataset, aggregate, query, groupbys, prefilling):
+        return {"query_hash": None, "op": None, "arguments": [], "spec": None}
+
+    on_demand_spec = OnDemandMetricSpec(
+        field=aggregate,
+        query=query,
+        environment=environment,
+        groupbys=groupbys,
+        spec_type=spec_type,
+    )
+
+    metric_spec = on_demand_spec.to_project_independent_metric_spec()
+    # TODO: switch to validate_rule_condition
+    if (condition := metric_spec.get("condition")) is not None:
+        validate_sampling_condition(json.dumps(condition))
+    else:
+        metrics.incr(
+            "on_demand_metrics.missing_condition_spec",
+            tags={"prefilling": prefilling},
+        )
+
+    return {
+        "query_hash": on_demand_spec.query_hash,
+        "op": on_demand_spec.op,
+        "arguments": list(on_demand_spec.arguments),
+        "spec": metric_spec,
+    }
+
+
 def _log_on_demand_metric_spec(
     project_id: int,
     spec_for: Literal["alert", "widget"],
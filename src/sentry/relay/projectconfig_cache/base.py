@@ -2,7 +2,7 @@ from sentry.utils.services import Service
 
 
 class ProjectConfigCache(Service):
-    __all__ = ("set_many", "delete_many", "get")
+    __all__ = ("set_many", "delete_many", "get", "exists_many")
 
     def __init__(self, **options):
         pass
@@ -15,3 +15,7 @@ class ProjectConfigCache(Service):
 
     def get(self, public_key):
         raise NotImplementedError()
+
+    def exists_many(self, public_keys):
+        """Returns which of the given public keys have a config in the cache."""
+        return {public_key: self.get(public_key) is not None for public_key in public_keys}
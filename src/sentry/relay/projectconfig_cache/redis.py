@@ -1,6 +1,9 @@
+import hashlib
 import logging
+from collections.abc import Mapping
 
 import zstandard
+from django.utils.encoding import force_str
 
 from sentry.relay.projectconfig_cache.base import ProjectConfigCache
 from sentry.utils import json, metrics, redis
@@ -9,9 +12,36 @@ from sentry.utils.redis import validate_dynamic_cluster
 REDIS_CACHE_TIMEOUT = 3600  # 1 hr
 COMPRESSION_LEVEL = 3  # 3 is the default level of compression
 
+# Fields describing when and from which revision a config was computed rather than its content.
+REVISION_FIELDS = frozenset(["lastFetch", "lastChange", "rev"])
+
 logger = logging.getLogger(__name__)
 
 
+def _serialize_config(config):
+    """
+    Serializes a config for the cache and returns it along with a digest of its content. The
+    revision fields are serialized separately and left out of the digest, so that recomputing an
+    unchanged project yields the same digest without serializing the config twice.
+    """
+    if not isinstance(config, Mapping):
+        serialized = json.dumps(config).encode()
+        return serialized, hashlib.md5(serialized).hexdigest()
+
+    content = {key: value for key, value in config.items() if key not in REVISION_FIELDS}
+    revision = {key: value for key, value in config.items() if key in REVISION_FIELDS}
+    serialized = json.dumps(content).encode()
+    digest = hashlib.md5(serialized).hexdigest()
+    if revision:
+        serialized_revision = json.dumps(revision).encode()
+        if content:
+            # Both are JSON objects, splice the revision fields into the content.
+            serialized = serialized[:-1] + b"," + serialized_revision[1:]
+        else:
+            serialized = serialized_revision
+    return serialized, digest
+
+
 class RedisProjectConfigCache(ProjectConfigCache):
     def __init__(self, **options):
         cluster_key = options.get("cluster", "default")
@@ -28,34 +58,91 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def __get_redis_key(self, public_key):
         return f"relayconfig:{public_key}"
 
+    def __get_digest_redis_key(self, public_key):
+        return f"relayconfig-digest:{public_key}"
+
     def set_many(self, configs):
+        """
+        Writes the given configs. Configs whose content is the same as the cached version's
+        (leaving out revision fields) are not compressed and written again; only the TTL of the
+        cached config is refreshed, which also keeps its revision.
+        """
         metrics.incr("relay.projectconfig_cache.write", amount=len(configs), tags={"action": "set"})
 
+        serialized = {
+            public_key: _serialize_config(config) for public_key, config in configs.items()
+        }
+        # Note: Those are multiple pipelines, one per cluster node
+        with self.cluster.pipeline() as p:
+            for public_key in configs:
+                p.get(self.__get_digest_redis_key(public_key))
+            previous_digests = dict(zip(configs, p.execute()))
+
+        changed = []
+        unchanged = []
+        for public_key, (_, digest) in serialized.items():
+            previous = previous_digests[public_key]
+            if previous is not None and force_str(previous) == digest:
+                unchanged.append(public_key)
+            else:
+                changed.append(public_key)
+
+        if unchanged:
+            # Note: Those are multiple pipelines, one per cluster node
+            with self.cluster.pipeline() as p:
+                for public_key in unchanged:
+                    p.expire(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT)
+                    p.expire(self.__get_digest_redis_key(public_key), REDIS_CACHE_TIMEOUT)
+                refreshed = p.execute()[::2]
+            # The config itself may have been evicted in the meantime
+            evicted = [public_key for public_key, exists in zip(unchanged, refreshed) if not exists]
+            changed.extend(evicted)
+            metrics.incr(
+                "relay.projectconfig_cache.unchanged", amount=len(unchanged) - len(evicted)
+            )
+
         # Note: Those are multiple pipelines, one per cluster node
         p = self.cluster.pipeline()
-        for public_key, config in configs.items():
-            serialized = json.dumps(config).encode()
-            compressed = zstandard.compress(serialized, level=COMPRESSION_LEVEL)
+        bytes_written = 0
+        for public_key in changed:
+            config_bytes, digest = serialized[public_key]
+            compressed = zstandard.compress(config_bytes, level=COMPRESSION_LEVEL)
             metrics.distribution(
-                "relay.projectconfig_cache.uncompressed_size", len(serialized), unit="byte"
+                "relay.projectconfig_cache.uncompressed_size", len(config_bytes), unit="byte"
             )
             metrics.distribution("relay.projectconfig_cache.size", len(compressed), unit="byte")
+            bytes_written += len(compressed)
 
             p.setex(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT, compressed)
+            p.setex(self.__get_digest_redis_key(public_key), REDIS_CACHE_TIMEOUT, digest)
 
         p.execute()
+        metrics.distribution("relay.projectconfig_cache.bytes_written", bytes_written, unit="byte")
 
     def delete_many(self, public_keys):
+        public_keys = list(public_keys)
         # Note: Those are multiple pipelines, one per cluster node
         with self.cluster.pipeline() as p:
             for public_key in public_keys:
                 p.delete(self.__get_redis_key(public_key))
-            return_values = p.execute()
+            for public_key in public_keys:
+                p.delete(self.__get_digest_redis_key(public_key))
+            return_values = p.execute()[: len(public_keys)]
 
         metrics.incr(
             "relay.projectconfig_cache.write", amount=sum(return_values), tags={"action": "delete"}
         )
 
+    def exists_many(self, public_keys):
+        public_keys = list(public_keys)
+        # Note: Those are multiple pipelines, one per cluster node
+        with self.cluster_read.pipeline() as p:
+            for public_key in public_keys:
+                p.exists(self.__get_redis_key(public_key))
+            return_values = p.execute()
+
+        return {public_key: bool(exists) for public_key, exists in zip(public_keys, return_values)}
+
     def get(self, public_key):
         rv = self.cluster_read.get(self.__get_redis_key(public_key))
         if rv is not None:
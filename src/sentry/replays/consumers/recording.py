@@ -1,12 +1,19 @@
+from __future__ import annotations
+
 import dataclasses
 import logging
+import multiprocessing
 import random
-from typing import Any, Mapping
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Literal, Mapping, Optional, TypeVar
 
 import sentry_sdk
 from arroyo.backends.kafka.consumer import KafkaPayload
-from arroyo.processing.strategies import RunTask, RunTaskInThreads
+from arroyo.processing.strategies import BatchStep, RunTask, RunTaskInThreads
 from arroyo.processing.strategies.abstract import ProcessingStrategy, ProcessingStrategyFactory
+from arroyo.processing.strategies.batching import ValuesBatch
 from arroyo.processing.strategies.commit import CommitOffsets
 from arroyo.types import Commit, Message, Partition
 from django.conf import settings
@@ -14,13 +21,55 @@ from sentry_kafka_schemas import get_codec
 from sentry_kafka_schemas.schema_types.ingest_replay_recordings_v1 import ReplayRecording
 from sentry_sdk.tracing import Span
 
-from sentry.replays.usecases.ingest import ingest_recording
-from sentry.utils.arroyo import RunTaskWithMultiprocessing
+from sentry.replays.usecases.ingest import (
+    ingest_recording,
+    ingest_recordings,
+    to_recording_ingest_message,
+)
+from sentry.utils import metrics
+from sentry.utils.arroyo import RunTaskWithMultiprocessing, _get_arroyo_subprocess_initializer
 
 logger = logging.getLogger(__name__)
 
 RECORDINGS_CODEC = get_codec("ingest-replay-recordings")
 
+T = TypeVar("T")
+
+
+class ParseProcessPool(Executor):
+    """
+    A process pool for parsing large recording segments.
+
+    Workers are spawned rather than forked, as the consumer already runs upload threads and a
+    Kafka producer whose locks a forked worker could inherit. Once the pool is broken, e.g.
+    because a worker was killed, it is replaced on the next submission.
+    """
+
+    def __init__(self, max_workers: int, initializer: Optional[Callable[[], None]] = None) -> None:
+        self.max_workers = max_workers
+        self.initializer = initializer or _get_arroyo_subprocess_initializer(None)
+        self._executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=self.initializer,
+        )
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> Future[T]:
+        try:
+            return self._executor.submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            logger.warning("Replacing broken recording parse process pool")
+            metrics.incr("replays.consumer.parse_executor.replaced")
+            self._executor.shutdown(wait=False)
+            self._executor = self._create_executor()
+            return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, **kwargs: Any) -> None:
+        self._executor.shutdown(wait=wait)
+
 
 @dataclasses.dataclass
 class MessageContext:
@@ -38,8 +87,16 @@ class ProcessReplayRecordingStrategyFactory(ProcessingStrategyFactory[KafkaPaylo
     """
     This consumer processes replay recordings, which are compressed payloads split up into
     chunks.
+
+    In ``batched`` mode recordings are ingested in batches of up to ``max_batch_size`` messages:
+    their segments are uploaded on ``num_threads`` threads while the replay actions are parsed
+    (large segments on ``num_parse_processes`` processes), and the replay actions of a batch are
+    produced together. Offsets are committed once the whole batch has been ingested.
     """
 
+    upload_executor: Optional[ThreadPoolExecutor] = None
+    parse_executor: Optional[ParseProcessPool] = None
+
     def __init__(
         self,
         input_block_size: int,
@@ -49,6 +106,8 @@ class ProcessReplayRecordingStrategyFactory(ProcessingStrategyFactory[KafkaPaylo
         output_block_size: int,
         num_threads: int = 4,  # Defaults to 4 for self-hosted.
         force_synchronous: bool = False,  # Force synchronous runner (only used in test suite).
+        mode: Literal["message", "batched"] = "message",
+        num_parse_processes: int = 0,
     ) -> None:
         # For information on configuring this consumer refer to this page:
         #   https://getsentry.github.io/arroyo/strategies/run_task_with_multiprocessing.html
@@ -61,12 +120,32 @@ class ProcessReplayRecordingStrategyFactory(ProcessingStrategyFactory[KafkaPaylo
         self.use_processes = self.num_processes > 1
         self.force_synchronous = force_synchronous
 
+        if mode == "batched":
+            self.upload_executor = ThreadPoolExecutor(max_workers=num_threads)
+            if num_parse_processes > 0:
+                self.parse_executor = ParseProcessPool(max_workers=num_parse_processes)
+
+    def shutdown(self) -> None:
+        if self.upload_executor:
+            self.upload_executor.shutdown()
+        if self.parse_executor:
+            self.parse_executor.shutdown()
+
     def create_with_partitions(
         self,
         commit: Commit,
         partitions: Mapping[Partition, int],
     ) -> ProcessingStrategy[KafkaPayload]:
-        if self.force_synchronous:
+        if self.upload_executor:
+            return BatchStep(
+                max_batch_size=self.max_batch_size,
+                max_batch_time=self.max_batch_time,
+                next_step=RunTask(
+                    function=partial(process_batch, self.upload_executor, self.parse_executor),
+                    next_step=CommitOffsets(commit),
+                ),
+            )
+        elif self.force_synchronous:
             return RunTask(
                 function=process_message,
                 next_step=CommitOffsets(commit),
@@ -126,3 +205,22 @@ def process_message(message: Message[KafkaPayload]) -> Any:
     current_hub = sentry_sdk.Hub(sentry_sdk.Hub.current)
     message_dict = RECORDINGS_CODEC.decode(message.payload.value)
     ingest_recording(message_dict, transaction, current_hub)
+
+
+def process_batch(
+    upload_executor: ThreadPoolExecutor,
+    parse_executor: Optional[ParseProcessPool],
+    message: Message[ValuesBatch[KafkaPayload]],
+) -> None:
+    """Move the replay payloads of a batch to permanent storage."""
+    transaction = sentry_sdk.start_transaction(
+        name="replays.consumer.process_recording_batch",
+        op="replays.consumer",
+        sampled=random.random()
+        < getattr(settings, "SENTRY_REPLAY_RECORDINGS_CONSUMER_APM_SAMPLING", 0),
+    )
+    messages = [
+        to_recording_ingest_message(RECORDINGS_CODEC.decode(item.payload.value))
+        for item in message.payload
+    ]
+    ingest_recordings(messages, upload_executor, parse_executor, transaction)
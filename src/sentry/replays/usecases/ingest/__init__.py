@@ -3,8 +3,9 @@ from __future__ import annotations
 import dataclasses
 import logging
 import zlib
+from concurrent.futures import Executor, Future
 from datetime import datetime, timezone
-from typing import Optional, TypedDict, cast
+from typing import List, Optional, Sequence, Tuple, TypedDict, cast
 
 from django.conf import settings
 from sentry_kafka_schemas.schema_types.ingest_replay_recordings_v1 import ReplayRecording
@@ -16,7 +17,12 @@ from sentry.constants import DataCategory
 from sentry.models.project import Project
 from sentry.replays.feature import has_feature_access
 from sentry.replays.lib.storage import RecordingSegmentStorageMeta, make_storage_driver
-from sentry.replays.usecases.ingest.dom_index import parse_and_emit_replay_actions
+from sentry.replays.usecases.ingest.dom_index import (
+    ReplayActionsEvent,
+    emit_replay_actions,
+    parse_and_emit_replay_actions,
+    parse_replay_actions,
+)
 from sentry.signals import first_replay_received
 from sentry.utils import json, metrics
 from sentry.utils.outcomes import Outcome, track_outcome
@@ -26,6 +32,9 @@ logger = logging.getLogger("sentry.replays")
 CACHE_TIMEOUT = 3600
 COMMIT_FREQUENCY_SEC = 1
 
+# Recording segments (compressed) from this size on are parsed in the parse executor of a batch.
+PARSE_EXECUTOR_MIN_SEGMENT_SIZE = 64 * 1024
+
 
 class ReplayRecordingSegment(TypedDict):
     id: str  # a uuid that individualy identifies a recording segment
@@ -69,16 +78,19 @@ def ingest_recording(message_dict: ReplayRecording, transaction: Span, current_h
             op="replays.usecases.ingest.ingest_recording",
             description="ingest_recording",
         ):
-            message = RecordingIngestMessage(
-                replay_id=message_dict["replay_id"],
-                key_id=message_dict.get("key_id"),
-                org_id=message_dict["org_id"],
-                project_id=message_dict["project_id"],
-                received=message_dict["received"],
-                retention_days=message_dict["retention_days"],
-                payload_with_headers=cast(bytes, message_dict["payload"]),
-            )
-            _ingest_recording(message, transaction)
+            _ingest_recording(to_recording_ingest_message(message_dict), transaction)
+
+
+def to_recording_ingest_message(message_dict: ReplayRecording) -> RecordingIngestMessage:
+    return RecordingIngestMessage(
+        replay_id=message_dict["replay_id"],
+        key_id=message_dict.get("key_id"),
+        org_id=message_dict["org_id"],
+        project_id=message_dict["project_id"],
+        received=message_dict["received"],
+        retention_days=message_dict["retention_days"],
+        payload_with_headers=cast(bytes, message_dict["payload"]),
+    )
 
 
 def _ingest_recording(message: RecordingIngestMessage, transaction: Span) -> None:
@@ -106,37 +118,185 @@ def _ingest_recording(message: RecordingIngestMessage, transaction: Span) -> Non
 
     # The first segment records an accepted outcome. This is for billing purposes. Subsequent
     # segments are not billed.
-    if headers["segment_id"] == 0:
+    if headers["segment_id"] == 0 and not _track_initial_segment_event(message):
+        return None
+
+    transaction.finish()
+
+
+def _track_initial_segment_event(message: RecordingIngestMessage) -> bool:
+    try:
+        project = Project.objects.get_from_cache(id=message.project_id)
+    except Project.DoesNotExist:
+        logger.warning(
+            "Recording segment was received for a project that does not exist.",
+            extra={
+                "project_id": message.project_id,
+                "replay_id": message.replay_id,
+            },
+        )
+        return False
+
+    if not project.flags.has_replays:
+        first_replay_received.send_robust(project=project, sender=Project)
+
+    track_outcome(
+        org_id=message.org_id,
+        project_id=message.project_id,
+        key_id=message.key_id,
+        outcome=Outcome.ACCEPTED,
+        reason=None,
+        timestamp=datetime.utcfromtimestamp(message.received).replace(tzinfo=timezone.utc),
+        event_id=message.replay_id,
+        category=DataCategory.REPLAY,
+        quantity=1,
+    )
+    return True
+
+
+def ingest_recordings(
+    messages: Sequence[RecordingIngestMessage],
+    upload_executor: Executor,
+    parse_executor: Optional[Executor],
+    transaction: Span,
+) -> None:
+    """
+    Ingest a batch of recording messages.
+
+    The segments are uploaded concurrently on ``upload_executor`` while their replay actions are
+    parsed, large segments on ``parse_executor`` if there is one. The replay actions of the batch
+    are emitted together once every segment has been stored, and the outcomes of the first
+    segments are tracked last.
+    """
+    segments: List[Tuple[RecordingIngestMessage, RecordingSegmentHeaders, bytes]] = []
+    for message in messages:
         try:
-            project = Project.objects.get_from_cache(id=message.project_id)
-        except Project.DoesNotExist:
-            logger.warning(
-                "Recording segment was received for a project that does not exist.",
-                extra={
-                    "project_id": message.project_id,
-                    "replay_id": message.replay_id,
-                },
-            )
-            return None
-
-        if not project.flags.has_replays:
-            first_replay_received.send_robust(project=project, sender=Project)
-
-        track_outcome(
-            org_id=message.org_id,
-            project_id=message.project_id,
-            key_id=message.key_id,
-            outcome=Outcome.ACCEPTED,
-            reason=None,
-            timestamp=datetime.utcfromtimestamp(message.received).replace(tzinfo=timezone.utc),
-            event_id=message.replay_id,
-            category=DataCategory.REPLAY,
-            quantity=1,
+            headers, recording_segment = process_headers(message.payload_with_headers)
+        except MissingRecordingSegmentHeaders:
+            logger.warning(f"missing header on {message.replay_id}")
+        else:
+            segments.append((message, headers, recording_segment))
+
+    metrics.distribution("replays.usecases.ingest.ingest_recordings.batch_size", len(segments))
+
+    uploads = [
+        upload_executor.submit(
+            _store_recording_segment,
+            message.org_id,
+            RecordingSegmentStorageMeta(
+                project_id=message.project_id,
+                replay_id=message.replay_id,
+                segment_id=headers["segment_id"],
+                retention_days=message.retention_days,
+            ),
+            recording_segment,
         )
+        for message, headers, recording_segment in segments
+    ]
+
+    with metrics.timer("replays.usecases.ingest.ingest_recordings", tags={"stage": "parse"}):
+        with transaction.start_child(op="replays.usecases.ingest.parse_replay_actions"):
+            actions = _parse_recordings_replay_actions(segments, parse_executor)
+
+    # Nothing is emitted or billed for the batch if a segment could not be stored.
+    with metrics.timer("replays.usecases.ingest.ingest_recordings", tags={"stage": "upload"}):
+        with transaction.start_child(op="replays.usecases.ingest.store_recording_segments"):
+            for upload in uploads:
+                upload.result()
+
+    with metrics.timer("replays.usecases.ingest.ingest_recordings", tags={"stage": "emit"}):
+        with transaction.start_child(op="replays.usecases.ingest.emit_replay_actions"):
+            try:
+                emit_replay_actions(actions)
+            except Exception:
+                logger.exception("Failed to emit replay actions")
+
+    with metrics.timer("replays.usecases.ingest.ingest_recordings", tags={"stage": "outcomes"}):
+        for message, headers, _ in segments:
+            if headers["segment_id"] == 0:
+                _track_initial_segment_event(message)
 
     transaction.finish()
 
 
+def _store_recording_segment(
+    org_id: int, segment_data: RecordingSegmentStorageMeta, recording_segment: bytes
+) -> None:
+    driver = make_storage_driver(org_id)
+    driver.set(segment_data, recording_segment)
+
+
+def _parse_recordings_replay_actions(
+    segments: Sequence[Tuple[RecordingIngestMessage, RecordingSegmentHeaders, bytes]],
+    parse_executor: Optional[Executor],
+) -> List[ReplayActionsEvent]:
+    results: List[Optional[ReplayActionsEvent] | Future[Optional[ReplayActionsEvent]]] = []
+    for message, headers, recording_segment in segments:
+        if not has_feature_access(
+            message.org_id,
+            options.get("replay.ingest.dom-click-search"),
+            settings.SENTRY_REPLAYS_DOM_CLICK_SEARCH_ALLOWLIST,
+        ):
+            _report_size_metrics(size_compressed=len(recording_segment))
+            continue
+
+        args = (
+            message.org_id,
+            message.project_id,
+            message.replay_id,
+            message.retention_days,
+            headers["segment_id"],
+            recording_segment,
+        )
+        if parse_executor is not None and len(recording_segment) >= PARSE_EXECUTOR_MIN_SEGMENT_SIZE:
+            try:
+                results.append(parse_executor.submit(parse_recording_segment_actions, *args))
+                continue
+            except Exception:
+                logger.exception("Failed to submit recording to parse executor")
+        results.append(parse_recording_segment_actions(*args))
+
+    actions = []
+    for result in results:
+        if isinstance(result, Future):
+            try:
+                result = result.result()
+            except Exception:
+                logger.exception("Failed to parse recording in parse executor")
+                continue
+        if result is not None:
+            actions.append(result)
+    return actions
+
+
+def parse_recording_segment_actions(
+    org_id: int,
+    project_id: int,
+    replay_id: str,
+    retention_days: int,
+    segment_id: int,
+    segment_bytes: bytes,
+) -> Optional[ReplayActionsEvent]:
+    """
+    Return the replay actions event of a recording segment, if it has any. Parsing failures are
+    logged and ignored.
+    """
+    try:
+        with metrics.timer("replays.usecases.ingest.decompress_and_parse"):
+            decompressed_segment = decompress(segment_bytes)
+            parsed_segment_data = json.loads(decompressed_segment, use_rapid_json=True)
+            _report_size_metrics(len(segment_bytes), len(decompressed_segment))
+
+        return parse_replay_actions(project_id, replay_id, retention_days, parsed_segment_data)
+    except Exception:
+        logging.exception(
+            "Failed to parse recording org={}, project={}, replay={}, segment={}".format(
+                org_id, project_id, replay_id, segment_id
+            )
+        )
+        return None
+
+
 @metrics.wraps("replays.usecases.ingest.process_headers")
 def process_headers(bytes_with_headers: bytes) -> tuple[RecordingSegmentHeaders, bytes]:
     try:
@@ -5,7 +5,7 @@ import random
 import time
 import uuid
 from hashlib import md5
-from typing import Any, Dict, List, Literal, Optional, TypedDict
+from typing import Any, Dict, List, Literal, Optional, Sequence, TypedDict
 
 from django.conf import settings
 
@@ -67,6 +67,15 @@ def parse_and_emit_replay_actions(
             publisher.publish("ingest-replay-events", json.dumps(message))
 
 
+def emit_replay_actions(messages: Sequence[ReplayActionsEvent]) -> None:
+    """Emit replay actions events produced in bulk."""
+    if messages:
+        publisher = _initialize_publisher()
+        publisher.publish_many(
+            "ingest-replay-events", [json.dumps(message) for message in messages]
+        )
+
+
 def parse_replay_actions(
     project_id: int,
     replay_id: str,
@@ -5,13 +5,13 @@ import contextlib
 import logging
 import re
 from datetime import datetime, timedelta
-from typing import Any, Dict, Mapping, Tuple
+from typing import Any, Dict, Mapping, Sequence, Tuple
 
 from django import forms
 from django.core.cache import cache
 from django.utils import timezone
 
-from sentry import release_health, tsdb
+from sentry import options, release_health, tsdb
 from sentry.eventstore.models import GroupEvent
 from sentry.issues.constants import get_issue_tsdb_group_model, get_issue_tsdb_user_group_model
 from sentry.receivers.rules import DEFAULT_RULE_LABEL
@@ -23,7 +23,14 @@ from sentry.types.condition_activity import (
     round_to_five_minute,
 )
 from sentry.utils import metrics
-from sentry.utils.snuba import options_override
+from sentry.utils.dates import to_timestamp
+from sentry.utils.snuba import OVERRIDE_OPTIONS, options_override
+
+# Batched frequency queries: counts of all recently evaluated groups of a project are fetched with
+# one query and cached for at most this many seconds (or the tsdb rollup, if smaller).
+BATCH_CACHE_MAX_TTL = 60
+# Upper bound of groups remembered per project and issue category for batching.
+BATCH_MAX_GROUPS = 100
 
 standard_intervals = {
     "1m": ("one minute", timedelta(minutes=1)),
@@ -162,7 +169,14 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
         raise NotImplementedError
 
     def query(self, event: GroupEvent, start: datetime, end: datetime, environment_id: str) -> int:
+        if options.get("rules.event-frequency.batch-queries"):
+            return self.batch_query(event, start, end, environment_id)
+
         query_result = self.query_hook(event, start, end, environment_id)
+        self._record_query()
+        return query_result
+
+    def _record_query(self) -> None:
         metrics.incr(
             "rules.conditions.queried_snuba",
             tags={
@@ -170,7 +184,6 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
                 "is_created_on_project_creation": self.is_guessed_to_be_created_on_project_creation,
             },
         )
-        return query_result
 
     def query_hook(
         self, event: GroupEvent, start: datetime, end: datetime, environment_id: str
@@ -178,6 +191,69 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
         """ """
         raise NotImplementedError  # subclass must implement
 
+    def batch_query_hook(
+        self,
+        event: GroupEvent,
+        group_ids: Sequence[int],
+        start: datetime,
+        end: datetime,
+        environment_id: str,
+    ) -> Mapping[int, int]:
+        """
+        Like `query_hook`, but for many groups of the event's project and issue category at once.
+        """
+        raise NotImplementedError  # subclass must implement
+
+    def batch_query(
+        self, event: GroupEvent, start: datetime, end: datetime, environment_id: str
+    ) -> int:
+        """
+        Resolves the condition value for the event's group from counts that are fetched for all
+        the recently evaluated groups of the project with one query and cached until the next
+        rollup boundary.
+
+        Only windows that end before the event, like the comparison window of percent
+        conditions, are resolved this way: their counts can't include the event, so a cached
+        count is as good as a fresh one. Windows that include the event are always queried for
+        the event's group alone, to keep read your writes consistency.
+        """
+        if end >= event.datetime or OVERRIDE_OPTIONS["consistent"]:
+            query_result = self.query_hook(event, start, end, environment_id)
+            self._record_query()
+            return query_result
+
+        category = event.group.issue_category.value
+        groups_key = f"r.c.efg:{event.project_id}:{category}"
+        other_group_ids = [
+            group_id for group_id in cache.get(groups_key) or () if group_id != event.group_id
+        ][: BATCH_MAX_GROUPS - 1]
+        cache.set(groups_key, [event.group_id] + other_group_ids, 3600)
+
+        ttl = min(self.tsdb.get_optimal_rollup(start, end), BATCH_CACHE_MAX_TTL)
+        result_key_prefix = "r.c.efb:{}:{}:{}:{}".format(
+            self.id,
+            self.get_option("interval"),
+            environment_id,
+            int(to_timestamp(end)) // ttl,
+        )
+        result_keys = {
+            group_id: f"{result_key_prefix}:{group_id}"
+            for group_id in [event.group_id] + other_group_ids
+        }
+        cached = cache.get_many(list(result_keys.values()))
+        if result_keys[event.group_id] in cached:
+            metrics.incr("rules.conditions.batch_query", tags={"result": "hit"})
+            return int(cached[result_keys[event.group_id]])
+
+        group_ids = [group_id for group_id, key in result_keys.items() if key not in cached]
+        results = self.batch_query_hook(event, group_ids, start, end, environment_id)
+        cache.set_many({result_keys[group_id]: results[group_id] for group_id in group_ids}, ttl)
+
+        self._record_query()
+        metrics.incr("rules.conditions.batch_query", tags={"result": "miss"})
+        metrics.distribution("rules.conditions.batch_query.groups", len(group_ids))
+        return results[event.group_id]
+
     def get_rate(self, event: GroupEvent, interval: str, environment_id: str) -> int:
         _, duration = self.intervals[interval]
         end = timezone.now()
@@ -239,6 +315,27 @@ class EventFrequencyCondition(BaseEventFrequencyCondition):
         )
         return sums[event.group_id]
 
+    def batch_query_hook(
+        self,
+        event: GroupEvent,
+        group_ids: Sequence[int],
+        start: datetime,
+        end: datetime,
+        environment_id: str,
+    ) -> Mapping[int, int]:
+        sums: Mapping[int, int] = self.tsdb.get_sums(
+            model=get_issue_tsdb_group_model(event.group.issue_category),
+            keys=group_ids,
+            start=start,
+            end=end,
+            environment_id=environment_id,
+            use_cache=True,
+            jitter_value=event.project_id,
+            tenant_ids={"organization_id": event.group.project.organization_id},
+            referrer_suffix="batch_alert_event_frequency",
+        )
+        return sums
+
     def get_preview_aggregate(self) -> Tuple[str, str]:
         return "count", "roundedTime"
 
@@ -263,6 +360,27 @@ class EventUniqueUserFrequencyCondition(BaseEventFrequencyCondition):
         )
         return totals[event.group_id]
 
+    def batch_query_hook(
+        self,
+        event: GroupEvent,
+        group_ids: Sequence[int],
+        start: datetime,
+        end: datetime,
+        environment_id: str,
+    ) -> Mapping[int, int]:
+        totals: Mapping[int, int] = self.tsdb.get_distinct_counts_totals(
+            model=get_issue_tsdb_user_group_model(event.group.issue_category),
+            keys=group_ids,
+            start=start,
+            end=end,
+            environment_id=environment_id,
+            use_cache=True,
+            jitter_value=event.project_id,
+            tenant_ids={"organization_id": event.group.project.organization_id},
+            referrer_suffix="batch_alert_event_uniq_user_frequency",
+        )
+        return totals
+
     def get_preview_aggregate(self) -> Tuple[str, str]:
         return "uniq", "user"
 
@@ -335,9 +453,9 @@ class EventFrequencyPercentCondition(BaseEventFrequencyCondition):
             ],
         }
 
-    def query_hook(
-        self, event: GroupEvent, start: datetime, end: datetime, environment_id: str
-    ) -> int:
+    def _get_avg_sessions_in_interval(
+        self, event: GroupEvent, end: datetime, environment_id: str
+    ) -> float | None:
         project_id = event.project_id
         cache_key = f"r.c.spc:{project_id}-{environment_id}"
         session_count_last_hour = cache.get(cache_key)
@@ -353,37 +471,78 @@ class EventFrequencyPercentCondition(BaseEventFrequencyCondition):
 
             cache.set(cache_key, session_count_last_hour, 600)
 
-        if session_count_last_hour >= MIN_SESSIONS_TO_FIRE:
-            interval_in_minutes = (
-                percent_intervals[self.get_option("interval")][1].total_seconds() // 60
+        if session_count_last_hour < MIN_SESSIONS_TO_FIRE:
+            return None
+
+        interval_in_minutes = (
+            percent_intervals[self.get_option("interval")][1].total_seconds() // 60
+        )
+        avg_sessions_in_interval: float = session_count_last_hour / (60 / interval_in_minutes)
+        return avg_sessions_in_interval
+
+    def _get_percent(
+        self, project_id: int, issue_count: int, avg_sessions_in_interval: float
+    ) -> int:
+        if issue_count > avg_sessions_in_interval:
+            # We want to better understand when and why this is happening, so we're logging it for now
+            self.logger.info(
+                "EventFrequencyPercentCondition.query_hook",
+                extra={
+                    "issue_count": issue_count,
+                    "project_id": project_id,
+                    "avg_sessions_in_interval": avg_sessions_in_interval,
+                },
             )
-            avg_sessions_in_interval = session_count_last_hour / (60 / interval_in_minutes)
-
-            issue_count = self.tsdb.get_sums(
-                model=get_issue_tsdb_group_model(event.group.issue_category),
-                keys=[event.group_id],
-                start=start,
-                end=end,
-                environment_id=environment_id,
-                use_cache=True,
-                jitter_value=event.group_id,
-                tenant_ids={"organization_id": event.group.project.organization_id},
-                referrer_suffix="alert_event_frequency_percent",
-            )[event.group_id]
-            if issue_count > avg_sessions_in_interval:
-                # We want to better understand when and why this is happening, so we're logging it for now
-                self.logger.info(
-                    "EventFrequencyPercentCondition.query_hook",
-                    extra={
-                        "issue_count": issue_count,
-                        "project_id": project_id,
-                        "avg_sessions_in_interval": avg_sessions_in_interval,
-                    },
-                )
-            percent: int = 100 * round(issue_count / avg_sessions_in_interval, 4)
-            return percent
+        percent: int = 100 * round(issue_count / avg_sessions_in_interval, 4)
+        return percent
+
+    def query_hook(
+        self, event: GroupEvent, start: datetime, end: datetime, environment_id: str
+    ) -> int:
+        avg_sessions_in_interval = self._get_avg_sessions_in_interval(event, end, environment_id)
+        if avg_sessions_in_interval is None:
+            return 0
 
-        return 0
+        issue_count = self.tsdb.get_sums(
+            model=get_issue_tsdb_group_model(event.group.issue_category),
+            keys=[event.group_id],
+            start=start,
+            end=end,
+            environment_id=environment_id,
+            use_cache=True,
+            jitter_value=event.group_id,
+            tenant_ids={"organization_id": event.group.project.organization_id},
+            referrer_suffix="alert_event_frequency_percent",
+        )[event.group_id]
+        return self._get_percent(event.project_id, issue_count, avg_sessions_in_interval)
+
+    def batch_query_hook(
+        self,
+        event: GroupEvent,
+        group_ids: Sequence[int],
+        start: datetime,
+        end: datetime,
+        environment_id: str,
+    ) -> Mapping[int, int]:
+        avg_sessions_in_interval = self._get_avg_sessions_in_interval(event, end, environment_id)
+        if avg_sessions_in_interval is None:
+            return {group_id: 0 for group_id in group_ids}
+
+        issue_counts = self.tsdb.get_sums(
+            model=get_issue_tsdb_group_model(event.group.issue_category),
+            keys=group_ids,
+            start=start,
+            end=end,
+            environment_id=environment_id,
+            use_cache=True,
+            jitter_value=event.project_id,
+            tenant_ids={"organization_id": event.group.project.organization_id},
+            referrer_suffix="batch_alert_event_frequency_percent",
+        )
+        return {
+            group_id: self._get_percent(event.project_id, issue_count, avg_sessions_in_interval)
+            for group_id, issue_count in issue_counts.items()
+        }
 
     def passes_activity_frequency(
         self, activity: ConditionActivity, buckets: Dict[datetime, int]
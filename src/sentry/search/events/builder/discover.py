@@ -281,6 +281,8 @@ class BaseQueryBuilder:
 
         self.start: Optional[datetime] = None
         self.end: Optional[datetime] = None
+        # The conditions of `where` derived from the params rather than the query
+        self.param_conditions: List[WhereType] = []
         self.resolve_query(
             query=query,
             selected_columns=selected_columns,
@@ -331,7 +333,8 @@ class BaseQueryBuilder:
             self.where, self.having = self.resolve_conditions(query)
         with sentry_sdk.start_span(op="QueryBuilder", description="resolve_params"):
             # params depends on parse_query, and conditions being resolved first since there may be projects in conditions
-            self.where += self.resolve_params()
+            self.param_conditions = self.resolve_params()
+            self.where += self.param_conditions
         with sentry_sdk.start_span(op="QueryBuilder", description="resolve_columns"):
             self.columns = self.resolve_select(selected_columns, equations)
         with sentry_sdk.start_span(op="QueryBuilder", description="resolve_orderby"):
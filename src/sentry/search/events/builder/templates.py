@@ -0,0 +1,280 @@
+"""
+Pre-resolved query builders that can be reused for other time windows.
+
+Dashboards and Discover re-issue the same queries over and over (every widget on every refresh),
+usually with nothing but the time window moving. Most of the cost of building such a query is in
+`QueryBuilder.resolve_query`: parsing the query string, and resolving columns, functions, aliases
+and conditions through the dataset config.
+
+A `QueryBuilderTemplate` keeps a builder that has been resolved once, and binds copies of it to a
+new time window by only re-resolving the conditions derived from the params (time range, projects,
+environments). Templates are cached per process and keyed by everything else that goes into the
+builder, including the projects, environments and the length of the time window (functions such
+as ``epm()`` depend on it).
+
+A resolved builder can only be reused if its resolution did not depend on the exact time window.
+Builders whose resolved expressions contain dates (relative date filters, ``percent_change``
+and other functions comparing halves of the window) or that ran other queries while resolving
+(such as ``count_unique_ratio``-style totals) are never cached.
+"""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Hashable, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Model
+
+from sentry.search.events.builder.discover import QueryBuilder
+from sentry.search.events.types import ParamsType, QueryBuilderConfig, SnubaParams
+from sentry.snuba.dataset import Dataset
+from sentry.utils import metrics
+
+# Params that are bound to every copy of the template rather than being part of its key.
+TIME_PARAMS = frozenset(["start", "end"])
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, Model):
+        return (type(value).__name__, value.pk)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = tuple(_freeze(item) for item in value)
+        return tuple(sorted(items, key=repr)) if isinstance(value, (set, frozenset)) else items
+    if isinstance(value, dict):
+        return tuple(sorted(((key, _freeze(item)) for key, item in value.items()), key=repr))
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return (type(value).__name__, _freeze(dataclasses.asdict(value)))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def _contains_datetime(value: Any) -> bool:
+    if isinstance(value, datetime):
+        return True
+    if isinstance(value, (list, tuple)):
+        return any(_contains_datetime(item) for item in value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return any(
+            _contains_datetime(getattr(value, field.name)) for field in dataclasses.fields(value)
+        )
+    return False
+
+
+def _window_length(params: ParamsType, snuba_params: Optional[SnubaParams]) -> Optional[float]:
+    if snuba_params is not None:
+        return snuba_params.interval
+    start, end = params.get("start"), params.get("end")
+    if isinstance(start, datetime) and isinstance(end, datetime):
+        return (end - start).total_seconds()
+    return None
+
+
+def _copy_builder(source: QueryBuilder) -> QueryBuilder:
+    builder = copy.copy(source)
+    # Everything that is modified after resolution (extra conditions or columns, aliases
+    # translated by `process_results`) must not be shared between copies.
+    builder.where = list(source.where)
+    builder.having = list(source.having)
+    builder.columns = list(source.columns)
+    builder.aggregates = list(source.aggregates)
+    builder.orderby = list(source.orderby)
+    builder.groupby = list(source.groupby)
+    builder.param_conditions = list(source.param_conditions)
+    builder.function_alias_map = dict(source.function_alias_map)
+    builder.equation_alias_map = dict(source.equation_alias_map)
+    builder.value_resolver_map = dict(source.value_resolver_map)
+    builder.meta_resolver_map = dict(source.meta_resolver_map)
+    builder.prefixed_to_tag_map = dict(source.prefixed_to_tag_map)
+    builder.tag_to_prefixed_map = dict(source.tag_to_prefixed_map)
+    builder.projects_to_filter = set(source.projects_to_filter)
+    builder.tips = {key: set(tips) for key, tips in source.tips.items()}
+    return builder
+
+
+class QueryBuilderTemplate:
+    """
+    A resolved `QueryBuilder` whose copies can be bound to other time windows.
+    """
+
+    def __init__(self, builder: QueryBuilder) -> None:
+        self.builder = _copy_builder(builder)
+        # `resolve_query` appends the conditions derived from the params to the query conditions.
+        del self.builder.where[len(builder.where) - len(builder.param_conditions) :]
+        self.builder.param_conditions = []
+
+    @classmethod
+    def compile(
+        cls, dataset: Dataset, params: ParamsType, **kwargs: Any
+    ) -> Tuple[QueryBuilder, Optional[QueryBuilderTemplate]]:
+        """
+        Builds a `QueryBuilder` and, if its resolution can be reused for other time windows,
+        a template of it.
+        """
+        builder = QueryBuilder(dataset, params, **kwargs)
+
+        # Functions that query totals bake the results for this window into the columns.
+        if builder.requires_other_aggregates:
+            return builder, None
+
+        template = cls(builder)
+        resolved = (
+            template.builder.columns,
+            template.builder.where,
+            template.builder.having,
+            template.builder.orderby,
+            template.builder.groupby,
+            template.builder.limitby,
+            template.builder.array_join,
+        )
+        if _contains_datetime(resolved):
+            return builder, None
+
+        return builder, template
+
+    def bind(self, params: ParamsType, snuba_params: Optional[SnubaParams] = None) -> QueryBuilder:
+        """
+        Returns a copy of the template's builder for ``params``, which must only differ from the
+        params the template was compiled with in their time window.
+        """
+        builder = _copy_builder(self.builder)
+        builder.filter_params = params
+        builder.params = builder._dataclass_params(snuba_params, params)
+
+        builder.start = None
+        builder.end = None
+        builder.resolve_time_conditions()
+        builder.param_conditions = builder.resolve_params()
+        builder.where += builder.param_conditions
+        return builder
+
+
+class QueryBuilderTemplateCache:
+    """
+    A bounded, in-process LRU of `QueryBuilderTemplate` instances with per-entry expiry.
+
+    Templates keep what was resolved from the database (project thresholds, key transactions,
+    custom measurements) for up to ``ttl`` seconds.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, Tuple[QueryBuilderTemplate, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @staticmethod
+    def get_key(
+        dataset: Dataset,
+        params: ParamsType,
+        snuba_params: Optional[SnubaParams] = None,
+        config: Optional[QueryBuilderConfig] = None,
+        **kwargs: Any,
+    ) -> Hashable:
+        snuba_param_key = None
+        if snuba_params is not None:
+            snuba_param_key = _freeze(
+                (
+                    snuba_params.project_ids,
+                    snuba_params.environment_names,
+                    snuba_params.organization,
+                    snuba_params.user.id if snuba_params.user is not None else None,
+                    snuba_params.team_ids,
+                )
+            )
+        return (
+            dataset,
+            _freeze({k: v for k, v in params.items() if k not in TIME_PARAMS}),
+            snuba_param_key,
+            _window_length(params, snuba_params),
+            _freeze(config),
+            _freeze(kwargs),
+        )
+
+    def get(self, key: Hashable) -> Optional[QueryBuilderTemplate]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            template, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return template
+
+    def set(self, key: Hashable, template: QueryBuilderTemplate) -> None:
+        with self._lock:
+            self._data[key] = (template, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_template_cache: Optional[QueryBuilderTemplateCache] = None
+_template_cache_lock = threading.Lock()
+
+
+def get_template_cache() -> Optional[QueryBuilderTemplateCache]:
+    """
+    Returns the process-wide template cache, or ``None`` if it is disabled.
+    """
+    global _template_cache
+
+    cache_options = settings.SENTRY_QUERY_BUILDER_TEMPLATE_OPTIONS
+    max_size = cache_options.get("max_size", 0)
+    if not max_size:
+        _template_cache = None
+        return None
+
+    with _template_cache_lock:
+        if _template_cache is None:
+            _template_cache = QueryBuilderTemplateCache(max_size, cache_options.get("ttl", 60))
+        else:
+            _template_cache.max_size = max_size
+            _template_cache.ttl = cache_options.get("ttl", 60)
+        return _template_cache
+
+
+def build_query(dataset: Dataset, params: ParamsType, **kwargs: Any) -> QueryBuilder:
+    """
+    Equivalent to ``QueryBuilder(dataset, params, **kwargs)``, but reuses the resolution of an
+    earlier builder for the same query over a different time window when possible.
+    """
+    cache = get_template_cache()
+    if cache is None:
+        return QueryBuilder(dataset, params, **kwargs)
+
+    try:
+        key = cache.get_key(dataset, params, **kwargs)
+    except Exception:
+        metrics.incr("query_builder.template", tags={"result": "unkeyable"})
+        return QueryBuilder(dataset, params, **kwargs)
+
+    template = cache.get(key)
+    if template is not None:
+        metrics.incr("query_builder.template", tags={"result": "hit"})
+        return template.bind(params, kwargs.get("snuba_params"))
+
+    builder, template = QueryBuilderTemplate.compile(dataset, params, **kwargs)
+    if template is None:
+        metrics.incr("query_builder.template", tags={"result": "uncacheable"})
+    else:
+        metrics.incr("query_builder.template", tags={"result": "miss"})
+        cache.set(key, template)
+    return builder
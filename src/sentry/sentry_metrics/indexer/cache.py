@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import logging
 import random
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Collection, Iterable, Mapping, MutableMapping, Optional, Sequence, Set
+from typing import Collection, Iterable, Mapping, MutableMapping, Optional, Sequence, Set, Tuple
 
 from django.conf import settings
 from django.core.cache import caches
@@ -33,6 +36,8 @@ _INDEXER_CACHE_RESOLVE_CACHE_REPLENISHMENT_METRIC = (
 _INDEXER_CACHE_DOUBLE_WRITE_METRIC = "sentry_metrics.indexer.memcache.double-write"
 _INDEXER_CACHE_DOUBLE_READ_METRIC = "sentry_metrics.indexer.memcache.new-schema-read"
 _INDEXER_CACHE_STALE_KEYS_METRIC = "sentry_metrics.indexer.memcache.stale-keys"
+_INDEXER_LOCAL_CACHE_METRIC = "sentry_metrics.indexer.local_cache"
+_INDEXER_LOCAL_CACHE_EVICTIONS_METRIC = "sentry_metrics.indexer.local_cache.evictions"
 
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
@@ -45,11 +50,95 @@ BULK_RECORD_CACHE_NAMESPACE = "br"
 RESOLVE_CACHE_NAMESPACE = "res"
 
 
+class LocalLRUCache:
+    """
+    A small, bounded, in-process LRU of string -> id mappings with per-entry expiry.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._data: OrderedDict[str, Tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[int]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: int, ttl: int) -> int:
+        """
+        Stores ``value`` for ``ttl`` seconds and returns the number of evicted entries.
+        """
+        evicted = 0
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
 class StringIndexerCache:
-    def __init__(self, cache_name: str, partition_key: str):
+    def __init__(self, cache_name: str, partition_key: str, local_cache_size: int = 0):
         self.version = 1
         self.cache = caches[cache_name]
         self.partition_key = partition_key
+        self.local_cache_size = local_cache_size
+        # In-process tier in front of `self.cache`, one LRU per namespace and use case so that a
+        # high cardinality use case can't evict the hot strings of the others.
+        self._local_caches: MutableMapping[Tuple[str, str], LocalLRUCache] = {}
+
+    def _get_local_cache(self, namespace: str, key: str, size: int) -> LocalLRUCache:
+        use_case_id = key.split(":", 1)[0]
+        local_cache = self._local_caches.get((namespace, use_case_id))
+        if local_cache is None:
+            local_cache = self._local_caches[(namespace, use_case_id)] = LocalLRUCache(size)
+        local_cache.max_size = size
+        return local_cache
+
+    def _local_get_many(
+        self, namespace: str, keys: Iterable[str], size: int
+    ) -> MutableMapping[str, Optional[int]]:
+        results: MutableMapping[str, Optional[int]] = {}
+        for key in keys:
+            results[key] = self._get_local_cache(namespace, key, size).get(key)
+        hits = sum(1 for value in results.values() if value is not None)
+        metrics.incr(_INDEXER_LOCAL_CACHE_METRIC, tags={"cache_hit": "true"}, amount=hits)
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC, tags={"cache_hit": "false"}, amount=len(results) - hits
+        )
+        return results
+
+    def _local_set_many(self, namespace: str, key_values: Mapping[str, int], size: int) -> None:
+        evicted = 0
+        for key, value in key_values.items():
+            evicted += self._get_local_cache(namespace, key, size).set(
+                key, value, self.randomized_ttl
+            )
+        if evicted:
+            metrics.incr(_INDEXER_LOCAL_CACHE_EVICTIONS_METRIC, amount=evicted)
+
+    def _local_delete_many(self, namespace: str, keys: Iterable[str]) -> None:
+        for key in keys:
+            use_case_id = key.split(":", 1)[0]
+            local_cache = self._local_caches.get((namespace, use_case_id))
+            if local_cache is not None:
+                local_cache.delete(key)
 
     @property
     def randomized_ttl(self) -> int:
@@ -131,6 +220,17 @@ class StringIndexerCache:
         return int(result)
 
     def get(self, namespace: str, key: str) -> Optional[int]:
+        local_cache_size = self.local_cache_size
+        if local_cache_size > 0:
+            result = self._local_get_many(namespace, [key], local_cache_size)[key]
+            if result is None:
+                result = self._get(namespace, key)
+                if result is not None:
+                    self._local_set_many(namespace, {key: result}, local_cache_size)
+            return result
+        return self._get(namespace, key)
+
+    def _get(self, namespace: str, key: str) -> Optional[int]:
         if options.get(NAMESPACED_READ_FEAT_FLAG):
             metrics.incr(_INDEXER_CACHE_DOUBLE_READ_METRIC)
             result = self.cache.get(
@@ -140,6 +240,9 @@ class StringIndexerCache:
         return self.cache.get(self._make_cache_key(key), version=self.version)
 
     def set(self, namespace: str, key: str, value: int) -> None:
+        local_cache_size = self.local_cache_size
+        if local_cache_size > 0:
+            self._local_set_many(namespace, {key: value}, local_cache_size)
         self.cache.set(
             key=self._make_cache_key(key),
             value=value,
@@ -156,6 +259,23 @@ class StringIndexerCache:
             )
 
     def get_many(self, namespace: str, keys: Iterable[str]) -> MutableMapping[str, Optional[int]]:
+        local_cache_size = self.local_cache_size
+        if local_cache_size <= 0:
+            return self._get_many(namespace, keys)
+
+        results = self._local_get_many(namespace, keys, local_cache_size)
+        missing = [key for key, value in results.items() if value is None]
+        if missing:
+            remote_results = self._get_many(namespace, missing)
+            self._local_set_many(
+                namespace,
+                {key: value for key, value in remote_results.items() if value is not None},
+                local_cache_size,
+            )
+            results.update(remote_results)
+        return results
+
+    def _get_many(self, namespace: str, keys: Iterable[str]) -> MutableMapping[str, Optional[int]]:
         if options.get(NAMESPACED_READ_FEAT_FLAG):
             metrics.incr(_INDEXER_CACHE_DOUBLE_READ_METRIC)
             cache_keys = {self._make_namespaced_cache_key(namespace, key): key for key in keys}
@@ -176,6 +296,9 @@ class StringIndexerCache:
             return self._format_results(keys, results)
 
     def set_many(self, namespace: str, key_values: Mapping[str, int]) -> None:
+        local_cache_size = self.local_cache_size
+        if local_cache_size > 0:
+            self._local_set_many(namespace, key_values, local_cache_size)
         cache_key_values = {self._make_cache_key(k): v for k, v in key_values.items()}
         self.cache.set_many(cache_key_values, timeout=self.randomized_ttl, version=self.version)
         if options.get(NAMESPACED_WRITE_FEAT_FLAG):
@@ -190,12 +313,14 @@ class StringIndexerCache:
             )
 
     def delete(self, namespace: str, key: str) -> None:
+        self._local_delete_many(namespace, [key])
         self.cache.delete(self._make_cache_key(key), version=self.version)
         if options.get(NAMESPACED_WRITE_FEAT_FLAG):
             metrics.incr(_INDEXER_CACHE_DOUBLE_WRITE_METRIC)
             self.cache.delete(self._make_namespaced_cache_key(namespace, key), version=self.version)
 
     def delete_many(self, namespace: str, keys: Sequence[str]) -> None:
+        self._local_delete_many(namespace, keys)
         self.cache.delete_many([self._make_cache_key(key) for key in keys], version=self.version)
         if options.get(NAMESPACED_WRITE_FEAT_FLAG):
             metrics.incr(_INDEXER_CACHE_DOUBLE_WRITE_METRIC)
@@ -21,6 +21,7 @@ from sentry.search.events.builder import (
     TimeseriesQueryBuilder,
     TopEventsQueryBuilder,
 )
+from sentry.search.events.builder.templates import build_query
 from sentry.search.events.fields import (
     FIELD_ALIASES,
     get_function_alias,
@@ -30,6 +31,7 @@ from sentry.search.events.fields import (
 from sentry.search.events.types import HistogramParams, ParamsType, QueryBuilderConfig
 from sentry.snuba.dataset import Dataset
 from sentry.tagstore.base import TOP_VALUES_DEFAULT_LIMIT
+from sentry.utils import metrics
 from sentry.utils.dates import to_timestamp
 from sentry.utils.math import nice_int
 from sentry.utils.snuba import (
@@ -236,34 +238,37 @@ def query(
     if not selected_columns:
         raise InvalidSearchQuery("No columns selected")
 
-    builder = QueryBuilder(
-        Dataset.Discover,
-        params,
-        snuba_params=snuba_params,
-        query=query,
-        selected_columns=selected_columns,
-        equations=equations,
-        orderby=orderby,
-        limit=limit,
-        offset=offset,
-        sample_rate=sample,
-        config=QueryBuilderConfig(
-            auto_fields=auto_fields,
-            auto_aggregations=auto_aggregations,
-            use_aggregate_conditions=use_aggregate_conditions,
-            functions_acl=functions_acl,
-            equation_config={"auto_add": include_equation_fields},
-            has_metrics=has_metrics,
-            transform_alias_to_input_format=transform_alias_to_input_format,
-            skip_tag_resolution=skip_tag_resolution,
-        ),
-    )
+    with metrics.timer("discover.query.resolve"):
+        builder = build_query(
+            Dataset.Discover,
+            params,
+            snuba_params=snuba_params,
+            query=query,
+            selected_columns=selected_columns,
+            equations=equations,
+            orderby=orderby,
+            limit=limit,
+            offset=offset,
+            sample_rate=sample,
+            config=QueryBuilderConfig(
+                auto_fields=auto_fields,
+                auto_aggregations=auto_aggregations,
+                use_aggregate_conditions=use_aggregate_conditions,
+                functions_acl=functions_acl,
+                equation_config={"auto_add": include_equation_fields},
+                has_metrics=has_metrics,
+                transform_alias_to_input_format=transform_alias_to_input_format,
+                skip_tag_resolution=skip_tag_resolution,
+            ),
+        )
     if conditions is not None:
         builder.add_conditions(conditions)
     if extra_columns is not None:
         builder.columns.extend(extra_columns)
 
-    result = builder.process_results(builder.run_query(referrer))
+    with metrics.timer("discover.query.execute"):
+        results = builder.run_query(referrer)
+    result = builder.process_results(results)
     result["meta"]["tips"] = transform_tips(builder.tips)
     return result
 
@@ -913,6 +913,17 @@ _DERIVED_METRICS: Dict[MetricOperationType, TagsSpecsGenerator | None] = {
 }
 
 
+def derived_metric_tags_conditions(
+    op: MetricOperationType, project: Project, arguments: Optional[Sequence[str]]
+) -> List[TagSpec]:
+    """Returns the tag conditions Relay injects for the derived metric ``op`` in ``project``."""
+    tags_specs_generator = _DERIVED_METRICS.get(op)
+    if tags_specs_generator is None:
+        return []
+
+    return tags_specs_generator(project, arguments)
+
+
 @dataclass(frozen=True)
 class FieldParsingResult:
     function: str
@@ -1065,13 +1076,13 @@ class OnDemandMetricSpec:
         is extracted."""
         return self._process_query()
 
+    @property
+    def arguments(self) -> Sequence[str]:
+        return self._arguments
+
     def tags_conditions(self, project: Project) -> List[TagSpec]:
         """Returns a list of tag conditions that will specify how tags are injected into metrics by Relay."""
-        tags_specs_generator = _DERIVED_METRICS.get(self.op)
-        if tags_specs_generator is None:
-            return []
-
-        return tags_specs_generator(project, self._arguments)
+        return derived_metric_tags_conditions(self.op, project, self._arguments)
 
     def _tag_for_field(self, groupby: str) -> TagSpec:
         """Returns a TagSpec for a field, eg. a groupby"""
@@ -1088,9 +1099,19 @@ class OnDemandMetricSpec:
 
     def to_metric_spec(self, project: Project) -> MetricSpec:
         """Converts the OndemandMetricSpec into a MetricSpec that Relay can understand."""
+        metric_spec = self.to_project_independent_metric_spec()
         # Tag conditions are always computed based on the project.
-        extended_tags_conditions = self.tags_conditions(project).copy()
-        extended_tags_conditions.append({"key": QUERY_HASH_KEY, "value": self.query_hash})
+        metric_spec["tags"] = self.tags_conditions(project) + metric_spec["tags"]
+        return metric_spec
+
+    def to_project_independent_metric_spec(self) -> MetricSpec:
+        """
+        Returns the MetricSpec without the tag conditions of derived metrics, which are the only
+        part of the spec that depends on the project. See `derived_metric_tags_conditions`.
+        """
+        extended_tags_conditions: List[TagSpec] = [
+            {"key": QUERY_HASH_KEY, "value": self.query_hash}
+        ]
 
         tag_from_groupbys = self.tags_groupbys(self.groupbys)
         extended_tags_conditions.extend(tag_from_groupbys)
@@ -1,9 +1,10 @@
 import re
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Optional, Sequence, TypedDict, Union
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, TypedDict, Union
 from urllib.parse import urlparse
 
 from sentry.spans.grouping.utils import Hash, parse_fingerprint_var
+from sentry.spans.table import SpanTable
 
 
 class Span(TypedDict):
@@ -25,6 +26,8 @@ class Span(TypedDict):
 # should return `None` to indicate that the strategy should not be used
 # and to try a different strategy. If the strategy does apply, it should
 # return a list of strings that will serve as the span fingerprint.
+# Strategies may only look at the op and the description of the span, as
+# spans that share both are grouped only once per event.
 CallableStrategy = Callable[[Span], Optional[Sequence[str]]]
 
 
@@ -34,9 +37,25 @@ class SpanGroupingStrategy:
     # The strategies to use with the default fingerprint
     strategies: Sequence[CallableStrategy]
 
-    def execute(self, event_data: Any) -> Dict[str, str]:
-        spans = event_data.get("spans", [])
-        span_groups = {span["span_id"]: self.get_span_group(span) for span in spans}
+    def execute(self, event_data: Any, span_table: Optional[SpanTable] = None) -> Dict[str, str]:
+        if span_table is None:
+            span_table = SpanTable.from_event(event_data)
+
+        # Repeated spans (such as N+1 queries) share their op and description, and with the
+        # default fingerprint also their group.
+        default_groups: Dict[Tuple[str, str], str] = {}
+        span_groups = {}
+        for span, op, description in zip(span_table.spans, span_table.ops, span_table.descriptions):
+            # Spans with a custom fingerprint or a description that is not a string are
+            # grouped on their own.
+            if span.get("fingerprint") or (not description and span.get("description")):
+                span_groups[span["span_id"]] = self.get_span_group(span)
+                continue
+
+            group = default_groups.get((op, description))
+            if group is None:
+                group = default_groups[(op, description)] = self.get_span_group(span)
+            span_groups[span["span_id"]] = group
 
         # make sure to get the group id for the transaction root span
         span_id = event_data["contexts"]["trace"]["span_id"]
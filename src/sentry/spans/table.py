@@ -0,0 +1,161 @@
+"""
+Columnar view of the spans of a transaction event.
+
+Span grouping and every performance detector used to read ``op``, ``description`` and the
+timestamps straight from the span dicts, and to recompute durations and overlaps through
+``timedelta`` arithmetic each time a span was looked at. For transactions with thousands of spans
+that work is repeated for every consumer. `SpanTable` extracts those fields once into flat columns
+(interned op strings, arrays of timestamps and durations, parent indices) which are shared by all
+consumers of the same event.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from datetime import timedelta
+from functools import cached_property
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+Span = Mapping[str, Any]
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_microseconds(value: Any) -> int:
+    # Rounds exactly like the `timedelta(seconds=...)` arithmetic used by the detectors.
+    return timedelta(seconds=value) // _MICROSECOND
+
+
+class SpanTable:
+    """
+    Columns of span fields, indexed by the position of the span in ``spans``.
+
+    The columns are only built when first accessed. Spans are looked up by identity, so the table
+    stays valid while the span dicts are modified (span grouping writes ``hash`` into them), but
+    not if spans are added or removed. Methods that accept spans also work for spans that are not
+    part of the table, by computing the values directly.
+    """
+
+    def __init__(self, spans: Sequence[Span]) -> None:
+        self.spans = spans
+
+    @classmethod
+    def from_event(cls, event_data: Mapping[str, Any]) -> SpanTable:
+        return cls(event_data.get("spans") or [])
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    @cached_property
+    def _positions(self) -> Dict[int, int]:
+        return {id(span): index for index, span in enumerate(self.spans)}
+
+    @cached_property
+    def ops(self) -> List[str]:
+        """The interned ``op`` of every span, or an empty string."""
+        ops = []
+        for span in self.spans:
+            op = span.get("op")
+            ops.append(sys.intern(op) if isinstance(op, str) else "")
+        return ops
+
+    @cached_property
+    def descriptions(self) -> List[str]:
+        """The ``description`` of every span, or an empty string."""
+        descriptions = []
+        for span in self.spans:
+            description = span.get("description")
+            descriptions.append(description if isinstance(description, str) else "")
+        return descriptions
+
+    @cached_property
+    def start_timestamps(self) -> array[float]:
+        return array("d", (span.get("start_timestamp") or 0 for span in self.spans))
+
+    @cached_property
+    def end_timestamps(self) -> array[float]:
+        return array("d", (span.get("timestamp") or 0 for span in self.spans))
+
+    @cached_property
+    def _start_microseconds(self) -> array[int]:
+        return array("q", map(_to_microseconds, self.start_timestamps))
+
+    @cached_property
+    def _end_microseconds(self) -> array[int]:
+        return array("q", map(_to_microseconds, self.end_timestamps))
+
+    @cached_property
+    def durations(self) -> array[float]:
+        """The duration of every span in milliseconds."""
+        return array(
+            "d",
+            (
+                (end - start) / 10**6 * 1000
+                for start, end in zip(self._start_microseconds, self._end_microseconds)
+            ),
+        )
+
+    @cached_property
+    def parent_indices(self) -> array[int]:
+        """The index of the parent of every span, or -1 if the parent is not one of the spans."""
+        index_by_id: Dict[Any, int] = {}
+        for index, span in enumerate(self.spans):
+            index_by_id.setdefault(span.get("span_id"), index)
+        index_by_id.pop(None, None)
+        return array("q", (index_by_id.get(span.get("parent_span_id"), -1) for span in self.spans))
+
+    def index(self, span: Span) -> Optional[int]:
+        """The position of ``span`` in the table, or ``None`` if it is not part of it."""
+        return self._positions.get(id(span))
+
+    def duration(self, span: Span) -> float:
+        """The duration of ``span`` in milliseconds."""
+        index = self.index(span)
+        if index is None:
+            return SpanTable([span]).durations[0]
+        return self.durations[index]
+
+    def total_duration(self, spans: Iterable[Span]) -> float:
+        """The sum of the durations of ``spans`` in milliseconds."""
+        total = 0.0
+        for span in spans:
+            total += self.duration(span)
+        return total
+
+    def max_duration(self, spans: Iterable[Span]) -> float:
+        """The longest duration among ``spans`` in milliseconds."""
+        return max(self.duration(span) for span in spans)
+
+    def overlaps(self, previous_span: Span, span: Span) -> bool:
+        """Whether ``span`` starts before ``previous_span`` ends."""
+        previous_index, index = self.index(previous_span), self.index(span)
+        if previous_index is None or index is None:
+            table = SpanTable([previous_span, span])
+            return table._end_microseconds[0] > table._start_microseconds[1]
+        return self._end_microseconds[previous_index] > self._start_microseconds[index]
+
+    def total_time(self, spans: Sequence[Span]) -> float:
+        """
+        The time covered by ``spans`` in milliseconds, counting overlapping time only once.
+        """
+        indices = [self.index(span) for span in spans]
+        if None in indices:
+            table = SpanTable(spans)
+            return table.total_time(table.spans)
+
+        starts, ends = self.start_timestamps, self.end_timestamps
+        ordered = sorted(indices, key=starts.__getitem__)  # type: ignore[arg-type]
+        total_duration = 0.0
+        current_min = starts[ordered[0]]
+        current_max = ends[ordered[0]]
+        for index in ordered[1:]:
+            start = starts[index]
+            if current_min <= start <= current_max:
+                current_max = max(ends[index], current_max)
+            else:
+                total_duration += current_max - current_min
+                current_min = start
+                current_max = ends[index]
+        total_duration += current_max - current_min
+        return total_duration * 1000
@@ -1,18 +1,33 @@
 from __future__ import annotations
 
 import logging
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from time import time
-from typing import TYPE_CHECKING, Mapping, Optional, Sequence, Tuple, TypedDict, Union
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    FrozenSet,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypedDict,
+    Union,
+)
 
 import sentry_sdk
 from django.conf import settings
+from django.db import close_old_connections
 from django.db.models.signals import post_save
 from django.utils import timezone
 from google.api_core.exceptions import ServiceUnavailable
 
-from sentry import features
+from sentry import features, options
 from sentry.exceptions import PluginError
 from sentry.issues.grouptype import GroupCategory
 from sentry.issues.issue_occurrence import IssueOccurrence
@@ -700,37 +715,79 @@ def run_post_process_job(job: PostProcessJob):
         # specific pipelines for issue types
         pipeline = GROUP_CATEGORY_POST_PROCESS_PIPELINE[issue_category]
 
-    for pipeline_step in pipeline:
-        try:
-            with metrics.timer(
-                "tasks.post_process.run_post_process_job.pipeline.duration",
-                tags={
-                    "pipeline": pipeline_step.__name__,
-                    "issue_category": issue_category_metric,
-                    "is_reprocessed": job["is_reprocessed"],
-                },
-            ), sentry_sdk.start_span(op=f"tasks.post_process_group.{pipeline_step.__name__}"):
-                pipeline_step(job)
-        except Exception:
-            metrics.incr(
-                "sentry.tasks.post_process.post_process_group.exception",
-                tags={
-                    "issue_category": issue_category_metric,
-                    "pipeline": pipeline_step.__name__,
-                },
-            )
-            logger.exception(
-                f"Failed to process pipeline step {pipeline_step.__name__}",
-                extra={"event": group_event, "group": group_event.group},
-            )
-        else:
-            metrics.incr(
-                "sentry.tasks.post_process.post_process_group.completed",
-                tags={
-                    "issue_category": issue_category_metric,
-                    "pipeline": pipeline_step.__name__,
-                },
+    if not options.get("post_process.parallel-pipeline-steps"):
+        for pipeline_step in pipeline:
+            _run_pipeline_step(job, pipeline_step, issue_category_metric)
+        return
+
+    for batch in schedule_pipeline(pipeline):
+        if len(batch) == 1:
+            _run_pipeline_step(job, batch[0], issue_category_metric)
+            continue
+
+        executor = _get_pipeline_executor()
+        futures = [
+            executor.submit(
+                _run_pipeline_step_in_thread,
+                sentry_sdk.Hub(sentry_sdk.Hub.current),
+                job,
+                pipeline_step,
+                issue_category_metric,
             )
+            for pipeline_step in batch
+        ]
+        for future in futures:
+            future.result()
+
+
+def _run_pipeline_step(
+    job: PostProcessJob, pipeline_step: PipelineStep, issue_category_metric: Optional[str]
+) -> None:
+    group_event = job["event"]
+    try:
+        with metrics.timer(
+            "tasks.post_process.run_post_process_job.pipeline.duration",
+            tags={
+                "pipeline": pipeline_step.__name__,
+                "issue_category": issue_category_metric,
+                "is_reprocessed": job["is_reprocessed"],
+            },
+        ), sentry_sdk.start_span(op=f"tasks.post_process_group.{pipeline_step.__name__}"):
+            pipeline_step(job)
+    except Exception:
+        metrics.incr(
+            "sentry.tasks.post_process.post_process_group.exception",
+            tags={
+                "issue_category": issue_category_metric,
+                "pipeline": pipeline_step.__name__,
+            },
+        )
+        logger.exception(
+            f"Failed to process pipeline step {pipeline_step.__name__}",
+            extra={"event": group_event, "group": group_event.group},
+        )
+    else:
+        metrics.incr(
+            "sentry.tasks.post_process.post_process_group.completed",
+            tags={
+                "issue_category": issue_category_metric,
+                "pipeline": pipeline_step.__name__,
+            },
+        )
+
+
+def _run_pipeline_step_in_thread(
+    hub: sentry_sdk.Hub,
+    job: PostProcessJob,
+    pipeline_step: PipelineStep,
+    issue_category_metric: Optional[str],
+) -> None:
+    with hub:
+        try:
+            _run_pipeline_step(job, pipeline_step, issue_category_metric)
+        finally:
+            # Worker threads outlive the task, treat every step like a request of its own.
+            close_old_connections()
 
 
 def process_event(data: dict, group_id: Optional[int]) -> Event:
@@ -1405,3 +1462,88 @@ GENERIC_POST_PROCESS_PIPELINE = [
     process_inbox_adds,
     process_rules,
 ]
+
+
+PipelineStep = Callable[[PostProcessJob], None]
+
+
+@dataclass(frozen=True)
+class StepDependencies:
+    """
+    The state a post process pipeline step reads and writes, either keys of the `PostProcessJob`
+    (``job.<key>``) or state of the group that is changed in the database (``group.<aspect>``).
+    Steps that neither write what the other reads or writes may run concurrently.
+    """
+
+    reads: FrozenSet[str] = frozenset()
+    writes: FrozenSet[str] = frozenset()
+
+    def conflicts_with(self, other: StepDependencies) -> bool:
+        return bool(self.writes & (other.reads | other.writes) or other.writes & self.reads)
+
+
+def _deps(reads: Sequence[str] = (), writes: Sequence[str] = ()) -> StepDependencies:
+    return StepDependencies(reads=frozenset(reads), writes=frozenset(writes))
+
+
+# Steps that are missing here never run concurrently with any other step. That covers steps
+# whose receivers may do anything (`fire_error_processed`, `process_plugins`) and steps that
+# change the job's event or group in place (`process_commits`, `process_code_mappings`,
+# `process_similarity`, `sdk_crash_monitoring`, `process_replay_link`).
+POST_PROCESS_STEP_DEPENDENCIES: Mapping[PipelineStep, StepDependencies] = {
+    _capture_group_stats: _deps(),
+    process_snoozes: _deps(writes=["job.has_reappeared", "group.status"]),
+    process_inbox_adds: _deps(reads=["job.has_reappeared"], writes=["group.status"]),
+    detect_new_escalation: _deps(writes=["job.has_escalated", "group.status"]),
+    handle_owner_assignment: _deps(reads=["group.assignee"], writes=["group.owners"]),
+    handle_auto_assignment: _deps(reads=["group.owners"], writes=["group.assignee"]),
+    process_rules: _deps(
+        reads=["job.has_reappeared", "group.status", "group.owners", "group.assignee"],
+        writes=["job.has_alert"],
+    ),
+    process_service_hooks: _deps(reads=["job.has_alert"]),
+    process_resource_change_bounds: _deps(),
+    update_existing_attachments: _deps(writes=["event.attachments"]),
+}
+
+
+def schedule_pipeline(pipeline: Sequence[PipelineStep]) -> List[List[PipelineStep]]:
+    """
+    Splits a pipeline into batches of steps that can run concurrently. Every step runs in a later
+    batch than all steps before it in the pipeline that it conflicts with, so the batches give the
+    same results as running the pipeline in order.
+    """
+    levels: List[int] = []
+    for idx, step in enumerate(pipeline):
+        dependencies = POST_PROCESS_STEP_DEPENDENCIES.get(step)
+        level = 0
+        for previous_idx, previous_step in enumerate(pipeline[:idx]):
+            previous_dependencies = POST_PROCESS_STEP_DEPENDENCIES.get(previous_step)
+            if (
+                dependencies is None
+                or previous_dependencies is None
+                or dependencies.conflicts_with(previous_dependencies)
+            ):
+                level = max(level, levels[previous_idx] + 1)
+        levels.append(level)
+
+    batches: List[List[PipelineStep]] = [[] for _ in range(max(levels, default=-1) + 1)]
+    for step, level in zip(pipeline, levels):
+        batches[level].append(step)
+    return batches
+
+
+_pipeline_executor: Optional[ThreadPoolExecutor] = None
+_pipeline_executor_lock = threading.Lock()
+
+
+def _get_pipeline_executor() -> ThreadPoolExecutor:
+    global _pipeline_executor
+
+    with _pipeline_executor_lock:
+        if _pipeline_executor is None:
+            _pipeline_executor = ThreadPoolExecutor(
+                max_workers=options.get("post_process.parallel-pipeline-steps.workers"),
+                thread_name_prefix="post-process-pipeline",
+            )
+        return _pipeline_executor
@@ -51,7 +51,20 @@ def buffer_incr(model, *args, **kwargs):
     Call `buffer.incr` task, resolving the model name first.
 
     `model_name` must be in form `app_label.model_name` e.g. `sentry.group`.
+
+    When `buffer.coalesce-incr.enabled` is set and increments are not spawned as celery tasks,
+    increments are merged in-process and written to the buffer in batches.
     """
+    from sentry import options
+
+    if not settings.SENTRY_BUFFER_INCR_AS_CELERY_TASK and options.get(
+        "buffer.coalesce-incr.enabled"
+    ):
+        from sentry.buffer.coalescing import get_coalescer
+
+        get_coalescer().incr(model, *args, **kwargs)
+        return
+
     (buffer_incr_task.delay if settings.SENTRY_BUFFER_INCR_AS_CELERY_TASK else buffer_incr_task)(
         app_label=model._meta.app_label, model_name=model._meta.model_name, args=args, kwargs=kwargs
     )
@@ -1,5 +1,6 @@
 import logging
 import time
+from collections import defaultdict
 
 import sentry_sdk
 from django.db import router, transaction
@@ -125,22 +126,7 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
         # it could be possible that refrequent invalidations cause the task to take excessive time
         # to complete.
         for organization in Organization.objects.filter(id=organization_id):
-            for project in Project.objects.filter(organization_id=organization_id):
-                project.set_cached_field_value("organization", organization)
-                for key in ProjectKey.objects.filter(project_id=project.id):
-                    key.set_cached_field_value("project", project)
-                    # If we find the config in the cache it means it was active.  As such we want to
-                    # recalculate it.  If the config was not there at all, we leave it and avoid the
-                    # cost of re-computation.
-                    if projectconfig_cache.backend.get(key.public_key) is not None:
-                        configs[key.public_key] = compute_projectkey_config(key)
-                        action = "recompute"
-                    else:
-                        action = "not-cached"
-                    metrics.incr(
-                        "relay.projectconfig_cache.invalidation.recompute",
-                        tags={"action": action, "scope": "organization"},
-                    )
+            configs.update(compute_organization_configs(organization))
     elif project_id:
         for project in Project.objects.filter(id=project_id):
             for key in ProjectKey.objects.filter(project_id=project_id):
@@ -179,6 +165,57 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     return configs
 
 
+def compute_organization_configs(organization):
+    """Computes the configs of all cached project keys in an organization in bulk.
+
+    Instead of computing every key on its own, projects and keys are fetched with one query each,
+    the cache is checked for all keys in one round trip, project options are prefetched for all
+    projects and the config of each project is computed once for all of its keys.
+
+    Feature flags and quotas are not prefetched and are still resolved once per project.
+
+    :returns: A dict mapping the affected public keys to their config.
+    """
+    from sentry.models.options.project_option import ProjectOption
+    from sentry.models.project import Project
+    from sentry.models.projectkey import ProjectKey, ProjectKeyStatus
+    from sentry.relay.config import get_project_key_configs
+
+    projects = {}
+    for project in Project.objects.filter(organization_id=organization.id):
+        project.set_cached_field_value("organization", organization)
+        projects[project.id] = project
+
+    keys = list(ProjectKey.objects.filter(project_id__in=projects))
+    # If we find the config in the cache it means it was active.  As such we want to
+    # recalculate it.  If the config was not there at all, we leave it and avoid the
+    # cost of re-computation.
+    cached = projectconfig_cache.backend.exists_many([key.public_key for key in keys])
+
+    configs = {}
+    active_keys = defaultdict(list)
+    for key in keys:
+        if not cached.get(key.public_key):
+            action = "not-cached"
+        elif key.status != ProjectKeyStatus.ACTIVE:
+            configs[key.public_key] = {"disabled": True}
+            action = "recompute"
+        else:
+            key.set_cached_field_value("project", projects[key.project_id])
+            active_keys[key.project_id].append(key)
+            action = "recompute"
+        metrics.incr(
+            "relay.projectconfig_cache.invalidation.recompute",
+            tags={"action": action, "scope": "organization"},
+        )
+
+    ProjectOption.objects.prefetch_all_values(list(active_keys))
+    for project_id, project_keys in active_keys.items():
+        configs.update(get_project_key_configs(projects[project_id], project_keys))
+
+    return configs
+
+
 def compute_projectkey_config(key):
     """Computes a single config for the given :class:`ProjectKey`.
 
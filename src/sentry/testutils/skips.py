@@ -86,6 +86,14 @@ def _requires_symbolicator() -> None:
         pytest.fail(_requires_service_message("symbolicator"))
 
 
+@pytest.fixture(scope="session")
+def _requires_pytest_benchmark() -> None:
+    # pytest-benchmark is not a dev requirement, so benchmarks are opt-in: they only run once
+    # it is installed (`pip install pytest-benchmark`).
+    pytest.importorskip("pytest_benchmark")
+
+
 requires_snuba = pytest.mark.usefixtures("_requires_snuba")
 requires_symbolicator = pytest.mark.usefixtures("_requires_symbolicator")
 requires_kafka = pytest.mark.usefixtures("_requires_kafka")
+requires_pytest_benchmark = pytest.mark.usefixtures("_requires_pytest_benchmark")
@@ -5,6 +5,7 @@ from enum import Enum
 from django.conf import settings
 from django.utils import timezone
 
+from sentry.tsdb.columnar import SeriesMatrix
 from sentry.utils.dates import to_datetime, to_timestamp
 from sentry.utils.services import Service
 
@@ -373,6 +374,41 @@ class BaseTSDB(Service):
         """
         raise NotImplementedError
 
+    def get_range_matrix(
+        self,
+        model,
+        keys,
+        start,
+        end,
+        rollup=None,
+        environment_ids=None,
+        use_cache=False,
+        jitter_value=None,
+        tenant_ids=None,
+        referrer_suffix=None,
+    ):
+        """
+        Same as ``get_range``, but returns a ``SeriesMatrix`` with one row of counts per key over
+        a shared series of timestamps. Prefer this when requesting many keys and further
+        aggregating the result.
+        """
+        range_set = self.get_range(
+            model,
+            keys,
+            start,
+            end,
+            rollup,
+            environment_ids=environment_ids,
+            use_cache=use_cache,
+            jitter_value=jitter_value,
+            tenant_ids=tenant_ids,
+            referrer_suffix=referrer_suffix,
+        )
+        matrix = SeriesMatrix.from_range(range_set)
+        if matrix is None:
+            matrix = SeriesMatrix.align(range_set)
+        return matrix
+
     def get_sums(
         self,
         model,
@@ -414,6 +450,14 @@ class BaseTSDB(Service):
         Given a set of values (as returned from ``get_range``), roll them up
         using the ``rollup`` time (in seconds).
         """
+        matrix = SeriesMatrix.from_range(values)
+        if matrix is not None:
+            rolled_up = matrix.rollup(rollup)
+            return {
+                key: [[ts, count] for ts, count in zip(rolled_up.timestamps, row)]
+                for key, row in rolled_up.rows.items()
+            }
+
         normalize_ts_to_epoch = self.normalize_ts_to_epoch
         result = {}
         for key, points in values.items():
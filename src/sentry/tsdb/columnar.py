@@ -0,0 +1,131 @@
+"""
+Columnar representation of ``get_range`` results.
+
+``get_range`` returns ``{key: [(timestamp, count), ...]}``. For all backends every key shares the
+same series of timestamps, so when many keys are requested at once (stats endpoints asking for
+hundreds of groups) re-deriving and re-normalizing those timestamps per key and per point is most
+of the work. `SeriesMatrix` stores the timestamps once and one row of counts per key, which lets
+sums, merges and rollups compute their bucketing a single time and then work on plain row slices.
+"""
+
+from __future__ import annotations
+
+from typing import Generic, Hashable, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class SeriesMatrix(Generic[K]):
+    """
+    Counts for a set of keys over one shared, sorted series of epoch timestamps.
+
+    ``rows[key][i]`` is the count of ``key`` at ``timestamps[i]``.
+    """
+
+    __slots__ = ("timestamps", "rows")
+
+    def __init__(self, timestamps: Sequence[int], rows: Mapping[K, List[int]]) -> None:
+        self.timestamps = list(timestamps)
+        self.rows = dict(rows)
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, SeriesMatrix)
+            and self.timestamps == other.timestamps
+            and self.rows == other.rows
+        )
+
+    def __repr__(self) -> str:
+        return f"<SeriesMatrix timestamps={len(self.timestamps)} keys={len(self.rows)}>"
+
+    @classmethod
+    def from_range(
+        cls, range_set: Mapping[K, Sequence[Tuple[int, int]]]
+    ) -> Optional[SeriesMatrix[K]]:
+        """
+        Builds a matrix from ``get_range`` style results, or returns ``None`` if the keys don't
+        share the same sorted series of timestamps.
+        """
+        timestamps: Optional[List[int]] = None
+        rows = {}
+        for key, points in range_set.items():
+            key_timestamps = [ts for ts, _ in points]
+            if timestamps is None:
+                if any(a >= b for a, b in zip(key_timestamps, key_timestamps[1:])):
+                    return None
+                timestamps = key_timestamps
+            elif key_timestamps != timestamps:
+                return None
+            rows[key] = [count for _, count in points]
+        return cls(timestamps or [], rows)
+
+    @classmethod
+    def align(cls, range_set: Mapping[K, Sequence[Tuple[int, int]]]) -> SeriesMatrix[K]:
+        """
+        Builds a matrix from ``get_range`` style results over the union of all timestamps, filling
+        gaps with zeros.
+        """
+        timestamps = sorted({ts for points in range_set.values() for ts, _ in points})
+        position = {ts: idx for idx, ts in enumerate(timestamps)}
+        rows = {}
+        for key, points in range_set.items():
+            row = rows[key] = [0] * len(timestamps)
+            for ts, count in points:
+                row[position[ts]] += count
+        return cls(timestamps, rows)
+
+    def to_range(self) -> dict[K, List[Tuple[int, int]]]:
+        timestamps = self.timestamps
+        return {key: list(zip(timestamps, row)) for key, row in self.rows.items()}
+
+    def sums(self) -> dict[K, int]:
+        return {key: sum(row) for key, row in self.rows.items()}
+
+    def merge(self, other: SeriesMatrix[K]) -> SeriesMatrix[K]:
+        """
+        Adds up the counts of both matrices, aligning them on the union of their timestamps.
+        """
+        if self.timestamps == other.timestamps:
+            timestamps = self.timestamps
+            rows = dict(self.rows)
+            for key, row in other.rows.items():
+                existing = rows.get(key)
+                rows[key] = row[:] if existing is None else [a + b for a, b in zip(existing, row)]
+            return SeriesMatrix(timestamps, rows)
+
+        timestamps = sorted(set(self.timestamps).union(other.timestamps))
+        position = {ts: idx for idx, ts in enumerate(timestamps)}
+        rows = {}
+        for matrix in (self, other):
+            columns = [position[ts] for ts in matrix.timestamps]
+            for key, row in matrix.rows.items():
+                merged = rows.get(key)
+                if merged is None:
+                    merged = rows[key] = [0] * len(timestamps)
+                for column, count in zip(columns, row):
+                    merged[column] += count
+        return SeriesMatrix(timestamps, rows)
+
+    def rollup(self, seconds: int) -> SeriesMatrix[K]:
+        """
+        Sums counts into coarser buckets of ``seconds``. The bucket boundaries are computed once
+        for all keys.
+        """
+        timestamps: List[int] = []
+        bounds: List[Tuple[int, int]] = []
+        start = 0
+        for idx, ts in enumerate(self.timestamps):
+            bucket = ts - (ts % seconds)
+            if timestamps and timestamps[-1] == bucket:
+                continue
+            if timestamps:
+                bounds.append((start, idx))
+            timestamps.append(bucket)
+            start = idx
+        if timestamps:
+            bounds.append((start, len(self.timestamps)))
+
+        return SeriesMatrix(
+            timestamps,
+            {key: [sum(row[a:b]) for a, b in bounds] for key, row in self.rows.items()},
+        )
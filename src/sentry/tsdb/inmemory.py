@@ -3,7 +3,7 @@ from collections import Counter, defaultdict
 from django.utils import timezone
 
 from sentry.tsdb.base import BaseTSDB
-from sentry.utils.dates import to_datetime, to_timestamp
+from sentry.tsdb.columnar import SeriesMatrix
 
 
 class InMemoryTSDB(BaseTSDB):
@@ -72,32 +72,67 @@ class InMemoryTSDB(BaseTSDB):
         jitter_value=None,
         tenant_ids=None,
         referrer_suffix=None,
+    ):
+        return self.get_range_matrix(
+            model, keys, start, end, rollup, environment_ids=environment_ids
+        ).to_range()
+
+    def get_range_matrix(
+        self,
+        model,
+        keys,
+        start,
+        end,
+        rollup=None,
+        environment_ids=None,
+        use_cache=False,
+        jitter_value=None,
+        tenant_ids=None,
+        referrer_suffix=None,
     ):
         self.validate_arguments([model], environment_ids if environment_ids is not None else [None])
 
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
 
-        results = []
-        for timestamp in map(to_datetime, series):
-            norm_epoch = self.normalize_to_rollup(timestamp, rollup)
+        # Buckets are normalized once for the whole series instead of per key.
+        buckets = [self.normalize_ts_to_rollup(epoch, rollup) for epoch in series]
+        data = self.data[model]
+        empty = {}
 
-            for key in keys:
-                if not environment_ids:
-                    value = self.data[model][(key, None)][norm_epoch]
-                else:
-                    value = sum(
-                        int(self.data[model][(key, environment_id)][norm_epoch])
-                        for environment_id in environment_ids
-                    )
-                results.append((to_timestamp(timestamp), key, value))
-
-        results_by_key = defaultdict(dict)
-        for epoch, key, count in results:
-            results_by_key[key][epoch] = int(count or 0)
-
-        for key, points in results_by_key.items():
-            results_by_key[key] = sorted(points.items())
-        return dict(results_by_key)
+        rows = {}
+        for key in keys:
+            if not environment_ids:
+                source = data.get((key, None), empty)
+                rows[key] = [int(source.get(bucket) or 0) for bucket in buckets]
+            else:
+                sources = [data.get((key, env), empty) for env in environment_ids]
+                rows[key] = [
+                    sum(int(source.get(bucket) or 0) for source in sources) for bucket in buckets
+                ]
+
+        return SeriesMatrix(series, rows)
+
+    def get_sums(
+        self,
+        model,
+        keys,
+        start,
+        end,
+        rollup=None,
+        environment_id=None,
+        use_cache=False,
+        jitter_value=None,
+        tenant_ids=None,
+        referrer_suffix=None,
+    ):
+        return self.get_range_matrix(
+            model,
+            keys,
+            start,
+            end,
+            rollup,
+            environment_ids=[environment_id] if environment_id is not None else None,
+        ).sums()
 
     def record(self, model, key, values, timestamp=None, environment_id=None):
         self.validate_arguments([model], [environment_id])
@@ -26,6 +26,7 @@ from sentry.issues.grouptype import (
 )
 from sentry.models.organization import Organization
 from sentry.models.project import Project
+from sentry.spans.table import SpanTable
 
 from .types import PerformanceProblemsMap, Span
 
@@ -89,11 +90,24 @@ class PerformanceDetector(ABC):
     type: ClassVar[DetectorType]
     stored_problems: PerformanceProblemsMap
 
-    def __init__(self, settings: Dict[DetectorType, Any], event: dict[str, Any]) -> None:
+    def __init__(
+        self,
+        settings: Dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_table: Optional[SpanTable] = None,
+    ) -> None:
         self.settings = settings[self.settings_key]
         self._event = event
+        self._span_table = span_table
         self.init()
 
+    @property
+    def span_table(self) -> SpanTable:
+        """The columns of the event's spans, shared with the other detectors if passed in."""
+        if self._span_table is None:
+            self._span_table = SpanTable.from_event(self._event)
+        return self._span_table
+
     @abstractmethod
     def init(self):
         raise NotImplementedError
@@ -125,6 +139,14 @@ class PerformanceDetector(ABC):
     def settings_key(self) -> DetectorType:
         raise NotImplementedError
 
+    def is_span_op_relevant(self, op: str) -> bool:
+        """
+        Whether visiting spans with this op can affect detection. Detectors that only look at a few
+        ops override this, so that `run_detectors_on_data` does not visit them with other spans.
+        Detectors tracking sequences of spans must see every span and keep the default.
+        """
+        return True
+
     @abstractmethod
     def visit_span(self, span: Span) -> None:
         raise NotImplementedError
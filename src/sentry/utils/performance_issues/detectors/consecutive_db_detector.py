@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import re
-from datetime import timedelta
 from typing import Any, List, Mapping, Optional, Sequence
 
 from django.utils.translation import gettext_lazy as _
@@ -12,17 +11,12 @@ from sentry.issues.issue_occurrence import IssueEvidence
 from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.utils.event_frames import get_sdk_name
-from sentry.utils.performance_issues.detectors.utils import (
-    get_max_span_duration,
-    get_total_span_duration,
-)
 
 from ..base import (
     DetectorType,
     PerformanceDetector,
     fingerprint_spans,
     get_notification_attachment_body,
-    get_span_duration,
     get_span_evidence_value,
 )
 from ..performance_problem import PerformanceProblem
@@ -90,13 +84,12 @@ class ConsecutiveDBSpanDetector(PerformanceDetector):
             "consecutive_count_threshold"
         )
         exceeds_span_duration_threshold = all(
-            get_span_duration(span).total_seconds() * 1000
-            > self.settings.get("span_duration_threshold")
+            self.span_table.duration(span) > self.settings.get("span_duration_threshold")
             for span in self.independent_db_spans
         )
 
         time_saved = self._calculate_time_saved(self.independent_db_spans)
-        total_time = get_total_span_duration(self.consecutive_db_spans)
+        total_time = self.span_table.total_duration(self.consecutive_db_spans)
 
         exceeds_time_saved_threshold = time_saved >= self.settings.get("min_time_saved")
 
@@ -211,13 +204,13 @@ class ConsecutiveDBSpanDetector(PerformanceDetector):
         this is where thresholds come in
         """
         consecutive_spans = self.consecutive_db_spans
-        total_duration = get_total_span_duration(consecutive_spans)
-        max_independent_span_duration = get_max_span_duration(independent_spans)
+        total_duration = self.span_table.total_duration(consecutive_spans)
+        max_independent_span_duration = self.span_table.max_duration(independent_spans)
 
-        sum_of_dependent_span_durations = 0.0
-        for span in consecutive_spans:
-            if span not in independent_spans:
-                sum_of_dependent_span_durations += get_span_duration(span).total_seconds() * 1000
+        independent_span_ids = {id(span) for span in independent_spans}
+        sum_of_dependent_span_durations = self.span_table.total_duration(
+            span for span in consecutive_spans if id(span) not in independent_span_ids
+        )
 
         return total_duration - max(max_independent_span_duration, sum_of_dependent_span_durations)
 
@@ -225,11 +218,7 @@ class ConsecutiveDBSpanDetector(PerformanceDetector):
         if len(self.consecutive_db_spans) == 0:
             return False
 
-        last_span = self.consecutive_db_spans[-1]
-
-        last_span_ends = timedelta(seconds=last_span.get("timestamp", 0))
-        current_span_begins = timedelta(seconds=span.get("start_timestamp", 0))
-        return last_span_ends > current_span_begins
+        return self.span_table.overlaps(self.consecutive_db_spans[-1], span)
 
     def _reset_variables(self) -> None:
         self.consecutive_db_spans = []
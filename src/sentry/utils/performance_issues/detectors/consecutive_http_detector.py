@@ -6,20 +6,14 @@ from sentry.issues.issue_occurrence import IssueEvidence
 from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.utils.event import is_event_from_browser_javascript_sdk
-from sentry.utils.performance_issues.detectors.utils import (
-    get_max_span_duration,
-    get_total_span_duration,
-)
 from sentry.utils.safe import get_path
 
 from ..base import (
     DetectorType,
     PerformanceDetector,
-    does_overlap_previous_span,
     fingerprint_http_spans,
     get_duration_between_spans,
     get_notification_attachment_body,
-    get_span_duration,
     get_span_evidence_value,
 )
 from ..performance_problem import PerformanceProblem
@@ -42,8 +36,13 @@ class ConsecutiveHTTPSpanDetector(PerformanceDetector):
         if lcp_value and (lcp_unit is None or lcp_unit == "millisecond"):
             self.lcp = lcp_value
 
+        self.is_browser_event = is_event_from_browser_javascript_sdk(self.event())
+
+    def is_span_op_relevant(self, op: str) -> bool:
+        return not self.is_browser_event
+
     def visit_span(self, span: Span) -> None:
-        if is_event_from_browser_javascript_sdk(self.event()):
+        if self.is_browser_event:
             return
 
         span_id = span.get("span_id", None)
@@ -51,7 +50,7 @@ class ConsecutiveHTTPSpanDetector(PerformanceDetector):
         if not span_id or not self._is_eligible_http_span(span):
             return
 
-        span_duration = get_span_duration(span).total_seconds() * 1000
+        span_duration = self.span_table.duration(span)
         if span_duration < self.settings.get("span_duration_threshold"):
             return
 
@@ -91,8 +90,8 @@ class ConsecutiveHTTPSpanDetector(PerformanceDetector):
             self._store_performance_problem()
 
     def _calculate_time_saved(self) -> float:
-        total_time = get_total_span_duration(self.consecutive_http_spans)
-        max_span_duration = get_max_span_duration(self.consecutive_http_spans)
+        total_time = self.span_table.total_duration(self.consecutive_http_spans)
+        max_span_duration = self.span_table.max_duration(self.consecutive_http_spans)
 
         return total_time - max_span_duration
 
@@ -139,8 +138,7 @@ class ConsecutiveHTTPSpanDetector(PerformanceDetector):
     def _overlaps_last_span(self, span: Span) -> bool:
         if len(self.consecutive_http_spans) == 0:
             return False
-        last_span = self.consecutive_http_spans[-1]
-        return does_overlap_previous_span(last_span, span)
+        return self.span_table.overlaps(self.consecutive_http_spans[-1], span)
 
     def _reset_variables(self) -> None:
         self.consecutive_http_spans = []
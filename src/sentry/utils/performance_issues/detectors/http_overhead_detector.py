@@ -57,6 +57,9 @@ class HTTPOverheadDetector(PerformanceDetector):
         self.stored_problems: dict[str, PerformanceProblem] = {}
         self.location_to_indicators = defaultdict(list)
 
+    def is_span_op_relevant(self, op: str) -> bool:
+        return op == "http.client"
+
     def visit_span(self, span: Span) -> None:
         span_data = span.get("data", {})
         if not self._is_span_eligible(span) or not span_data:
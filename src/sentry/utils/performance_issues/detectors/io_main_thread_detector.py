@@ -22,7 +22,6 @@ from ..base import (
     PerformanceDetector,
     get_notification_attachment_body,
     get_span_evidence_value,
-    total_span_time,
 )
 from ..performance_problem import PerformanceProblem
 from ..types import Span
@@ -39,6 +38,9 @@ class BaseIOMainThreadDetector(PerformanceDetector):
         self.mapper = None
         self.parent_to_blocked_span = defaultdict(list)
 
+    def is_span_op_relevant(self, op: str) -> bool:
+        return op.lower().startswith(self.SPAN_PREFIX)
+
     def visit_span(self, span: Span):
         if self._is_io_on_main_thread(span) and span.get("op", "").lower().startswith(
             self.SPAN_PREFIX
@@ -51,7 +53,7 @@ class BaseIOMainThreadDetector(PerformanceDetector):
             span_list = [
                 span for span in span_list if "start_timestamp" in span and "timestamp" in span
             ]
-            total_duration = total_span_time(span_list)
+            total_duration = self.span_table.total_time(span_list)
             settings_for_span = self.settings_for_span(span_list[0])
             if not settings_for_span:
                 return
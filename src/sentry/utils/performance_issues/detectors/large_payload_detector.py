@@ -37,6 +37,9 @@ class LargeHTTPPayloadDetector(PerformanceDetector):
         self.stored_problems: dict[str, PerformanceProblem] = {}
         self.consecutive_http_spans: list[Span] = []
 
+    def is_span_op_relevant(self, op: str) -> bool:
+        return op.startswith("http")
+
     def visit_span(self, span: Span) -> None:
         if not LargeHTTPPayloadDetector._is_span_eligible(span):
             return
@@ -14,7 +14,6 @@ from sentry.issues.grouptype import PerformanceNPlusOneAPICallsGroupType
 from sentry.issues.issue_occurrence import IssueEvidence
 from sentry.models.organization import Organization
 from sentry.models.project import Project
-from sentry.utils.performance_issues.detectors.utils import get_total_span_duration
 
 from ..base import (
     DETECTOR_TYPE_TO_GROUP_TYPE,
@@ -54,6 +53,9 @@ class NPlusOneAPICallsDetector(PerformanceDetector):
         self.spans: list[Span] = []
         self.span_hashes = {}
 
+    def is_span_op_relevant(self, op: str) -> bool:
+        return op in self.settings.get("allowed_span_ops", [])
+
     def visit_span(self, span: Span) -> None:
         if not NPlusOneAPICallsDetector.is_span_eligible(span):
             return
@@ -158,7 +160,7 @@ class NPlusOneAPICallsDetector(PerformanceDetector):
         if len(self.spans) < self.settings["count"]:
             return
 
-        total_duration = get_total_span_duration(self.spans)
+        total_duration = self.span_table.total_duration(self.spans)
         if total_duration < self.settings["total_duration"]:
             return
 
@@ -15,7 +15,6 @@ from ..base import (
     PerformanceDetector,
     get_notification_attachment_body,
     get_span_evidence_value,
-    total_span_time,
 )
 from ..performance_problem import PerformanceProblem
 from ..types import Span
@@ -226,7 +225,7 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
 
     def _is_slower_than_threshold(self) -> bool:
         duration_threshold = self.settings.get("duration_threshold")
-        return total_span_time(self.n_spans) >= duration_threshold
+        return self.span_table.total_time(self.n_spans) >= duration_threshold
 
     def _contains_valid_repeating_query(self, span: Span) -> bool:
         # Make sure we at least have a space, to exclude e.g. MongoDB and
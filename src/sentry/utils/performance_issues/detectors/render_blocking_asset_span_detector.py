@@ -62,6 +62,9 @@ class RenderBlockingAssetSpanDetector(PerformanceDetector):
     def is_creation_allowed_for_project(self, project: Project) -> bool:
         return self.settings["detection_enabled"]
 
+    def is_span_op_relevant(self, op: str) -> bool:
+        return bool(self.fcp) and op in ["resource.link", "resource.script"]
+
     def visit_span(self, span: Span):
         if not self.fcp:
             return
@@ -35,6 +35,9 @@ class SlowDBQueryDetector(PerformanceDetector):
     def init(self):
         self.stored_problems = {}
 
+    def is_span_op_relevant(self, op: str) -> bool:
+        return any(self.find_span_prefix(setting, op) for setting in self.settings)
+
     def visit_span(self, span: Span):
         settings_for_span = self.settings_for_span(span)
         if not settings_for_span:
@@ -13,7 +13,6 @@ from ..base import (
     PerformanceDetector,
     fingerprint_resource_span,
     get_notification_attachment_body,
-    get_span_duration,
     get_span_evidence_value,
 )
 from ..performance_problem import PerformanceProblem
@@ -37,6 +36,9 @@ class UncompressedAssetSpanDetector(PerformanceDetector):
         self.stored_problems = {}
         self.any_compression = False
 
+    def is_span_op_relevant(self, op: str) -> bool:
+        return op in self.settings.get("allowed_span_ops")
+
     def visit_span(self, span: Span) -> None:
         op = span.get("op", None)
         description = span.get("description", "")
@@ -86,9 +88,7 @@ class UncompressedAssetSpanDetector(PerformanceDetector):
             return
 
         # Ignore assets under a certain duration threshold
-        if get_span_duration(span).total_seconds() * 1000 <= self.settings.get(
-            "duration_threshold"
-        ):
+        if self.span_table.duration(span) <= self.settings.get("duration_threshold"):
             return
 
         fingerprint = self._fingerprint(span)
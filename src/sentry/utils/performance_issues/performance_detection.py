@@ -3,7 +3,7 @@ from __future__ import annotations
 import hashlib
 import logging
 import random
-from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
 
 import sentry_sdk
 
@@ -13,6 +13,7 @@ from sentry.models.options.project_option import ProjectOption
 from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.projectoptions.defaults import DEFAULT_PROJECT_PERFORMANCE_DETECTION_SETTINGS
+from sentry.spans.table import SpanTable
 from sentry.utils import metrics
 from sentry.utils.event import is_event_from_browser_javascript_sdk
 from sentry.utils.event_frames import get_sdk_name
@@ -34,6 +35,7 @@ from .detectors.render_blocking_asset_span_detector import RenderBlockingAssetSp
 from .detectors.slow_db_query_detector import SlowDBQueryDetector
 from .detectors.uncompressed_asset_detector import UncompressedAssetSpanDetector
 from .performance_problem import PerformanceProblem
+from .types import Span
 
 PERFORMANCE_GROUP_COUNT_LIMIT = 10
 INTEGRATIONS_OF_INTEREST = [
@@ -109,7 +111,9 @@ class EventPerformanceProblem:
 
 
 # Facade in front of performance detection to limit impact of detection on our events ingestion
-def detect_performance_problems(data: dict[str, Any], project: Project) -> List[PerformanceProblem]:
+def detect_performance_problems(
+    data: dict[str, Any], project: Project, span_table: Optional[SpanTable] = None
+) -> List[PerformanceProblem]:
     try:
         rate = options.get("performance.issues.all.problem-detection")
         if rate and rate > random.random():
@@ -120,7 +124,7 @@ def detect_performance_problems(data: dict[str, Any], project: Project) -> List[
             ), sentry_sdk.start_span(
                 op="py.detect_performance_issue", description="none"
             ) as sdk_span:
-                return _detect_performance_problems(data, sdk_span, project)
+                return _detect_performance_problems(data, sdk_span, project, span_table)
     except Exception:
         logging.exception("Failed to detect performance problems")
     return []
@@ -324,19 +328,24 @@ DETECTOR_CLASSES: List[Type[PerformanceDetector]] = [
 
 
 def _detect_performance_problems(
-    data: dict[str, Any], sdk_span: Any, project: Project
+    data: dict[str, Any],
+    sdk_span: Any,
+    project: Project,
+    span_table: Optional[SpanTable] = None,
 ) -> List[PerformanceProblem]:
     event_id = data.get("event_id", None)
 
+    if span_table is None:
+        span_table = SpanTable.from_event(data)
+
     detection_settings = get_detection_settings(project.id)
     detectors: List[PerformanceDetector] = [
-        detector_class(detection_settings, data)
+        detector_class(detection_settings, data, span_table)
         for detector_class in DETECTOR_CLASSES
         if detector_class.is_detector_enabled()
     ]
 
-    for detector in detectors:
-        run_detector_on_data(detector, data)
+    run_detectors_on_data(detectors, data)
 
     # Metrics reporting only for detection, not created issues.
     report_metrics_for_detectors(data, event_id, detectors, sdk_span, project.organization)
@@ -388,6 +397,43 @@ def run_detector_on_data(detector, data):
     detector.on_complete()
 
 
+def run_detectors_on_data(detectors: Sequence[PerformanceDetector], data: dict[str, Any]) -> None:
+    """
+    Runs several detectors over the spans of an event in a single pass.
+
+    This is equivalent to calling `run_detector_on_data` for every detector, since detectors don't
+    share state. Instead of every detector walking all spans, each span is only dispatched to the
+    detectors for which its op is relevant (see `PerformanceDetector.is_span_op_relevant`). The
+    relevant detectors are looked up once per distinct op, of which events have only a handful.
+    """
+    eligible_detectors = [detector for detector in detectors if detector.is_event_eligible(data)]
+    if not eligible_detectors:
+        return
+
+    all_visitors = [detector.visit_span for detector in eligible_detectors]
+    visitors_by_op: Dict[str, List[Callable[[Span], None]]] = {}
+
+    for span in data.get("spans", []):
+        op = span.get("op")
+        if not isinstance(op, str):
+            # Detectors handle spans without an op themselves.
+            visitors = all_visitors
+        else:
+            visitors = visitors_by_op.get(op)
+            if visitors is None:
+                visitors = visitors_by_op[op] = [
+                    detector.visit_span
+                    for detector in eligible_detectors
+                    if detector.is_span_op_relevant(op)
+                ]
+
+        for visit_span in visitors:
+            visit_span(span)
+
+    for detector in eligible_detectors:
+        detector.on_complete()
+
+
 # Reports metrics and creates spans for detection
 def report_metrics_for_detectors(
     event: Event,
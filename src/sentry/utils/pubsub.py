@@ -12,3 +12,11 @@ class KafkaPublisher:
             self.producer.poll(0)
         else:
             self.producer.flush()
+
+    def publish_many(self, channel, values):
+        for value in values:
+            self.producer.produce(topic=channel, value=value)
+        if self.asynchronous:
+            self.producer.poll(0)
+        else:
+            self.producer.flush()
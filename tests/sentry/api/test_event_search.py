@@ -1,12 +1,14 @@
 import datetime
 import os
+import random
 from datetime import timedelta
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, override_settings
 from django.utils import timezone
 
+from sentry.api import event_search
 from sentry.api.event_search import (
     AggregateFilter,
     AggregateKey,
@@ -14,15 +16,30 @@ from sentry.api.event_search import (
     SearchFilter,
     SearchKey,
     SearchValue,
+    SearchVisitor,
+    SimpleTerm,
+    default_config,
+    event_search_grammar,
     parse_search_query,
+    tokenize_simple_query,
 )
+from sentry.api.issue_search import issue_search_config
 from sentry.constants import MODULE_ROOT
 from sentry.exceptions import InvalidSearchQuery
 from sentry.search.utils import parse_datetime_string, parse_duration, parse_numeric_value
 from sentry.testutils.helpers.datetime import freeze_time
+from sentry.testutils.skips import requires_pytest_benchmark
 from sentry.utils import json
 
 fixture_path = "fixtures/search-syntax"
+
+DASHBOARD_QUERIES = [
+    "event.type:transaction transaction.duration:>300ms !http.method:POST",
+    "(user.email:*@example.com OR release:[1.0,2.0]) count():>10 p95():<2s",
+    'error.handled:0 message:"connection reset" environment:production',
+]
+
+
 abs_fixtures_path = os.path.join(MODULE_ROOT, os.pardir, os.pardir, fixture_path)
 
 
@@ -634,6 +651,178 @@ class ParseSearchQueryBackendTest(SimpleTestCase):
         assert search_filter.value.value == 'a"b'
 
 
+class ParseSearchQueryCacheTest(SimpleTestCase):
+    def setUp(self):
+        event_search._parse_tree_cache.clear()
+        event_search._search_filter_cache.clear()
+
+    def test_results_are_reused(self):
+        query = "user.email:*@example.com transaction.duration:>1s release:[1.0,2.0]"
+        with patch.object(
+            event_search.event_search_grammar,
+            "parse",
+            wraps=event_search.event_search_grammar.parse,
+        ) as parse:
+            first = parse_search_query(query)
+            first[2].value.raw_value.append("3.0")
+            first.pop()
+            second = parse_search_query(query)
+        assert parse.call_count == 1
+        assert second == [
+            SearchFilter(SearchKey("user.email"), "=", SearchValue("*@example.com")),
+            SearchFilter(SearchKey("transaction.duration"), ">", SearchValue(1000.0)),
+            SearchFilter(SearchKey("release"), "IN", SearchValue(["1.0", "2.0"])),
+        ]
+
+    def test_keyed_by_config(self):
+        config = SearchConfig.create_from(event_search.default_config, numeric_keys={"foo"})
+        assert parse_search_query("foo:>5") == [
+            SearchFilter(SearchKey("foo"), "=", SearchValue(">5"))
+        ]
+        assert parse_search_query("foo:>5", config=config) == [
+            SearchFilter(SearchKey("foo"), ">", SearchValue(5))
+        ]
+        assert len(event_search._parse_tree_cache) == 1
+        assert len(event_search._search_filter_cache) == 2
+
+    def test_relative_dates_are_not_reused(self):
+        parse_search_query("time:-2w")
+        assert len(event_search._parse_tree_cache) == 1
+        assert len(event_search._search_filter_cache) == 0
+
+        now = timezone.now() + timedelta(days=1)
+        with freeze_time(now):
+            assert parse_search_query("time:-2w") == [
+                SearchFilter(SearchKey("time"), ">=", SearchValue(now - timedelta(days=14)))
+            ]
+
+    def test_builder_results_are_not_reused(self):
+        builder = MagicMock()
+        builder.get_field_type.return_value = None
+        parse_search_query("foo:[bar, baz]", builder=builder)
+        parse_search_query("foo:[bar, baz]", config_overrides={"allowed_keys": {"foo"}})
+        assert len(event_search._parse_tree_cache) == 1
+        assert len(event_search._search_filter_cache) == 0
+
+    def test_bounded(self):
+        with override_settings(SENTRY_EVENT_SEARCH_PARSE_CACHE_SIZE=2):
+            for value in "abc":
+                parse_search_query(f"foo:{value}")
+            parse_search_query("foo:b")
+            parse_search_query("foo:d")
+        assert [key for key, _ in event_search._search_filter_cache._data] == ["foo:b", "foo:d"]
+
+        with override_settings(SENTRY_EVENT_SEARCH_PARSE_CACHE_SIZE=0):
+            parse_search_query("foo:e")
+        assert len(event_search._search_filter_cache) == 2
+
+    def test_invalid_queries(self):
+        for _ in range(2):
+            with pytest.raises(InvalidSearchQuery):
+                parse_search_query("(foo:bar")
+            with pytest.raises(InvalidSearchQuery):
+                parse_search_query("transaction.duration:>1x")
+        assert len(event_search._search_filter_cache) == 0
+
+
+# Terms that do, and terms that don't, fit the subset of queries `tokenize_simple_query` reads.
+SIMPLE_QUERY_TERMS = [
+    *("is:unresolved", "is:resolved", "!is:ignored", "is:foo", "is:true", 'is:"x"', "is:[a]"),
+    *("has:user.email", "!has:foo", "has:true", "has:1abc", "has:a@b", "has:a-b", 'has:"x"'),
+    *("assigned:me", "bookmarks:me", "level:error", "!level:error", "firstRelease:latest"),
+    *("release:1.0", "release:v1.0", "environment:production", "user.email:*@example.com"),
+    *('message:"foo bar"', 'message:"a\\"b"', 'message:""', 'x:"y\\"', 'x:"y\\\\"', "x:y\\"),
+    *("a:b:c", "url:http://x.y/z?q=1", "timestamp:foo", "project_id:abc", "error.handled:true"),
+    *("error.handled:maybe", "key:TRUE", "key:False", "a:!b", "a:-b", "a:+b", "a:.5", "a:*"),
+    *("x:", ":x", "!:x", "!!a:b", "a!:b", "é:b", "a:é", 'a:b"', '"k":v', 'x:\\"y', "a:b)", "a:(b"),
+    *("foo", "bar", "!baz", "-foo", "*", "a@b", "!", "!!", "OR", "and", "ORx", '"quoted free"'),
+    *("tags[foo]:bar", "assigned:[me]", "count():>1", "transaction.duration:>1s", "age:-24h"),
+    "a\tb:c",
+]
+
+
+def parse_with_grammar(query, config):
+    try:
+        return SearchVisitor(config).visit(event_search_grammar.parse(query))
+    except Exception as e:
+        return type(e), str(e)
+
+
+def parse_simple(query, config):
+    terms = tokenize_simple_query(query)
+    if terms is None:
+        return None
+    try:
+        return SearchVisitor(config).visit_simple_terms(terms)
+    except Exception as e:
+        return type(e), str(e)
+
+
+def fixture_queries():
+    for file in sorted(os.listdir(abs_fixtures_path)):
+        with open(os.path.join(abs_fixtures_path, file)) as fp:
+            yield from (case["query"] for case in json.load(fp))
+
+
+SIMPLE_QUERY_CONFIGS = [
+    default_config,
+    issue_search_config,
+    SearchConfig.create_from(default_config, allowed_keys={"a", "has", "foo"}, blocked_keys={"x"}),
+]
+
+
+@freeze_time()
+@pytest.mark.parametrize("config", SIMPLE_QUERY_CONFIGS)
+def test_simple_query_matches_grammar(config):
+    rng = random.Random(0)
+    queries = [*SIMPLE_QUERY_TERMS, *fixture_queries()]
+    for _ in range(3000):
+        terms = rng.choices(SIMPLE_QUERY_TERMS, k=rng.randint(0, 4))
+        query = (" " * rng.randint(1, 2)).join(terms)
+        queries.append(" " * rng.randint(0, 1) + query + " " * rng.randint(0, 1))
+
+    simple = 0
+    for query in queries:
+        result = parse_simple(query, config)
+        if result is not None:
+            simple += 1
+            assert result == parse_with_grammar(query, config), query
+    # Make sure the corpus covers both paths.
+    assert len(queries) / 4 < simple < len(queries)
+
+
+@pytest.mark.parametrize(
+    "query,terms",
+    [
+        ("", []),
+        ("is:unresolved", [SimpleTerm(False, "is", "unresolved")]),
+        (
+            " is:unresolved  !assigned:me ",
+            [SimpleTerm(False, "is", "unresolved"), SimpleTerm(True, "assigned", "me")],
+        ),
+        (
+            'foo  bar level:error "x":y',
+            None,
+        ),
+        (
+            'foo  bar level:error message:"a \\"b\\" c" baz',
+            [
+                SimpleTerm(False, None, "foo  bar"),
+                SimpleTerm(False, "level", "error"),
+                SimpleTerm(False, "message", 'a "b" c'),
+                SimpleTerm(False, None, "baz"),
+            ],
+        ),
+        ("release:1.0", None),
+        ("a:b OR c:d", None),
+        ("(a:b)", None),
+        ("has:true", None),
+    ],
+)
+def test_tokenize_simple_query(query, terms):
+    assert tokenize_simple_query(query) == terms
+
+
 @pytest.mark.parametrize(
     "raw,result",
     [
@@ -705,3 +894,14 @@ def test_search_value_to_query_string(value, expected_query_string):
     actual = search_value.to_query_string()
 
     assert actual == expected_query_string
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("cache_size", [0, 1000])
+def test_benchmark_parse_dashboard_queries(cache_size, benchmark):
+    def parse():
+        for query in DASHBOARD_QUERIES:
+            parse_search_query(query)
+
+    with override_settings(SENTRY_EVENT_SEARCH_PARSE_CACHE_SIZE=cache_size):
+        benchmark(parse)
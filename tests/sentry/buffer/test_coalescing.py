@@ -0,0 +1,144 @@
+from unittest import mock
+
+import pytest
+
+from sentry.buffer.coalescing import IncrCoalescer
+from sentry.models.group import Group
+from sentry.models.project import Project
+
+
+def test_merges_increments_per_key():
+    flush_func = mock.Mock()
+    coalescer = IncrCoalescer(flush_func, window=60, max_increments=100, max_keys=100)
+
+    coalescer.incr(Group, {"times_seen": 1}, {"id": 1}, {"last_seen": 1})
+    coalescer.incr(Group, {"times_seen": 1}, {"id": 1}, {"last_seen": 2})
+    coalescer.incr(Group, {"times_seen": 3}, {"id": 2})
+    coalescer.incr(Project, {}, {"id": 1}, signal_only=True)
+    assert not flush_func.called
+
+    coalescer.flush()
+    flush_func.assert_called_once_with(
+        [
+            (Group, {"times_seen": 2}, {"id": 1}, {"last_seen": 2}, None),
+            (Group, {"times_seen": 3}, {"id": 2}, None, None),
+            (Project, {}, {"id": 1}, None, True),
+        ]
+    )
+
+    flush_func.reset_mock()
+    coalescer.flush()
+    assert not flush_func.called
+
+
+def test_flushes_on_increment_threshold():
+    flush_func = mock.Mock()
+    coalescer = IncrCoalescer(flush_func, window=60, max_increments=3, max_keys=100)
+
+    for _ in range(3):
+        coalescer.incr(Group, {"times_seen": 1}, {"id": 1})
+
+    flush_func.assert_called_once_with([(Group, {"times_seen": 3}, {"id": 1}, None, None)])
+
+
+def test_flushes_on_key_threshold():
+    flush_func = mock.Mock()
+    coalescer = IncrCoalescer(flush_func, window=60, max_increments=100, max_keys=2)
+
+    coalescer.incr(Group, {"times_seen": 1}, {"id": 1})
+    assert not flush_func.called
+    coalescer.incr(Group, {"times_seen": 1}, {"id": 2})
+    assert flush_func.call_count == 1
+    assert len(flush_func.call_args[0][0]) == 2
+
+
+def test_window_expiry():
+    flush_func = mock.Mock()
+    coalescer = IncrCoalescer(flush_func, window=10, max_increments=100, max_keys=100)
+
+    with mock.patch("time.monotonic", return_value=100):
+        coalescer.incr(Group, {"times_seen": 1}, {"id": 1})
+    with mock.patch("time.monotonic", return_value=105):
+        assert not coalescer._window_expired()
+    with mock.patch("time.monotonic", return_value=110):
+        assert coalescer._window_expired()
+
+
+def test_close_flushes_pending():
+    flush_func = mock.Mock()
+    coalescer = IncrCoalescer(flush_func, window=60, max_increments=100, max_keys=100)
+
+    coalescer.incr(Group, {"times_seen": 1}, {"id": 1})
+    coalescer.close()
+    flush_func.assert_called_once_with([(Group, {"times_seen": 1}, {"id": 1}, None, None)])
+
+
+def test_unhashable_filters_pass_through():
+    flush_func = mock.Mock()
+    coalescer = IncrCoalescer(flush_func, window=60, max_increments=100, max_keys=100)
+
+    coalescer.incr(Group, {"times_seen": 1}, {"id": [1]})
+    flush_func.assert_called_once_with([(Group, {"times_seen": 1}, {"id": [1]}, None, None)])
+
+
+def test_failed_flush_is_retried():
+    flushed = []
+
+    def flush_func(items):
+        if not flushed:
+            flushed.append(None)
+            raise Exception("buffer unavailable")
+        flushed.append(
+            [
+                (model, dict(columns), filters, extra, signal_only)
+                for model, columns, filters, extra, signal_only in items
+            ]
+        )
+
+    coalescer = IncrCoalescer(flush_func, window=60, max_increments=100, max_keys=100)
+
+    coalescer.incr(Group, {"times_seen": 1}, {"id": 1}, {"last_seen": 1})
+    coalescer.flush()
+    coalescer.incr(Group, {"times_seen": 2}, {"id": 1}, {"last_seen": 2})
+    coalescer.incr(Group, {"times_seen": 1}, {"id": 2})
+    coalescer.flush()
+
+    assert flushed[1] == [
+        (Group, {"times_seen": 3}, {"id": 1}, {"last_seen": 2}, None),
+        (Group, {"times_seen": 1}, {"id": 2}, None, None),
+    ]
+
+
+def test_failed_flush_backs_off_and_caps_pending_keys():
+    flush_func = mock.Mock(side_effect=Exception("buffer unavailable"))
+    coalescer = IncrCoalescer(flush_func, window=60, max_increments=100, max_keys=2)
+
+    coalescer.incr(Group, {"times_seen": 1}, {"id": 1})
+    coalescer.incr(Group, {"times_seen": 1}, {"id": 2})
+    assert flush_func.call_count == 1
+
+    # While backing off, pending keys still merge, new keys go straight to the buffer.
+    coalescer.incr(Group, {"times_seen": 1}, {"id": 1})
+    assert flush_func.call_count == 1
+    with pytest.raises(Exception):
+        coalescer.incr(Group, {"times_seen": 1}, {"id": 3})
+    assert flush_func.call_count == 2
+    assert flush_func.call_args[0][0] == [(Group, {"times_seen": 1}, {"id": 3}, None, None)]
+
+    # A requeue drops what doesn't fit next to the increments merged in the meantime.
+    with mock.patch("sentry.buffer.coalescing.metrics") as metrics:
+        coalescer.flush_func = mock.Mock(side_effect=Exception("buffer unavailable"))
+        with coalescer._lock:
+            pending = coalescer._pending
+            coalescer._pending = {}
+        coalescer.incr(Group, {"times_seen": 1}, {"id": 4})
+        coalescer.incr(Group, {"times_seen": 1}, {"id": 5})
+        coalescer._requeue(pending, 3)
+    metrics.incr.assert_any_call("buffer.coalesce.dropped", amount=2, skip_internal=True)
+    assert len(coalescer._pending) == 2
+
+    flush_func = mock.Mock()
+    coalescer.flush_func = flush_func
+    coalescer.flush()
+    assert flush_func.call_count == 1
+    assert not coalescer._backing_off()
@@ -10,6 +10,7 @@ from sentry.buffer.redis import RedisBuffer
 from sentry.models.group import Group
 from sentry.models.project import Project
 from sentry.testutils.helpers.datetime import freeze_time
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils import json
 
@@ -189,6 +190,22 @@ class TestRedisBuffer:
         else:
             assert pending == [key.encode("utf-8")]
 
+    def test_incr_many(self):
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        self.buf.incr_many(
+            [
+                (model, {"times_seen": 1}, {"pk": 1}, None, None),
+                (model, {"times_seen": 2}, {"pk": 2}, None, None),
+                (model, {"times_seen": 3}, {"pk": 1}, None, None),
+            ]
+        )
+        assert self.buf.get(model, ["times_seen"], filters={"pk": 1}) == {"times_seen": 4}
+        assert self.buf.get(model, ["times_seen"], filters={"pk": 2}) == {"times_seen": 2}
+
+        client = self.buf.get_routing_client()
+        assert len(client.zrange("b:p", 0, -1)) == 2
+
     @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
     @mock.patch("sentry.buffer.redis.process_incr")
     @mock.patch("sentry.buffer.redis.process_pending")
@@ -258,6 +275,77 @@ class TestRedisBuffer:
         self.buf.process("foo")
         process.assert_called_once_with(mock.Mock, {"times_seen": 1}, {"pk": 1}, {}, True)
 
+    @mock.patch("sentry.buffer.base.Buffer.process_batch")
+    def test_process_batch_keys_bulk(self, process_batch):
+        client = self.buf.get_routing_client()
+        client.hmset(
+            "foo", {"f": '{"pk": ["i","1"]}', "i+times_seen": "2", "m": "sentry.models.Group"}
+        )
+        client.hmset(
+            "bar", {"f": '{"pk": ["i","2"]}', "i+times_seen": "3", "m": "sentry.models.Group"}
+        )
+        with override_options({"buffer.process-incr-bulk": True}):
+            self.buf.process(batch_keys=["foo", "bar", "baz"])
+
+        process_batch.assert_called_once_with(
+            [
+                (Group, {"times_seen": 2}, {"pk": 1}, {}, None),
+                (Group, {"times_seen": 3}, {"pk": 2}, {}, None),
+            ]
+        )
+        assert client.hgetall("foo") == {}
+        assert client.hgetall("bar") == {}
+        assert client.get("l:foo") is None
+
+    @mock.patch("sentry.buffer.base.Buffer.process_batch")
+    def test_process_batch_keys_bulk_skips_locked(self, process_batch):
+        client = self.buf.get_routing_client()
+        client.hmset(
+            "foo", {"f": '{"pk": ["i","1"]}', "i+times_seen": "2", "m": "sentry.models.Group"}
+        )
+        client.set("l:bar", "1")
+        with override_options({"buffer.process-incr-bulk": True}):
+            self.buf.process(batch_keys=["foo", "bar"])
+
+        process_batch.assert_called_once_with([(Group, {"times_seen": 2}, {"pk": 1}, {}, None)])
+        assert client.get("l:bar") is not None
+
+    def test_pop_many_reads_and_deletes_in_transaction(self):
+        if self.buf.is_redis_cluster:
+            pytest.skip("redis cluster pipelines are not transactional")
+
+        client = self.buf.get_routing_client()
+        client.hmset(
+            "foo", {"f": '{"pk": ["i","1"]}', "i+times_seen": "2", "m": "sentry.models.Group"}
+        )
+        local_client = self.buf.cluster.get_local_client(0)
+        with mock.patch.object(
+            self.buf.cluster, "get_local_client", return_value=local_client
+        ), mock.patch.object(local_client, "pipeline", wraps=local_client.pipeline) as pipeline:
+            assert self.buf._pop_many(["foo"])[0]
+        pipeline.assert_called_once_with(transaction=True)
+        assert client.hgetall("foo") == {}
+
+    @django_db_all
+    @freeze_time()
+    def test_group_bulk_update(self, factories, default_project, task_runner):
+        groups = [factories.create_group(project=default_project) for _ in range(3)]
+        orig_times_seen = {group.id: group.times_seen for group in groups}
+        now = timezone.now()
+        for i, group in enumerate(groups):
+            self.buf.incr(Group, {"times_seen": i + 1}, {"id": group.id}, {"last_seen": now})
+
+        with override_options({"buffer.process-incr-bulk": True}), task_runner(), mock.patch(
+            "sentry.buffer", self.buf
+        ):
+            self.buf.incr_batch_size = 5
+            self.buf.process_pending()
+
+        for i, group in enumerate(groups):
+            cached = Group.objects.get_from_cache(id=group.id)
+            assert cached.times_seen == orig_times_seen[group.id] + i + 1
+            assert cached.last_seen == now
+
 
 #    @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
 #    def test_incr_uses_signal_only(self):
@@ -1,15 +1,23 @@
 from unittest.mock import patch
 
+import pytest
 from django.db import IntegrityError
 
 from sentry.data_export.base import ExportQueryType
-from sentry.data_export.models import ExportedData
-from sentry.data_export.tasks import assemble_download, merge_export_blobs
+from sentry.data_export.models import ExportedData, ExportedDataBlob
+from sentry.data_export.tasks import (
+    assemble_download,
+    iter_export_pages,
+    merge_export_blobs,
+    store_export_chunk_as_blob,
+)
 from sentry.exceptions import InvalidSearchQuery
 from sentry.models.files.file import File
+from sentry.models.files.fileblob import FileBlob
 from sentry.search.events.constants import TIMEOUT_ERROR_MESSAGE
 from sentry.testutils.cases import SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.silo import region_silo_test
 from sentry.utils.samples import load_data
 from sentry.utils.snuba import (
@@ -29,6 +37,42 @@ from sentry.utils.snuba import (
 )
 
 
+class FakeProcessor:
+    def __init__(self, row_count):
+        self.rows = [{"value": i} for i in range(row_count)]
+        self.calls = []
+
+    def get_serialized_data(self, limit, offset):
+        self.calls.append((limit, offset))
+        return self.rows[offset : offset + limit]
+
+
+@pytest.mark.parametrize(
+    "row_count,export_limit,expected_calls",
+    [
+        (5, 100, [(2, 0), (2, 2), (2, 4)]),
+        (4, 100, [(2, 0), (2, 2), (2, 4)]),
+        (5, 3, [(2, 0), (1, 2)]),
+        (0, 100, [(2, 0)]),
+    ],
+)
+def test_iter_export_pages(row_count, export_limit, expected_calls):
+    processor = FakeProcessor(row_count)
+    data_export = ExportedData(query_type=ExportQueryType.ISSUES_BY_TAG)
+    pages = iter_export_pages(processor, data_export, export_limit, 2, 0)
+
+    # pages are only queried as they are consumed
+    assert not processor.calls
+    offsets = []
+    rows = []
+    for offset, page in pages:
+        offsets.append(offset)
+        rows.extend(page)
+    assert processor.calls == expected_calls
+    assert rows == processor.rows[: min(row_count, export_limit)]
+    assert offsets == [min(i + 2, len(rows)) for i in range(0, len(rows), 2)]
+
+
 @region_silo_test
 class AssembleDownloadTest(TestCase, SnubaTestCase):
     def setUp(self):
@@ -610,6 +654,94 @@ class AssembleDownloadTest(TestCase, SnubaTestCase):
 
         assert emailer.called
 
+    @override_options({"data-export.streaming": True})
+    @patch("sentry.data_export.tasks.merge_export_blobs")
+    @patch("sentry.data_export.tasks.assemble_download.apply_async")
+    def test_discover_streaming(self, apply_async, merge_export_blobs):
+        de = ExportedData.objects.create(
+            user_id=self.user.id,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={"project": [self.project.id], "field": ["title"], "query": ""},
+        )
+        assemble_download(de.id, batch_size=1)
+
+        # all pages are exported by a single task
+        assert not apply_async.called
+        merge_export_blobs.delay.assert_called_once_with(de.id)
+        contents = b""
+        for export_blob in ExportedDataBlob.objects.filter(data_export=de).order_by("offset"):
+            assert export_blob.offset == len(contents)
+            with FileBlob.objects.get(id=export_blob.blob_id).getfile() as f:
+                contents += f.read()
+        header, raw1, raw2, raw3 = contents.strip().split(b"\r\n")
+        assert header == b"title"
+        assert raw1.startswith(b"<unlabeled event>")
+        assert raw2.startswith(b"<unlabeled event>")
+        assert raw3.startswith(b"<unlabeled event>")
+
+    @patch("sentry.data_export.tasks.store_export_chunk_as_blob", wraps=store_export_chunk_as_blob)
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_streaming_flushes_pages(self, emailer, store_export_chunk):
+        de = ExportedData.objects.create(
+            user_id=self.user.id,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={"project": [self.project.id], "field": ["title"], "query": ""},
+        )
+        with patch("sentry.data_export.tasks.DEFAULT_BLOB_SIZE", 19), self.tasks():
+            assemble_download(de.id, batch_size=1, streaming=True)
+
+        # every row fills a blob, so the output is stored after each page
+        assert store_export_chunk.call_count == 3
+        de = ExportedData.objects.get(id=de.id)
+        with de._get_file().getfile() as f:
+            header, raw1, raw2, raw3 = f.read().strip().split(b"\r\n")
+        assert header == b"title"
+        assert raw3.startswith(b"<unlabeled event>")
+        assert emailer.called
+
+    @patch("sentry.data_export.tasks.MAX_FILE_SIZE", 55)
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_streaming_file_too_large(self, emailer):
+        de = ExportedData.objects.create(
+            user_id=self.user.id,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={"project": [self.project.id], "field": ["title"], "query": ""},
+        )
+        with patch("sentry.data_export.tasks.DEFAULT_BLOB_SIZE", 10), self.tasks():
+            assemble_download(de.id, batch_size=1, streaming=True)
+        de = ExportedData.objects.get(id=de.id)
+        # the page that exceeds MAX_FILE_SIZE and everything after it is dropped
+        with de._get_file().getfile() as f:
+            header, raw1, raw2 = f.read().strip().split(b"\r\n")
+        assert header == b"title"
+        assert emailer.called
+
+    @patch("sentry.search.events.builder.discover.raw_snql_query")
+    @patch("sentry.data_export.tasks.assemble_download.apply_async")
+    def test_discover_streaming_resumes_from_checkpoint(self, apply_async, mock_query):
+        de = ExportedData.objects.create(
+            user_id=self.user.id,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={"project": [self.project.id], "field": ["title"], "query": ""},
+        )
+        mock_query.side_effect = [
+            {"data": [{"title": "a"}], "meta": [{"name": "title", "type": "String"}]},
+            {"data": [{"title": "b"}], "meta": [{"name": "title", "type": "String"}]},
+            QueryMemoryLimitExceeded("test"),
+        ]
+        with patch("sentry.data_export.tasks.DEFAULT_BLOB_SIZE", 3):
+            assemble_download(de.id, batch_size=1, streaming=True)
+
+        kwargs = apply_async.call_args[1]["kwargs"]
+        assert kwargs["offset"] == 2
+        assert kwargs["bytes_written"] == len(b"title\r\na\r\nb\r\n")
+        assert kwargs["streaming"] is True
+        assert ExportedDataBlob.objects.filter(data_export=de).count() == 5
+
 
 @region_silo_test
 class AssembleDownloadLargeTest(TestCase, SnubaTestCase):
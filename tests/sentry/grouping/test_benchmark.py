@@ -1,22 +1,17 @@
 import pytest
+from django.test import override_settings
 
-from sentry.grouping.api import get_default_grouping_config_dict
+from sentry.grouping.api import get_default_grouping_config_dict, load_grouping_config
+from sentry.grouping.component import GroupingComponent
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
+from sentry.stacktraces.processing import find_stacktraces_in_data
+from sentry.testutils.skips import requires_pytest_benchmark
 from tests.sentry.grouping import grouping_input as grouping_inputs
 
 CONFIGS = {key: get_default_grouping_config_dict(key) for key in sorted(CONFIGURATIONS.keys())}
 
 
-def benchmark_available() -> bool:
-    try:
-        __import__("pytest_benchmark")
-    except ModuleNotFoundError:
-        return False
-    else:
-        return True
-
-
-@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@requires_pytest_benchmark
 @pytest.mark.parametrize(
     "config_name", sorted(CONFIGURATIONS.keys()), ids=lambda x: x.replace("-", "_")
 )
@@ -37,3 +32,23 @@ def run_configuration(grouping_input, config):
     event.project = None
 
     event.get_hashes()
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("compiled", [False, True], ids=["legacy", "compiled"])
+def test_benchmark_enhancements(compiled, benchmark):
+    enhancements = load_grouping_config(get_default_grouping_config_dict()).enhancements
+    stacktraces = []
+    for grouping_input in grouping_inputs:
+        for info in find_stacktraces_in_data(grouping_input.data):
+            stacktraces.append((info.get_frames(), info.platforms, info.container))
+
+    def run():
+        for frames, platforms, container in stacktraces:
+            platform = next(iter(platforms), None) or "other"
+            enhancements.assemble_stacktrace_component(
+                [GroupingComponent(id="frame") for _ in frames], frames, platform, container
+            )
+
+    with override_settings(SENTRY_GROUPING_COMPILED_ENHANCEMENTS=compiled):
+        benchmark(run)
@@ -3,9 +3,11 @@ from __future__ import annotations
 from typing import Any
 
 import pytest
+from django.test import override_settings
 
 from sentry.grouping.component import GroupingComponent
-from sentry.grouping.enhancer import Enhancements
+from sentry.grouping.enhancer import ENHANCEMENT_BASES, Enhancements
+from sentry.grouping.enhancer.compiled import CompiledRules
 from sentry.grouping.enhancer.exceptions import InvalidEnhancerConfig
 from sentry.grouping.enhancer.matchers import create_match_frame
 
@@ -448,3 +450,79 @@ def test_app_no_matches(frame):
     enhancements = Enhancements.from_config_string("app:no +app")
     enhancements.apply_modifications_to_frame([frame], "native", None)
     assert frame.get("in_app")
+
+
+def _compiled_matching_frame_actions(rules, frames, platform, exception_data=None):
+    match_frames = [create_match_frame(frame, platform) for frame in frames]
+    return [
+        (rule.matcher_description, idx, str(action))
+        for rule, idx, action in CompiledRules(rules).iter_matching_frame_actions(
+            match_frames, platform, exception_data, {}
+        )
+    ]
+
+
+def _legacy_matching_frame_actions(rules, frames, platform, exception_data=None):
+    match_frames = [create_match_frame(frame, platform) for frame in frames]
+    return [
+        (rule.matcher_description, idx, str(action))
+        for rule in rules
+        for idx, action in rule.get_matching_frame_actions(
+            match_frames, platform, exception_data, {}
+        )
+    ]
+
+
+@pytest.mark.parametrize("base", sorted(ENHANCEMENT_BASES))
+@pytest.mark.parametrize("platform", ["native", "javascript", "python", "java"])
+def test_compiled_rules_match_legacy(base, platform):
+    enhancements = Enhancements.from_config_string(
+        """
+        function:foo                                 +app
+        family:native function:bar                   -group
+        family:javascript module:react-dom           -app
+        !function:main | [ function:start* ]         ^-group
+        [ module:std::* ] | function:panic           +app
+        path:**/node_modules/**                      -app
+        error.type:ValueError function:baz           category=internals
+        """,
+        bases=[base],
+    )
+    frames = [
+        {"function": "main", "module": "std::rt", "abs_path": "/src/main.rs"},
+        {"function": "start_thread", "package": "/usr/lib/libc.so"},
+        {"function": "foo", "module": "react-dom", "abs_path": "/app/node_modules/x.js"},
+        {"function": "bar", "platform": "native", "module": "std::panicking"},
+        {"function": "panic", "module": "app"},
+        {"function": "baz", "in_app": True, "filename": "app/baz.py"},
+        {"function": "__cxa_throw", "package": "libc++abi.dylib"},
+        {"function": "invariant", "abs_path": "webpack:///./~/react-dom/lib/invariant.js"},
+    ]
+    exception_data = {"type": "ValueError", "value": "oops"}
+    rules = list(enhancements.iter_rules())
+
+    assert _compiled_matching_frame_actions(
+        rules, frames, platform, exception_data
+    ) == _legacy_matching_frame_actions(rules, frames, platform, exception_data)
+
+
+def test_compiled_rules_see_modifications():
+    # `app:` is re-evaluated after earlier rules changed `in_app`
+    enhancements = Enhancements.from_config_string(
+        """
+        function:foo        +app
+        app:yes             category=mine
+        """
+    )
+    frames = [{"function": "foo"}, {"function": "bar"}]
+    with override_settings(SENTRY_GROUPING_COMPILED_ENHANCEMENTS=True):
+        enhancements.apply_modifications_to_frame(frames, "python", None)
+
+    assert frames[0]["in_app"] is True
+    assert frames[0]["data"]["category"] == "mine"
+    assert "data" not in frames[1]
+
+
+def test_loads_is_cached():
+    dumped = Enhancements.from_config_string("function:foo +app").dumps()
+    assert Enhancements.loads(dumped) is Enhancements.loads(dumped)
@@ -12,12 +12,15 @@ from jsonschema import ValidationError
 from sentry import eventstore
 from sentry.eventstore.snuba.backend import SnubaEventStorage
 from sentry.issues.grouptype import PerformanceSlowDBQueryGroupType, ProfileFileIOGroupType
+from sentry.issues.ingest import save_issue_from_stored_occurrence
 from sentry.issues.issue_occurrence import IssueOccurrence
 from sentry.issues.occurrence_consumer import (
     EventLookupError,
     InvalidEventPayloadError,
     _get_kwargs,
     _process_message,
+    _process_message_batch,
+    save_event_from_occurrence,
 )
 from sentry.models.group import Group
 from sentry.receivers import create_default_projects
@@ -167,6 +170,77 @@ class IssueOccurrenceProcessMessageTest(IssueOccurrenceTestBase):
         assert Group.objects.filter(grouphash__hash=occurrence.fingerprint[0]).exists()
 
 
+class IssueOccurrenceProcessMessageBatchTest(IssueOccurrenceTestBase):
+    @django_db_all
+    def test_batch(self) -> None:
+        other_project = self.create_project(organization=self.organization)
+        messages = [
+            get_test_message(self.project.id),
+            get_test_message(self.project.id),
+            get_test_message(other_project.id),
+            get_test_message(self.project.id, fingerprint=["other"]),
+        ]
+        with self.feature("organizations:profile-file-io-main-thread-ingest"):
+            _process_message_batch(messages)
+
+        for message in messages:
+            fetched_occurrence = IssueOccurrence.fetch(
+                uuid.UUID(message["id"]).hex, message["project_id"]
+            )
+            assert fetched_occurrence is not None
+            assert fetched_occurrence.event_id == message["event_id"]
+
+        # occurrences with the same project and fingerprint end up in the same group
+        assert Group.objects.filter(project=self.project).count() == 2
+        assert Group.objects.filter(project=other_project).count() == 1
+
+    @django_db_all
+    def test_batch_skips_invalid_messages(self) -> None:
+        messages = [
+            get_test_message(self.project.id, type=300),
+            get_test_message(self.project.id, include_event=False),
+            get_test_message(self.project.id),
+        ]
+        with self.feature("organizations:profile-file-io-main-thread-ingest"):
+            _process_message_batch(messages)
+
+        assert IssueOccurrence.fetch(uuid.UUID(messages[0]["id"]).hex, self.project.id) is None
+        assert IssueOccurrence.fetch(uuid.UUID(messages[1]["id"]).hex, self.project.id) is None
+        assert IssueOccurrence.fetch(uuid.UUID(messages[2]["id"]).hex, self.project.id) is not None
+
+    @django_db_all
+    def test_batch_matches_single_messages(self) -> None:
+        messages = [get_test_message(self.project.id) for _ in range(3)]
+        with self.feature("organizations:profile-file-io-main-thread-ingest"):
+            _process_message(messages[0])
+            with mock.patch(
+                "sentry.issues.occurrence_consumer.save_issue_from_stored_occurrence",
+                wraps=save_issue_from_stored_occurrence,
+            ) as save_issue:
+                _process_message_batch(messages[1:])
+
+        assert Group.objects.filter(project=self.project).count() == 1
+        # only the first occurrence of an issue uses the grouphashes fetched for the batch
+        assert [call.args[2] is not None for call in save_issue.call_args_list] == [True, False]
+
+    @django_db_all
+    def test_batch_falls_back_to_single_messages(self) -> None:
+        messages = [get_test_message(self.project.id) for _ in range(2)]
+        with self.feature("organizations:profile-file-io-main-thread-ingest"), mock.patch.object(
+            IssueOccurrence, "save_many", side_effect=Exception("nodestore unavailable")
+        ), mock.patch(
+            "sentry.issues.occurrence_consumer.save_event_from_occurrence",
+            wraps=save_event_from_occurrence,
+        ) as save_event:
+            _process_message_batch(messages)
+
+        for message in messages:
+            assert IssueOccurrence.fetch(uuid.UUID(message["id"]).hex, self.project.id)
+        assert Group.objects.filter(project=self.project).count() == 1
+        # Events saved by the batch are not saved again
+        assert save_event.call_count == 2
+
+
 class IssueOccurrenceLookupEventIdTest(IssueOccurrenceTestBase):
     def test_lookup_event_doesnt_exist(self) -> None:
         message = get_test_message(self.project.id, include_event=False)
@@ -1,9 +1,11 @@
+import time
 import uuid
 from datetime import datetime, timedelta
 from typing import Any, Optional
 from unittest import mock
 
 import msgpack
+import pytest
 from arroyo.backends.kafka import KafkaPayload
 from arroyo.types import BrokerValue, Message, Partition, Topic
 from django.conf import settings
@@ -12,7 +14,10 @@ from django.test.utils import override_settings
 from sentry import killswitches
 from sentry.db.models import BoundedPositiveIntegerField
 from sentry.monitors.constants import TIMEOUT
-from sentry.monitors.consumers.monitor_consumer import StoreMonitorCheckInStrategyFactory
+from sentry.monitors.consumers.monitor_consumer import (
+    StoreMonitorCheckInStrategyFactory,
+    _process_checkin_group,
+)
 from sentry.monitors.models import (
     CheckInStatus,
     Monitor,
@@ -24,6 +29,7 @@ from sentry.monitors.models import (
     ScheduleType,
 )
 from sentry.testutils.cases import TestCase
+from sentry.testutils.skips import requires_pytest_benchmark
 from sentry.utils import json
 from sentry.utils.locking.manager import LockManager
 from sentry.utils.services import build_instance_from_options
@@ -598,3 +604,117 @@ class MonitorConsumerTest(TestCase):
             assert MonitorCheckIn.objects.filter(guid=self.guid).exists()
             logger.exception.assert_called_with("Failed to trigger monitor tasks", exc_info=True)
             try_monitor_tasks_trigger.side_effect = None
+
+
+def make_checkin_message(
+    monitor_slug: str, check_in_id: str, ts: datetime, offset: int, partition: Partition
+) -> Message[KafkaPayload]:
+    payload = {"monitor_slug": monitor_slug, "status": "ok", "check_in_id": check_in_id}
+    wrapper = {
+        "message_type": "check_in",
+        "start_time": ts.timestamp(),
+        "project_id": 1,
+        "payload": json.dumps(payload),
+        "sdk": "test/1.0",
+    }
+    return Message(
+        BrokerValue(KafkaPayload(b"fake-key", msgpack.packb(wrapper), []), partition, offset, ts)
+    )
+
+
+@mock.patch("sentry.monitors.consumers.monitor_consumer.try_monitor_tasks_trigger")
+@mock.patch("sentry.monitors.consumers.monitor_consumer._process_checkin")
+def test_parallel_preserves_monitor_order(process_checkin, try_monitor_tasks_trigger):
+    processed = []
+
+    def record(params, *args):
+        time.sleep(0.001)
+        processed.append((params["monitor_slug"], int(params["check_in_id"])))
+
+    process_checkin.side_effect = record
+
+    commit = mock.Mock()
+    partition = Partition(Topic("test"), 0)
+    factory = StoreMonitorCheckInStrategyFactory(mode="parallel", max_batch_size=40, max_workers=4)
+    strategy = factory.create_with_partitions(commit, {partition: 0})
+
+    ts = datetime.now().replace(second=0, microsecond=0)
+    for i in range(40):
+        # Both slugs are normalized to the same monitor
+        monitor_slug = f"Monitor {i % 4}" if i % 2 else f"monitor-{i % 4}"
+        strategy.submit(make_checkin_message(monitor_slug, str(i), ts, i, partition))
+        if i < 39:
+            assert not commit.called
+
+    strategy.poll()
+    strategy.join()
+    factory.shutdown()
+
+    assert len(processed) == 40
+    assert try_monitor_tasks_trigger.call_count == 40
+    for monitor in range(4):
+        check_in_ids = [i for slug, i in processed if slug[-1] == str(monitor)]
+        assert check_in_ids == list(range(monitor, 40, 4))
+    commit.assert_any_call({partition: 40})
+
+
+@mock.patch("sentry.monitors.consumers.monitor_consumer.close_old_connections")
+@mock.patch("sentry.monitors.consumers.monitor_consumer._process_checkin_message")
+def test_checkin_group_closes_old_connections(process_checkin_message, close_old_connections):
+    process_checkin_message.side_effect = lambda *args: close_old_connections.assert_called_once()
+
+    ts = datetime.now()
+    _process_checkin_group([(ts, mock.Mock()), (ts, mock.Mock())])
+    assert process_checkin_message.call_count == 2
+    assert close_old_connections.call_count == 2
+
+
+@mock.patch("sentry.monitors.consumers.monitor_consumer.try_monitor_tasks_trigger")
+@mock.patch("sentry.monitors.consumers.monitor_consumer._process_checkin")
+def test_parallel_processes_check_ins_before_clock_tick(process_checkin, try_monitor_tasks_trigger):
+    events = []
+    process_checkin.side_effect = lambda params, *args: events.append(params["check_in_id"])
+    try_monitor_tasks_trigger.side_effect = lambda ts, partition: events.append(ts)
+
+    commit = mock.Mock()
+    partition = Partition(Topic("test"), 0)
+    factory = StoreMonitorCheckInStrategyFactory(mode="parallel", max_batch_size=4)
+    strategy = factory.create_with_partitions(commit, {partition: 0})
+
+    ts = datetime.now().replace(second=0, microsecond=0)
+    next_ts = ts + timedelta(minutes=1)
+    for i, message_ts in enumerate([ts, ts, next_ts, next_ts]):
+        strategy.submit(make_checkin_message(f"monitor-{i}", str(i), message_ts, i, partition))
+
+    strategy.poll()
+    strategy.join()
+    factory.shutdown()
+
+    assert events.index(next_ts) > max(events.index("0"), events.index("1"))
+    assert events.index(next_ts) < min(events.index("2"), events.index("3"))
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("mode", ["serial", "parallel"])
+@mock.patch("sentry.monitors.consumers.monitor_consumer.try_monitor_tasks_trigger")
+@mock.patch("sentry.monitors.consumers.monitor_consumer._process_checkin")
+def test_benchmark_throughput(process_checkin, try_monitor_tasks_trigger, mode, benchmark):
+    # Stands in for the Postgres round trips of processing a check-in
+    process_checkin.side_effect = lambda *args: time.sleep(0.002)
+
+    partition = Partition(Topic("test"), 0)
+    ts = datetime.now().replace(second=0, microsecond=0)
+    messages = [
+        make_checkin_message(f"monitor-{i % 50}", str(i), ts, i, partition) for i in range(500)
+    ]
+    factory = StoreMonitorCheckInStrategyFactory(mode=mode, max_batch_size=500, max_workers=16)
+
+    def run():
+        strategy = factory.create_with_partitions(mock.Mock(), {partition: 0})
+        for message in messages:
+            strategy.submit(message)
+        strategy.poll()
+        strategy.join()
+
+    benchmark(run)
+    factory.shutdown()
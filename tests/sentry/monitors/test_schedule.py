@@ -1,9 +1,37 @@
-from datetime import datetime
+import random
+from datetime import datetime, timedelta
 
+import pytest
+import pytz
+from croniter import croniter
+from django.test import override_settings
 from django.utils import timezone
 
-from sentry.monitors.schedule import get_next_schedule, get_prev_schedule
+from sentry.monitors.schedule import (
+    CrontabFireTimes,
+    _crontab_fire_times_cache,
+    get_crontab_fire_times,
+    get_next_schedule,
+    get_prev_schedule,
+)
 from sentry.monitors.types import CrontabSchedule, IntervalSchedule
+from sentry.testutils.skips import requires_pytest_benchmark
+
+CRONTABS = [
+    "* * * * *",
+    "*/5 * * * *",
+    "0 * * * *",
+    "30 2 * * *",
+    "0 */6 * * *",
+    "15,45 9-17 * * 1-5",
+    "0 0 * * 0",
+    "5 4 * * sun",
+    "0 9 1-7 * 1",
+    "0 0 1 * *",
+    "59 23 31 12 *",
+]
+
+TIMEZONES = ["UTC", "America/New_York", "Europe/Berlin", "Asia/Kolkata", "America/Santiago"]
 
 
 def t(hour: int, minute: int):
@@ -39,3 +67,105 @@ def test_get_prev_schedule():
 
     # 2 hour interval: (start = 1:30) 5:35 -> 5:30
     assert get_prev_schedule(start_ts, t(5, 35), IntervalSchedule(2, "hour")) == t(5, 30)
+
+
+@pytest.mark.parametrize("tz_name", TIMEZONES)
+@pytest.mark.parametrize("crontab", CRONTABS)
+def test_crontab_fire_times_match_croniter(crontab, tz_name):
+    tz = pytz.timezone(tz_name)
+    rng = random.Random(f"{crontab}{tz_name}")
+    fire_times = CrontabFireTimes(crontab)
+
+    reference_ts = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    for _ in range(200):
+        # Mostly moving forward like check-ins and clock ticks do, sometimes jumping around
+        step = rng.random()
+        if step < 0.7:
+            reference_ts += timedelta(minutes=rng.choice([1, 5, 60]), seconds=rng.choice([0, 59]))
+        elif step < 0.85:
+            reference_ts -= timedelta(minutes=rng.randint(0, 120))
+        else:
+            reference_ts += timedelta(days=rng.randint(-30, 90))
+        local_ts = reference_ts.astimezone(tz)
+
+        next_ts = fire_times.get_next(local_ts)
+        if next_ts is not None:
+            assert next_ts == croniter(crontab, local_ts).get_next(datetime)
+            assert next_ts.utcoffset() == local_ts.utcoffset()
+        prev_ts = fire_times.get_prev(local_ts)
+        if prev_ts is not None:
+            assert prev_ts == croniter(crontab, local_ts).get_prev(datetime)
+            assert prev_ts.utcoffset() == local_ts.utcoffset()
+
+
+def test_crontab_fire_times_across_utc_offset_change():
+    berlin = pytz.timezone("Europe/Berlin")
+    crontab = "30 2 * * *"
+    fire_times = CrontabFireTimes(crontab)
+    # 02:30 does not exist on the day daylight saving time starts
+    reference_ts = berlin.localize(datetime(2023, 3, 25, 12, 0))
+
+    assert fire_times.get_next(reference_ts) is None
+    assert fire_times.get_prev(reference_ts) == berlin.localize(datetime(2023, 3, 25, 2, 30))
+    assert get_next_schedule(reference_ts, CrontabSchedule(crontab)) == croniter(
+        crontab, reference_ts
+    ).get_next(datetime)
+
+    reference_ts = berlin.localize(datetime(2023, 3, 27, 12, 0))
+    assert fire_times.get_next(reference_ts) == berlin.localize(datetime(2023, 3, 28, 2, 30))
+    assert fire_times.get_prev(reference_ts) == berlin.localize(datetime(2023, 3, 27, 2, 30))
+
+
+def test_crontab_fire_times_on_fire_time():
+    fire_times = CrontabFireTimes("0 * * * *")
+    assert fire_times.get_next(t(5, 0)) == t(6, 0)
+    assert fire_times.get_prev(t(5, 0)) == t(4, 0)
+    assert fire_times.get_next(t(4, 0)) == t(5, 0)
+    assert fire_times.get_prev(t(6, 0)) == t(5, 0)
+
+
+def test_get_crontab_fire_times():
+    _crontab_fire_times_cache.clear()
+
+    with override_settings(SENTRY_MONITORS_SCHEDULE_CACHE_SIZE=0):
+        assert get_crontab_fire_times("0 * * * *", timezone.utc) is None
+        assert get_next_schedule(t(5, 30), CrontabSchedule("0 * * * *")) == t(6, 0)
+
+    with override_settings(SENTRY_MONITORS_SCHEDULE_CACHE_SIZE=2):
+        fire_times = get_crontab_fire_times("0 * * * *", timezone.utc)
+        assert fire_times is not None
+        assert get_crontab_fire_times("0 * * * *", timezone.utc) is fire_times
+
+        # pytz timezones are keyed by name, not by their offset
+        new_york = pytz.timezone("America/New_York")
+        summer = new_york.localize(datetime(2023, 7, 1))
+        winter = new_york.localize(datetime(2023, 1, 1))
+        assert summer.tzinfo is not winter.tzinfo
+        assert get_crontab_fire_times("0 * * * *", summer.tzinfo) is get_crontab_fire_times(
+            "0 * * * *", winter.tzinfo
+        )
+        assert get_crontab_fire_times("0 * * * *", summer.tzinfo) is not fire_times
+
+        get_crontab_fire_times("30 * * * *", timezone.utc)
+        assert get_crontab_fire_times("0 * * * *", timezone.utc) is not fire_times
+    _crontab_fire_times_cache.clear()
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("cache_size", [0, 1000])
+def test_benchmark_get_next_schedule(cache_size, benchmark):
+    schedules = [CrontabSchedule(crontab) for crontab in CRONTABS]
+    reference_times = [
+        datetime(2023, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=minute)
+        for minute in range(60)
+    ]
+
+    def run():
+        for reference_ts in reference_times:
+            for schedule in schedules:
+                get_next_schedule(reference_ts, schedule)
+                get_prev_schedule(reference_ts, reference_ts, schedule)
+
+    with override_settings(SENTRY_MONITORS_SCHEDULE_CACHE_SIZE=cache_size):
+        benchmark(run)
+    _crontab_fire_times_cache.clear()
@@ -11,6 +11,7 @@ from confluent_kafka.admin import PartitionMetadata
 from django.test import override_settings
 from django.utils import timezone
 
+from sentry.monitors.logic.mark_failed import mark_failed_bulk
 from sentry.monitors.models import (
     CheckInStatus,
     Monitor,
@@ -21,12 +22,15 @@ from sentry.monitors.models import (
     MonitorType,
     ScheduleType,
 )
+from sentry.monitors.schedule import get_prev_schedule
 from sentry.monitors.tasks import (
     check_missing,
     check_timeout,
     clock_pulse,
     mark_checkin_timeout,
+    mark_checkins_timeout,
     mark_environment_missing,
+    mark_environments_missing,
     try_monitor_tasks_trigger,
 )
 from sentry.testutils.cases import TestCase
@@ -981,6 +985,204 @@ class MonitorTaskCheckTimeoutTest(TestCase):
         ).exists()
 
 
+class MonitorTaskBulkFailureEvaluationTest(TestCase):
+    def create_monitor_environment(self, schedule_type, schedule, **kwargs):
+        monitor = Monitor.objects.create(
+            organization_id=self.organization.id,
+            project_id=self.project.id,
+            type=MonitorType.CRON_JOB,
+            config={
+                "schedule_type": schedule_type,
+                "schedule": schedule,
+                "checkin_margin": None,
+                "max_runtime": None,
+            },
+        )
+        return MonitorEnvironment.objects.create(
+            monitor=monitor,
+            environment=self.create_environment(project=self.project),
+            status=MonitorStatus.OK,
+            **kwargs,
+        )
+
+    @mock.patch("sentry.monitors.tasks.BULK_EVALUATION_CHUNK_SIZE", 2)
+    @mock.patch("sentry.monitors.tasks.mark_environment_missing")
+    @mock.patch("sentry.monitors.tasks.mark_environments_missing")
+    def test_check_missing_dispatches_chunks(
+        self, mark_environments_missing_mock, mark_environment_missing_mock
+    ):
+        task_run_ts, sub_task_run_ts, ts = make_ref_time()
+        monitor_environment_ids = {
+            self.create_monitor_environment(
+                ScheduleType.CRONTAB,
+                "* * * * *",
+                last_checkin=ts - timedelta(minutes=2),
+                next_checkin=ts - timedelta(minutes=1),
+                next_checkin_latest=ts,
+            ).id
+            for _ in range(3)
+        }
+
+        with self.options({"crons.bulk-failure-evaluation": True}):
+            check_missing(task_run_ts)
+
+        assert mark_environment_missing_mock.delay.call_count == 0
+        calls = mark_environments_missing_mock.delay.mock_calls
+        assert [len(call.args[0]) for call in calls] == [2, 1]
+        assert {id for call in calls for id in call.args[0]} == monitor_environment_ids
+        assert all(call.args[1] == sub_task_run_ts for call in calls)
+
+    def test_mark_environments_missing(self):
+        task_run_ts, sub_task_run_ts, ts = make_ref_time()
+        monitor_environments = [
+            self.create_monitor_environment(
+                ScheduleType.CRONTAB,
+                "* * * * *",
+                last_checkin=ts - timedelta(minutes=2),
+                next_checkin=ts - timedelta(minutes=1),
+                next_checkin_latest=ts,
+            )
+            for _ in range(2)
+        ]
+        # XXX: The invalid schedule causes an exception, which must not fail the other
+        # monitor environments
+        failing_monitor_environment = self.create_monitor_environment(
+            ScheduleType.INTERVAL,
+            [-2, "minute"],
+            last_checkin=ts - timedelta(minutes=2),
+            next_checkin=ts - timedelta(minutes=1),
+            next_checkin_latest=ts,
+        )
+
+        with mock.patch(
+            "sentry.monitors.tasks.get_prev_schedule", wraps=get_prev_schedule
+        ) as get_prev_schedule_mock:
+            mark_environments_missing(
+                [env.id for env in monitor_environments] + [failing_monitor_environment.id],
+                sub_task_run_ts,
+            )
+        # Computed once for the shared schedule
+        assert get_prev_schedule_mock.call_count == 2
+
+        for monitor_environment in monitor_environments:
+            monitor_environment.refresh_from_db()
+            assert monitor_environment.status == MonitorStatus.MISSED_CHECKIN
+            assert monitor_environment.last_checkin == ts - timedelta(minutes=2)
+            assert monitor_environment.next_checkin == ts
+
+            missed_checkin = MonitorCheckIn.objects.get(
+                monitor_environment=monitor_environment.id, status=CheckInStatus.MISSED
+            )
+            assert missed_checkin.date_added == ts - timedelta(minutes=1)
+            assert missed_checkin.expected_time == ts - timedelta(minutes=1)
+            assert missed_checkin.monitor_config == monitor_environment.monitor.config
+
+        failing_monitor_environment.refresh_from_db()
+        assert failing_monitor_environment.status == MonitorStatus.OK
+
+    def test_mark_environments_missing_after_newer_checkin(self):
+        task_run_ts, sub_task_run_ts, ts = make_ref_time()
+        monitor_environment = self.create_monitor_environment(
+            ScheduleType.CRONTAB,
+            "* * * * *",
+            last_checkin=ts - timedelta(minutes=2),
+            next_checkin=ts - timedelta(minutes=1),
+            next_checkin_latest=ts,
+        )
+        checkin = MonitorCheckIn.objects.create(
+            monitor=monitor_environment.monitor,
+            monitor_environment=monitor_environment,
+            project_id=self.project.id,
+            status=CheckInStatus.MISSED,
+            date_added=ts - timedelta(minutes=1),
+        )
+        # A check-in was processed after the monitor environment was found to be missed
+        MonitorEnvironment.objects.filter(id=monitor_environment.id).update(
+            last_checkin=ts, next_checkin=ts + timedelta(minutes=1)
+        )
+
+        mark_failed_bulk([(checkin, sub_task_run_ts)])
+
+        monitor_environment.refresh_from_db()
+        assert monitor_environment.status == MonitorStatus.OK
+        assert monitor_environment.next_checkin == ts + timedelta(minutes=1)
+
+    def test_mark_checkins_timeout(self):
+        task_run_ts, sub_task_run_ts, ts = make_ref_time(hour=0, minute=0)
+        timeout_ts = sub_task_run_ts + timedelta(minutes=30)
+
+        # Schedule is once a day
+        monitor_environment = self.create_monitor_environment(
+            ScheduleType.CRONTAB,
+            "0 0 * * *",
+            last_checkin=ts,
+            next_checkin=ts + timedelta(hours=24),
+            next_checkin_latest=ts + timedelta(hours=24, minutes=1),
+        )
+        checkin = MonitorCheckIn.objects.create(
+            monitor=monitor_environment.monitor,
+            monitor_environment=monitor_environment,
+            project_id=self.project.id,
+            status=CheckInStatus.IN_PROGRESS,
+            date_added=ts,
+            date_updated=ts,
+            timeout_at=ts + timedelta(minutes=30),
+        )
+
+        # A newer check-in completed while this one was still in progress
+        completed_monitor_environment = self.create_monitor_environment(
+            ScheduleType.CRONTAB,
+            "0 0 * * *",
+            last_checkin=ts,
+            next_checkin=ts + timedelta(hours=24),
+            next_checkin_latest=ts + timedelta(hours=24, minutes=1),
+        )
+        stale_checkin = MonitorCheckIn.objects.create(
+            monitor=completed_monitor_environment.monitor,
+            monitor_environment=completed_monitor_environment,
+            project_id=self.project.id,
+            status=CheckInStatus.IN_PROGRESS,
+            date_added=ts - timedelta(hours=24),
+            date_updated=ts - timedelta(hours=24),
+            timeout_at=ts - timedelta(hours=23, minutes=30),
+        )
+        MonitorCheckIn.objects.create(
+            monitor=completed_monitor_environment.monitor,
+            monitor_environment=completed_monitor_environment,
+            project_id=self.project.id,
+            status=CheckInStatus.OK,
+            date_added=ts,
+            date_updated=ts,
+        )
+
+        with mock.patch(
+            "sentry.monitors.tasks.mark_checkins_timeout"
+        ) as mark_checkins_timeout_mock:
+            with self.options({"crons.bulk-failure-evaluation": True}):
+                check_timeout(task_run_ts + timedelta(minutes=30))
+        assert mark_checkins_timeout_mock.delay.call_count == 1
+        checkin_ids, reference_ts = mark_checkins_timeout_mock.delay.mock_calls[0].args
+        assert set(checkin_ids) == {checkin.id, stale_checkin.id}
+        assert reference_ts == timeout_ts
+
+        mark_checkins_timeout(checkin_ids, timeout_ts)
+
+        assert (
+            MonitorCheckIn.objects.filter(
+                id__in=[checkin.id, stale_checkin.id], status=CheckInStatus.TIMEOUT
+            ).count()
+            == 2
+        )
+
+        monitor_environment.refresh_from_db()
+        assert monitor_environment.status == MonitorStatus.TIMEOUT
+        # Next check-in time has NOT changed
+        assert monitor_environment.next_checkin == ts + timedelta(hours=24)
+
+        completed_monitor_environment.refresh_from_db()
+        assert completed_monitor_environment.status == MonitorStatus.OK
+
+
 @override_settings(KAFKA_INGEST_MONITORS="monitors-test-topic")
 @override_settings(SENTRY_EVENTSTREAM="sentry.eventstream.kafka.KafkaEventStream")
 @mock.patch("sentry.monitors.tasks._checkin_producer")
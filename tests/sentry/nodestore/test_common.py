@@ -3,8 +3,10 @@ Testsuite of backend-independent nodestore tests. Add your backend to the
 `ns` fixture to have it tested.
 """
 from contextlib import nullcontext
+from unittest import mock
 
 import pytest
+from django.test import override_settings
 
 from sentry.nodestore.django.backend import DjangoNodeStorage
 from sentry.testutils.silo import region_silo_test
@@ -42,6 +44,20 @@ def test_get_multi(ns):
     assert result == {n[0]: n[1] for n in nodes}
 
 
+@region_silo_test
+def test_get_multi_lazy(ns):
+    nodes = [("a" * 32, {"foo": "a", "_ref": 1}), ("b" * 32, {"foo": "b"})]
+
+    ns.set(nodes[0][0], nodes[0][1])
+    ns.set(nodes[1][0], nodes[1][1])
+
+    with mock.patch.object(ns, "cache", None):
+        result = ns.get_multi([nodes[0][0], nodes[1][0]], lazy=True)
+    assert result[nodes[0][0]].pop("_ref") == 1
+    assert not result[nodes[0][0]].is_decoded
+    assert result == {nodes[0][0]: {"foo": "a"}, nodes[1][0]: {"foo": "b"}}
+
+
 @region_silo_test
 def test_set(ns):
     node_id = "d2502ebbd7df41ceba8d3275595cac33"
@@ -50,6 +66,23 @@ def test_set(ns):
     assert ns.get(node_id) == data
 
 
+@region_silo_test
+def test_set_multi(ns):
+    nodes = {"a" * 32: {"foo": "a"}, "b" * 32: {"foo": "b"}}
+    ns.set_subkeys("a" * 32, {None: {"foo": "old"}, "reprocessing": {"foo": "old"}})
+
+    ns.set_multi(nodes)
+
+    assert ns.get_multi(list(nodes)) == nodes
+    assert ns.get("a" * 32, subkey="reprocessing") is None
+
+
+def test_set_multi_is_exposed():
+    from sentry import nodestore
+
+    assert callable(nodestore.set_multi)
+
+
 @region_silo_test
 def test_delete(ns):
     node_id = "d2502ebbd7df41ceba8d3275595cac33"
@@ -97,3 +130,39 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@region_silo_test
+def test_local_cache(ns):
+    # Bypass the Django cache so that reads only hit the local cache or the backend.
+    with override_settings(
+        SENTRY_NODESTORE_LOCAL_CACHE_OPTIONS={"max_bytes": 1024 * 1024, "ttl": 60}
+    ), mock.patch.object(ns, "cache", None):
+        ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+        ns.set("node_2", {"foo": "c"})
+
+        assert ns.get_multi(["node_1", "node_2"]) == {
+            "node_1": {"foo": "a"},
+            "node_2": {"foo": "c"},
+        }
+
+        with mock.patch.object(ns, "_get_bytes_multi") as get_bytes_multi, mock.patch.object(
+            ns, "_get_bytes"
+        ) as get_bytes:
+            get_bytes_multi.return_value = {}
+            assert ns.get_multi(["node_1", "node_2"]) == {
+                "node_1": {"foo": "a"},
+                "node_2": {"foo": "c"},
+            }
+            assert ns.get_multi(["node_1"], subkey="other") == {"node_1": {"foo": "b"}}
+            assert ns.get("node_1", subkey="other") == {"foo": "b"}
+            assert ns.get("node_2", subkey="other") is None
+            assert get_bytes_multi.call_args_list == [mock.call([])] * 2
+            assert not get_bytes.called
+
+        # writes and deletes invalidate the cached node
+        ns.set("node_1", {"foo": "d"})
+        assert ns.get("node_1") == {"foo": "d"}
+        assert ns.get("node_1", subkey="other") is None
+        ns.delete("node_2")
+        assert ns.get("node_2") is None
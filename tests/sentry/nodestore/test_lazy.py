@@ -0,0 +1,139 @@
+import os
+import pickle
+import tracemalloc
+import zlib
+
+import pytest
+
+from sentry.db.models.fields.node import NodeData, NodeIntegrityFailure
+from sentry.nodestore.base import json_dumps
+from sentry.nodestore.lazy import LazyNodeData
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import json
+
+SAMPLE_PATH = os.path.join(
+    os.path.dirname(__file__), *[".."] * 3, "src", "sentry", "data", "samples", "react-native.json"
+)
+
+
+def encode(data):
+    return json_dumps(data).encode("utf8")
+
+
+def test_peek_reads_leading_keys_without_decoding():
+    data = LazyNodeData(encode({"_ref": 1, "_ref_version": 2, "a": {"b": [1, "}"]}, "c": None}))
+    assert data.peek(["_ref", "_ref_version", "missing"]) == {"_ref": 1, "_ref_version": 2}
+    assert data.peek(["a"]) == {"a": {"b": [1, "}"]}}
+    assert data.peek(["c"]) == {"c": None}
+    assert not data.is_decoded
+    assert data == {"_ref": 1, "_ref_version": 2, "a": {"b": [1, "}"]}, "c": None}
+    assert data.is_decoded
+
+
+def test_peek_escaped_keys():
+    data = LazyNodeData(b'{"a\\"b":1,"b":"x\\"y","c":2}')
+    assert data.peek(['a"b', "c"]) == {'a"b': 1, "c": 2}
+    assert not data.is_decoded
+
+
+def test_peek_unsorted_falls_back_to_decode():
+    data = LazyNodeData(b'{"b":1,"a":2}')
+    assert data.peek(["a"]) == {"a": 2}
+    assert data.is_decoded
+
+
+def test_pop_unsorted():
+    data = LazyNodeData(b'{"b":1,"_ref":2}')
+    assert data.pop("_ref") == 2
+    assert data.is_decoded
+    assert data == {"b": 1}
+
+
+def test_pop():
+    data = LazyNodeData(compressed=zlib.compress(encode({"_ref": 1, "foo": "bar"})))
+    assert data.pop("_ref") == 1
+    assert data.pop("_ref", None) is None
+    assert data.pop("missing", "default") == "default"
+    with pytest.raises(KeyError):
+        data.pop("missing")
+    assert not data.is_decoded
+    assert dict(data) == {"foo": "bar"}
+    assert data.pop("foo") == "bar"
+    assert data.decode() == {}
+
+
+def test_mutation_and_pickle():
+    data = LazyNodeData(encode({"foo": "bar"}))
+    data["baz"] = 1
+    assert len(data) == 2
+    assert "baz" in data
+    del data["foo"]
+    assert pickle.loads(pickle.dumps(data)) == {"baz": 1}
+    assert type(pickle.loads(pickle.dumps(data))) is dict
+
+
+def test_bool():
+    assert not LazyNodeData(b"")
+    assert not LazyNodeData(compressed=None)
+    assert LazyNodeData(b"{}")
+    data = LazyNodeData(b"{}")
+    data.decode()
+    assert not data
+
+
+wrapped = []
+
+
+def wrapper(data):
+    wrapped.append(data)
+    return dict(data, wrapped=True)
+
+
+def test_node_data_binds_lazily():
+    wrapped.clear()
+    node = NodeData("a" * 32, wrapper=wrapper)
+    node.bind_data(LazyNodeData(encode({"_ref": 1, "_ref_version": 2, "foo": "bar"})), ref=1)
+    assert node.ref == 1
+    assert not wrapped
+
+    assert node["foo"] == "bar"
+    assert node.data == {"foo": "bar", "wrapped": True}
+    assert len(wrapped) == 1
+
+    node = NodeData("a" * 32, wrapper=wrapper)
+    node.bind_data(LazyNodeData(encode({"foo": "bar"})))
+    restored = pickle.loads(pickle.dumps(node))
+    assert restored.data == {"foo": "bar", "wrapped": True}
+
+
+def test_node_data_lazy_ref_mismatch():
+    node = NodeData("a" * 32, ref_version=2)
+    with pytest.raises(NodeIntegrityFailure):
+        node.bind_data(LazyNodeData(encode({"_ref": 1, "_ref_version": 2})), ref=3)
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("path", ["eager", "lazy"])
+def test_benchmark_bind(path, benchmark):
+    with open(SAMPLE_PATH, "rb") as f:
+        sample = json.loads(f.read())
+    buffers = [encode(dict(sample, _ref=i, _ref_version=2)) for i in range(50)]
+
+    def bind():
+        nodes = []
+        for i, buffer in enumerate(buffers):
+            node = NodeData(str(i), ref_version=2)
+            if path == "eager":
+                node.bind_data(json.loads(buffer), ref=i)
+            else:
+                node.bind_data(LazyNodeData(buffer), ref=i)
+            nodes.append(node)
+        return nodes
+
+    tracemalloc.start()
+    try:
+        bind()
+        benchmark.extra_info["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    benchmark(bind)
@@ -0,0 +1,41 @@
+from sentry.nodestore.local_cache import CachedNode, NodeBytesCache
+
+
+def test_cached_node_decodes_segments():
+    node = CachedNode(b'{"foo":"a"}\nother\n{"foo":"b"}\nbroken')
+    assert node.decode() == {"foo": "a"}
+    assert node.decode("other") == {"foo": "b"}
+    assert node.decode("broken") is None
+    assert node.decode("missing") is None
+
+
+def test_size_bound_evicts_least_recently_used():
+    first = CachedNode(b'{"foo":"a"}')
+    cache = NodeBytesCache(max_bytes=first.size * 2, ttl=60)
+
+    cache.set_many({"a": b'{"foo":"a"}', "b": b'{"foo":"b"}'})
+    assert cache.bytes_held == first.size * 2
+    # touch "a" so "b" is the least recently used node
+    assert set(cache.get_many(["a"])) == {"a"}
+
+    cache.set_many({"c": b'{"foo":"c"}'})
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+    assert cache.bytes_held == first.size * 2
+
+    cache.delete_many(["a", "c"])
+    assert len(cache) == 0
+    assert cache.bytes_held == 0
+
+
+def test_nodes_larger_than_the_cache_are_skipped():
+    cache = NodeBytesCache(max_bytes=8, ttl=60)
+    cache.set_many({"a": b'{"foo":"a"}', "b": None})
+    assert cache.get_many(["a", "b"]) == {}
+    assert cache.bytes_held == 0
+
+
+def test_expired_nodes_are_dropped():
+    cache = NodeBytesCache(max_bytes=1024, ttl=0)
+    cache.set_many({"a": b'{"foo":"a"}'})
+    assert cache.get_many(["a"]) == {}
+    assert cache.bytes_held == 0
@@ -0,0 +1,142 @@
+import pytest
+from django.test import override_settings
+
+from sentry.ownership.compiled import (
+    CompiledOwnershipRules,
+    FrameIndex,
+    _compiled_rules_cache,
+    _pattern_literal,
+    get_compiled_rules,
+)
+from sentry.ownership.grammar import Matcher, Owner, Rule, dump_schema, parse_rules
+from sentry.testutils.skips import requires_pytest_benchmark
+
+rules_text = r"""
+*.js                          #frontend
+path:src/sentry/*             #backend
+path:**/Components/{Button,Link}.tsx #design
+path:src/[ab]pi/*.py          #api
+path:*                        #everything
+path:C:\\app\\*.cs            #dotnet
+url:http://google.com/*       #search
+url:*/checkout/*              #payments
+module:foo.bar                #workflow
+module:*.Util.*               #java
+tags.foo:bar                  #tags
+codeowners:/src/components/   #frontend
+codeowners:frontend/*.ts      #frontend
+codeowners:docs/**            #docs
+codeowners:\filename          #escapes
+codeowners:*.{py,pyi}         #python
+codeowners:tests/file\ with\ spaces/ #tests
+"""
+
+EVENTS = [
+    {},
+    {"stacktrace": {"frames": [{"filename": "foo/bar.js"}]}},
+    {"stacktrace": {"frames": [{"filename": "src/sentry/models.py", "module": "foo.bar"}]}},
+    {"stacktrace": {"frames": [{"abs_path": "/app/web/COMPONENTS/button.tsx"}]}},
+    {"stacktrace": {"frames": [{"filename": "src/api/users.py"}, {"filename": "src/bpi/a.py"}]}},
+    {"stacktrace": {"frames": [{"filename": "C:\\app\\Program.cs"}]}},
+    {"stacktrace": {"frames": [{"filename": "foo/\\"}, {"filename": "x/\\/backslash_dir"}]}},
+    {"stacktrace": {"frames": [{"filename": "tests/file with spaces/test.py"}]}},
+    {"stacktrace": {"frames": [{"filename": "docs/index.md"}, None]}},
+    {"stacktrace": {"frames": [{"module": "com.example.Util.Strings"}]}},
+    {"request": {"url": "http://google.com/search?q=sentry"}},
+    {"request": {"url": "https://shop.example.com/checkout/cart"}},
+    {"tags": [["foo", "bar"]]},
+    {"exception": {"values": [{"stacktrace": {"frames": [{"filename": "/src/components/a.ts"}]}}]}},
+    {"threads": {"values": [{"stacktrace": {"frames": [{"filename": "frontend/app.ts"}]}}]}},
+    {
+        "platform": "java",
+        "stacktrace": {
+            "frames": [{"module": "jdk.internal.reflect.NativeMethodAccessorImpl", "filename": "X"}]
+        },
+    },
+]
+
+
+@pytest.mark.parametrize(
+    "pattern, literal",
+    [
+        ("src/sentry/*", "sentry"),
+        ("**/Components/{Button,Link}.tsx", "components"),
+        ("src/[ab]pi/*.py", "src"),
+        ("*.js", ".js"),
+        ("*", None),
+        ("**", None),
+        ("/", None),
+        ("[abc", None),
+        ("foo\\*bar", None),
+        ("ünïcode/*.py", ".py"),
+        ("ünïcode", None),
+    ],
+)
+def test_pattern_literal(pattern, literal):
+    assert _pattern_literal(pattern) == literal
+
+
+@pytest.mark.parametrize("data", EVENTS)
+def test_matching_rules_matches_rule_test(data):
+    rules = parse_rules(rules_text)
+    expected = [rule for rule in rules if rule.test(data)]
+    assert CompiledOwnershipRules(rules).matching_rules(data) == expected
+
+
+def test_frame_index():
+    data = {
+        "platform": "java",
+        "stacktrace": {"frames": [{"module": "jdk.internal.Foo", "filename": "Foo.java"}]},
+    }
+    frame_index = FrameIndex(data)
+    assert frame_index.values("module") == "jdk.internal.foo"
+    frames, keys = frame_index.munged_frames_and_keys
+    assert keys == ["filename", "abs_path", "munged_filename"]
+    assert frames[0]["munged_filename"] == "jdk/internal/Foo.java"
+    assert "jdk/internal/foo.java" in frame_index.values("path")
+
+    matcher = Matcher("codeowners", "jdk/internal/*")
+    assert matcher.test(data, frame_index) == matcher.test(data) is True
+
+
+def test_get_compiled_rules():
+    _compiled_rules_cache.clear()
+    schema = dump_schema([Rule(Matcher("path", "*.py"), [Owner("team", "backend")])])
+
+    with override_settings(SENTRY_OWNERSHIP_COMPILED_RULES_CACHE_SIZE=0):
+        assert get_compiled_rules(schema) is None
+
+    with override_settings(SENTRY_OWNERSHIP_COMPILED_RULES_CACHE_SIZE=1):
+        compiled = get_compiled_rules(schema)
+        assert compiled is not None
+        assert get_compiled_rules(dict(schema)) is compiled
+
+        other = dump_schema([Rule(Matcher("path", "*.js"), [Owner("team", "frontend")])])
+        assert get_compiled_rules(other) is not compiled
+        assert get_compiled_rules(schema) is not compiled
+    _compiled_rules_cache.clear()
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("compiled", [False, True])
+def test_benchmark_codeowners(compiled, benchmark):
+    lines = []
+    for i in range(5000):
+        lines.append(f"codeowners:src/app{i % 50}/module{i}/*.py #team{i % 20}")
+    rules = parse_rules("\n".join(lines))
+    data = {
+        "stacktrace": {
+            "frames": [
+                {"filename": f"src/app{i % 50}/module{i}/views.py", "abs_path": f"/srv/{i}.py"}
+                for i in range(0, 5000, 100)
+            ]
+        }
+    }
+    compiled_rules = CompiledOwnershipRules(rules)
+
+    def run():
+        if compiled:
+            return compiled_rules.matching_rules(data)
+        return [rule for rule in rules if rule.test(data)]
+
+    assert len(benchmark(run)) == 50
@@ -1,9 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
 from time import time
+from unittest import mock
 
+import pytest
+from redis.exceptions import RedisError
+
+from sentry.ratelimits.base import RateLimiter, RateLimitRequest
 from sentry.ratelimits.redis import RedisRateLimiter
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers.datetime import freeze_time
 from sentry.testutils.silo import region_silo_test
+from sentry.testutils.skips import requires_pytest_benchmark
 
 
 @region_silo_test
@@ -66,3 +73,53 @@ class RedisRateLimiterTest(TestCase):
             assert not limited
             assert value == 1
             assert reset_time == expected_reset_time + 5
+
+    def test_is_limited_many(self):
+        with freeze_time("2000-01-01"):
+            expected_reset_time = int(time() + 5)
+            requests = [
+                RateLimitRequest("foo", 1, window=5),
+                RateLimitRequest("foo", 1, self.project, window=5),
+                RateLimitRequest("bar", 10),
+            ]
+            assert self.backend.is_limited_many(requests) == [
+                (False, 1, expected_reset_time),
+                (False, 1, expected_reset_time),
+                (False, 1, int(time() + 60)),
+            ]
+            assert self.backend.is_limited_many(requests[:2]) == [
+                (True, 2, expected_reset_time),
+                (True, 2, expected_reset_time),
+            ]
+            assert self.backend.current_value("bar") == 1
+            assert self.backend.is_limited_many([]) == []
+
+            # the default implementation checks one key at a time
+            assert RateLimiter().is_limited_many(requests) == [(False, 0, 0)] * 3
+
+    def test_is_limited_many_redis_error(self):
+        with freeze_time("2000-01-01"), mock.patch.object(
+            self.backend.client, "pipeline"
+        ) as pipeline:
+            pipeline.return_value.execute.side_effect = RedisError()
+            assert self.backend.is_limited_many([RateLimitRequest("foo", 1, window=5)]) == [
+                (False, 0, int(time() + 5))
+            ]
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("path", ["sequential", "pipelined"])
+def test_benchmark_is_limited_many(path, benchmark):
+    backend = RedisRateLimiter()
+    requests = [RateLimitRequest(f"benchmark:{path}:{i}", 1000, window=3600) for i in range(3)]
+
+    def check(_):
+        if path == "sequential":
+            return [
+                backend.is_limited_with_value(r.key, r.limit, window=r.window) for r in requests
+            ]
+        return backend.is_limited_many(requests)
+
+    # simulate concurrent API requests sharing the connection pool
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        benchmark(lambda: list(executor.map(check, range(64))))
@@ -1,4 +1,5 @@
 from typing import Optional, Sequence
+from unittest import mock
 from unittest.mock import ANY
 
 import pytest
@@ -918,3 +919,68 @@ def test_get_metric_extraction_config_with_no_spec(default_project):
         assert config
         assert len(config["metrics"]) == 1
         assert config["metrics"][0].get("condition") is None
+
+
+@django_db_all
+def test_get_metric_extraction_config_reuses_specs_across_projects(
+    default_project, default_team, factories, django_cache
+):
+    other_project = factories.create_project(
+        organization=default_project.organization, teams=[default_team]
+    )
+    create_project_threshold(other_project, 300, TransactionMetric.LCP.value)
+
+    with Feature({ON_DEMAND_METRICS_WIDGETS: True}):
+        create_widget(["user_misery(100)"], "transaction.duration:>=1500", default_project)
+
+        with mock.patch("sentry.relay.config.metric_extraction.metrics.incr") as incr:
+            config = get_metric_extraction_config(default_project)
+            assert (
+                mock.call("on_demand_metrics.spec_cache", tags={"result": "rebuilt"})
+                in incr.mock_calls
+            )
+
+        with mock.patch("sentry.relay.config.metric_extraction.metrics.incr") as incr:
+            other_config = get_metric_extraction_config(other_project)
+            assert (
+                mock.call("on_demand_metrics.spec_cache", tags={"result": "reused"})
+                in incr.mock_calls
+            )
+            assert (
+                mock.call("on_demand_metrics.spec_cache", tags={"result": "rebuilt"})
+                not in incr.mock_calls
+            )
+
+    assert config and other_config
+    [spec] = config["metrics"]
+    [other_spec] = other_config["metrics"]
+    # Only the tags of the derived metric depend on the project.
+    assert spec["tags"][0]["condition"] == {"name": "event.duration", "op": "gt", "value": 400}
+    assert other_spec["tags"][0]["condition"] == {
+        "name": "event.measurements.lcp.value",
+        "op": "gt",
+        "value": 400,
+    }
+    assert spec["tags"][1:] == other_spec["tags"][1:]
+    assert {**spec, "tags": None} == {**other_spec, "tags": None}
+
+
+@django_db_all
+def test_get_metric_extraction_config_rebuilds_changed_widget(default_project, django_cache):
+    with Feature({ON_DEMAND_METRICS_WIDGETS: True}):
+        widget_query = create_widget(["count()"], "transaction.duration:>=1234", default_project)
+        config = get_metric_extraction_config(default_project)
+
+        widget_query.conditions = "transaction.duration:>=4321"
+        widget_query.save()
+
+        with mock.patch("sentry.relay.config.metric_extraction.metrics.incr") as incr:
+            changed_config = get_metric_extraction_config(default_project)
+            assert (
+                mock.call("on_demand_metrics.spec_cache", tags={"result": "rebuilt"})
+                in incr.mock_calls
+            )
+
+    assert config and changed_config
+    assert config["metrics"][0]["condition"]["value"] == 1234.0
+    assert changed_config["metrics"][0]["condition"]["value"] == 4321.0
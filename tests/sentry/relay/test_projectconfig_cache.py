@@ -2,7 +2,7 @@ from unittest import mock
 
 from sentry.relay.projectconfig_cache import redis
 from sentry.testutils.pytest.fixtures import django_db_all
-from sentry.utils import metrics
+from sentry.utils import json, metrics
 
 
 def test_delete_count(monkeypatch):
@@ -24,3 +24,44 @@ def test_read_write():
     my_key = "fake-dsn-1"
     cache.set_many({my_key: "my-value"})
     assert cache.get(my_key) == "my-value"
+
+
+def test_unchanged_config_is_not_rewritten(monkeypatch):
+    cache = redis.RedisProjectConfigCache()
+    config = {
+        "rev": "1",
+        "lastFetch": "2023-01-01T00:00:00Z",
+        "config": {"quotas": [{"id": "p"}], "filterSettings": {}},
+    }
+    cache.set_many({"a": config})
+
+    incr_mock = mock.Mock()
+    monkeypatch.setattr(metrics, "incr", incr_mock)
+    cache.set_many({"a": {**config, "rev": "2", "lastFetch": "2023-01-01T00:01:00Z"}})
+    # the revision of the cached config is kept
+    assert cache.get("a")["rev"] == "1"
+    assert mock.call("relay.projectconfig_cache.unchanged", amount=1) in incr_mock.call_args_list
+
+    incr_mock.reset_mock()
+    changed = {**config, "rev": "3", "config": {**config["config"], "quotas": []}}
+    cache.set_many({"a": changed})
+    assert cache.get("a") == changed
+    assert mock.call("relay.projectconfig_cache.unchanged", amount=1) not in (
+        incr_mock.call_args_list
+    )
+
+
+def test_serialized_config_round_trips():
+    config = {"rev": "1", "config": {"quotas": []}, "lastChange": "2023-01-01T00:00:00Z"}
+    serialized, digest = redis._serialize_config(config)
+    assert json.loads(serialized) == config
+    assert redis._serialize_config({**config, "rev": "2"})[1] == digest
+    assert redis._serialize_config({"rev": "1"})[0] == b'{"rev":"1"}'
+
+
+def test_evicted_config_is_rewritten():
+    cache = redis.RedisProjectConfigCache()
+    cache.set_many({"a": {"config": {"quotas": []}}})
+    cache.cluster.delete("relayconfig:a")
+    cache.set_many({"a": {"config": {"quotas": []}}})
+    assert cache.get("a") == {"config": {"quotas": []}}
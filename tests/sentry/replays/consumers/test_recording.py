@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import os
 import time
 import uuid
 import zlib
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from typing import List, Mapping
-from unittest.mock import ANY, patch
+from unittest.mock import ANY, MagicMock, patch
 
+import django
 import msgpack
+import pytest
 from arroyo.backends.kafka import KafkaPayload
 from arroyo.types import BrokerValue, Message, Partition, Topic
 from sentry_kafka_schemas.schema_types.ingest_replay_recordings_v1 import ReplayRecording
@@ -15,11 +20,17 @@ from sentry_kafka_schemas.schema_types.ingest_replay_recordings_v1 import Replay
 from sentry import options
 from sentry.models.files.file import File
 from sentry.models.organizationonboardingtask import OnboardingTask, OnboardingTaskStatus
-from sentry.replays.consumers.recording import ProcessReplayRecordingStrategyFactory
+from sentry.replays.consumers.recording import (
+    ParseProcessPool,
+    ProcessReplayRecordingStrategyFactory,
+)
 from sentry.replays.lib.storage import FilestoreBlob, RecordingSegmentStorageMeta, StorageBlob
 from sentry.replays.models import ReplayRecordingSegment
+from sentry.replays.usecases.ingest import RecordingIngestMessage, ingest_recordings
 from sentry.testutils.abstract import Abstract
 from sentry.testutils.cases import TransactionTestCase
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.utils import json
 
 
 def test_multiprocessing_strategy():
@@ -44,12 +55,127 @@ def test_multiprocessing_strategy():
     task.terminate()
 
 
+CLICK_EVENT = {
+    "type": 5,
+    "timestamp": 1674291701348,
+    "data": {
+        "tag": "breadcrumb",
+        "payload": {
+            "timestamp": 1.1,
+            "type": "default",
+            "category": "ui.click",
+            "message": "div#root > button",
+            "data": {
+                "nodeId": 1,
+                "node": {"id": 1, "tagName": "button", "attributes": {}, "textContent": "Save"},
+            },
+        },
+    },
+}
+
+
+def make_recording_ingest_message(segment_id: int, events: list) -> RecordingIngestMessage:
+    return RecordingIngestMessage(
+        retention_days=30,
+        org_id=1,
+        project_id=2,
+        replay_id=uuid.uuid4().hex,
+        key_id=None,
+        received=int(time.time()),
+        payload_with_headers=f'{{"segment_id":{segment_id}}}\n'.encode()
+        + zlib.compress(json.dumps(events).encode()),
+    )
+
+
+@django_db_all
+@pytest.mark.parametrize("use_parse_executor", [False, True])
+@patch("sentry.replays.usecases.ingest.has_feature_access", return_value=True)
+@patch("sentry.replays.usecases.ingest.emit_replay_actions")
+@patch("sentry.replays.usecases.ingest.make_storage_driver")
+def test_ingest_recordings(
+    make_storage_driver, emit_replay_actions, has_feature_access, use_parse_executor
+):
+    messages = [
+        make_recording_ingest_message(1, [CLICK_EVENT]),
+        make_recording_ingest_message(2, []),
+        make_recording_ingest_message(3, [CLICK_EVENT]),
+        RecordingIngestMessage(30, 1, 2, uuid.uuid4().hex, None, 0, b"no headers"),
+    ]
+
+    with ThreadPoolExecutor() as upload_executor, ThreadPoolExecutor() as parse_executor, patch(
+        "sentry.replays.usecases.ingest.PARSE_EXECUTOR_MIN_SEGMENT_SIZE", 0
+    ):
+        ingest_recordings(
+            messages,
+            upload_executor,
+            parse_executor if use_parse_executor else None,
+            MagicMock(),
+        )
+
+    stored = sorted(call.args[0].segment_id for call in make_storage_driver().set.call_args_list)
+    assert stored == [1, 2, 3]
+
+    # The replay actions of the batch are emitted at once, in the order of the messages.
+    (actions,) = emit_replay_actions.call_args.args
+    assert [action["replay_id"] for action in actions] == [
+        messages[0].replay_id,
+        messages[2].replay_id,
+    ]
+
+
+@django_db_all
+@patch("sentry.replays.usecases.ingest.has_feature_access", return_value=True)
+@patch("sentry.replays.usecases.ingest.emit_replay_actions")
+@patch("sentry.replays.usecases.ingest.make_storage_driver")
+@patch("sentry.replays.usecases.ingest.PARSE_EXECUTOR_MIN_SEGMENT_SIZE", 0)
+def test_ingest_recordings_parse_process_pool(
+    make_storage_driver, emit_replay_actions, has_feature_access
+):
+    messages = [make_recording_ingest_message(1, [CLICK_EVENT])]
+    # The spawned workers only need Django set up to parse segments.
+    parse_executor = ParseProcessPool(max_workers=1, initializer=django.setup)
+    try:
+        with ThreadPoolExecutor() as upload_executor:
+            ingest_recordings(messages, upload_executor, parse_executor, MagicMock())
+        (actions,) = emit_replay_actions.call_args.args
+        assert [action["replay_id"] for action in actions] == [messages[0].replay_id]
+
+        # Once a worker died, the broken pool is replaced instead of failing every batch.
+        with pytest.raises(BrokenProcessPool):
+            parse_executor.submit(os._exit, 1).result()
+        with ThreadPoolExecutor() as upload_executor:
+            ingest_recordings(messages, upload_executor, parse_executor, MagicMock())
+        (actions,) = emit_replay_actions.call_args.args
+        assert [action["replay_id"] for action in actions] == [messages[0].replay_id]
+    finally:
+        parse_executor.shutdown()
+
+
+@django_db_all
+@patch("sentry.replays.usecases.ingest.emit_replay_actions")
+@patch("sentry.replays.usecases.ingest.make_storage_driver")
+def test_ingest_recordings_upload_failure(make_storage_driver, emit_replay_actions):
+    make_storage_driver().set.side_effect = ValueError("storage unavailable")
+
+    with ThreadPoolExecutor() as upload_executor, pytest.raises(ValueError):
+        ingest_recordings(
+            [make_recording_ingest_message(1, [CLICK_EVENT])],
+            upload_executor,
+            None,
+            MagicMock(),
+        )
+
+    # Nothing is emitted for batches that are retried.
+    assert not emit_replay_actions.called
+
+
 class RecordingTestCaseMixin(TransactionTestCase):
     __test__ = Abstract(__module__, __qualname__)
 
     replay_id = uuid.uuid4().hex
     replay_recording_id = uuid.uuid4().hex
     force_synchronous = True
+    mode = "message"
 
     def assert_replay_recording_segment(self, segment_id: int, compressed: bool) -> None:
         raise NotImplementedError
@@ -63,12 +189,12 @@ class RecordingTestCaseMixin(TransactionTestCase):
             num_threads=1,
             output_block_size=1,
             force_synchronous=self.force_synchronous,
+            mode=self.mode,
         )
 
     def submit(self, messages):
-        strategy = self.processing_factory().create_with_partitions(
-            lambda x, force=False: None, None
-        )
+        factory = self.processing_factory()
+        strategy = factory.create_with_partitions(lambda x, force=False: None, None)
 
         for message in messages:
             strategy.submit(
@@ -84,6 +210,7 @@ class RecordingTestCaseMixin(TransactionTestCase):
         strategy.poll()
         strategy.join(1)
         strategy.terminate()
+        factory.shutdown()
 
     def nonchunked_messages(
         self,
@@ -233,3 +360,11 @@ class ThreadedFilestoreRecordingTestCase(FilestoreRecordingTestCase):
 
 class ThreadedStorageRecordingTestCase(StorageRecordingTestCase):
     force_synchronous = False
+
+
+class BatchedFilestoreRecordingTestCase(FilestoreRecordingTestCase):
+    mode = "batched"
+
+
+class BatchedStorageRecordingTestCase(StorageRecordingTestCase):
+    mode = "batched"
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import datetime
+import time
+from datetime import timezone
+from typing import Any
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+from snuba_sdk.column import Column
+from snuba_sdk.conditions import Condition, Op
+from snuba_sdk.function import Function
+
+from sentry.search.events.builder import QueryBuilder
+from sentry.search.events.builder.templates import (
+    QueryBuilderTemplate,
+    QueryBuilderTemplateCache,
+    _contains_datetime,
+    build_query,
+    get_template_cache,
+)
+from sentry.search.events.constants import TOTAL_COUNT_ALIAS
+from sentry.search.events.datasets.discover import DiscoverDatasetConfig
+from sentry.search.events.types import QueryBuilderConfig
+from sentry.snuba.dataset import Dataset
+from sentry.testutils.cases import TestCase
+from sentry.testutils.skips import requires_pytest_benchmark
+
+pytestmark = pytest.mark.sentry_metrics
+
+QUERIES = [
+    ("transaction.duration:>100 has:user", ["transaction", "count()", "p95()"], "-count()"),
+    ("event.type:transaction user.email:foo@example.com", ["user.email", "release"], None),
+    ("count():>10", ["transaction", "count()", "epm()"], "transaction"),
+    ("", ["project", "timestamp", "id"], "-timestamp"),
+]
+
+
+def test_contains_datetime():
+    now = datetime.datetime.now(tz=timezone.utc)
+    assert _contains_datetime([Condition(Column("timestamp"), Op.GTE, now)])
+    assert _contains_datetime(([], [Condition(Column("a"), Op.IN, [1, now])]))
+    assert not _contains_datetime([Condition(Column("a"), Op.EQ, "b"), Column("c")])
+
+
+def test_cache_key_ignores_time_window_position():
+    start = datetime.datetime(2023, 1, 1, tzinfo=timezone.utc)
+    day = datetime.timedelta(days=1)
+    params: dict[str, Any] = {"project_id": [1, 2], "start": start, "end": start + day}
+    kwargs: dict[str, Any] = {
+        "query": "has:user",
+        "selected_columns": ["count()"],
+        "config": QueryBuilderConfig(functions_acl=["foo"]),
+    }
+    key = QueryBuilderTemplateCache.get_key(Dataset.Discover, params, **kwargs)
+
+    shifted = dict(params, start=start + day, end=start + 2 * day)
+    assert QueryBuilderTemplateCache.get_key(Dataset.Discover, shifted, **kwargs) == key
+
+    longer = dict(params, end=start + 2 * day)
+    assert QueryBuilderTemplateCache.get_key(Dataset.Discover, longer, **kwargs) != key
+
+    other_projects = dict(params, project_id=[1])
+    assert QueryBuilderTemplateCache.get_key(Dataset.Discover, other_projects, **kwargs) != key
+
+    other_query = dict(kwargs, query="has:release")
+    assert QueryBuilderTemplateCache.get_key(Dataset.Discover, params, **other_query) != key
+
+    other_config = dict(kwargs, config=QueryBuilderConfig(functions_acl=["bar"]))
+    assert QueryBuilderTemplateCache.get_key(Dataset.Discover, params, **other_config) != key
+
+
+def test_cache_eviction():
+    cache = QueryBuilderTemplateCache(max_size=2, ttl=60)
+    templates = [mock.Mock(), mock.Mock(), mock.Mock()]
+    cache.set("a", templates[0])
+    cache.set("b", templates[1])
+    assert cache.get("a") is templates[0]
+    cache.set("c", templates[2])
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is templates[0]
+    assert cache.get("c") is templates[2]
+
+    cache.clear()
+    assert cache.get("a") is None
+
+
+def test_cache_expiry():
+    cache = QueryBuilderTemplateCache(max_size=2, ttl=60)
+    template = mock.Mock()
+    with mock.patch.object(time, "monotonic", return_value=100):
+        cache.set("a", template)
+    with mock.patch.object(time, "monotonic", return_value=159):
+        assert cache.get("a") is template
+    with mock.patch.object(time, "monotonic", return_value=160):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+@override_settings(SENTRY_QUERY_BUILDER_TEMPLATE_OPTIONS={"max_size": 0, "ttl": 60})
+def test_template_cache_disabled():
+    assert get_template_cache() is None
+
+
+class QueryBuilderTemplateTest(TestCase):
+    def setUp(self):
+        self.start = datetime.datetime.now(tz=timezone.utc).replace(
+            hour=10, minute=15, second=0, microsecond=0
+        ) - datetime.timedelta(days=3)
+        self.end = self.start + datetime.timedelta(days=1)
+        self.projects = [self.project.id, self.create_project().id]
+        self.params: dict[str, Any] = {
+            "project_id": self.projects,
+            "start": self.start,
+            "end": self.end,
+        }
+        self.shifted_params = dict(
+            self.params,
+            start=self.start + datetime.timedelta(hours=5),
+            end=self.end + datetime.timedelta(hours=5),
+        )
+
+    def test_bind_matches_fresh_builder(self):
+        for query, selected_columns, orderby in QUERIES:
+            kwargs = {"query": query, "selected_columns": selected_columns, "orderby": orderby}
+            builder, template = QueryBuilderTemplate.compile(
+                Dataset.Discover, self.params, **kwargs
+            )
+            assert template is not None, query
+            assert (
+                builder.get_snql_query()
+                == QueryBuilder(Dataset.Discover, self.params, **kwargs).get_snql_query()
+            )
+
+            bound = template.bind(self.shifted_params)
+            expected = QueryBuilder(Dataset.Discover, self.shifted_params, **kwargs)
+            assert bound.get_snql_query() == expected.get_snql_query(), query
+            assert bound.function_alias_map.keys() == expected.function_alias_map.keys()
+
+    def test_bind_does_not_share_state(self):
+        kwargs = {"query": "has:user", "selected_columns": ["count()"]}
+        builder, template = QueryBuilderTemplate.compile(Dataset.Discover, self.params, **kwargs)
+        assert template is not None
+        builder.add_conditions([Condition(Column("title"), Op.EQ, "foo")])
+        builder.columns.append(Column("title"))
+
+        first = template.bind(self.shifted_params)
+        first.columns.append(Column("culprit"))
+        second = template.bind(self.params)
+        assert (
+            second.get_snql_query()
+            == QueryBuilder(Dataset.Discover, self.params, **kwargs).get_snql_query()
+        )
+
+    def test_time_dependent_queries_are_not_templated(self):
+        since = self.start + datetime.timedelta(hours=1)
+        _, template = QueryBuilderTemplate.compile(
+            Dataset.Discover,
+            self.params,
+            query=f"timestamp:>{since.strftime('%Y-%m-%dT%H:%M:%S')}",
+            selected_columns=["count()"],
+        )
+        assert template is None
+
+    def test_other_aggregates_are_not_templated(self):
+        def resolve_total_count(config, alias):
+            config.builder.requires_other_aggregates = True
+            return Function("toUInt64", [5], alias)
+
+        with mock.patch.object(
+            DiscoverDatasetConfig,
+            "_resolve_total_count",
+            autospec=True,
+            side_effect=resolve_total_count,
+        ):
+            _, template = QueryBuilderTemplate.compile(
+                Dataset.Discover, self.params, selected_columns=["count()", TOTAL_COUNT_ALIAS]
+            )
+        assert template is None
+
+    @override_settings(SENTRY_QUERY_BUILDER_TEMPLATE_OPTIONS={"max_size": 10, "ttl": 60})
+    def test_build_query(self):
+        cache = get_template_cache()
+        assert cache is not None
+        cache.clear()
+        kwargs = {"query": "has:user", "selected_columns": ["transaction", "count()"]}
+
+        with mock.patch.object(
+            QueryBuilderTemplate, "bind", autospec=True, side_effect=QueryBuilderTemplate.bind
+        ) as bind:
+            first = build_query(Dataset.Discover, self.params, **kwargs)
+            assert not bind.called
+            second = build_query(Dataset.Discover, self.shifted_params, **kwargs)
+            assert bind.call_count == 1
+
+        assert first is not second
+        assert (
+            second.get_snql_query()
+            == QueryBuilder(Dataset.Discover, self.shifted_params, **kwargs).get_snql_query()
+        )
+        cache.clear()
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("path", ["resolve", "bind"])
+def test_benchmark_dashboard_queries(path, benchmark, default_project):
+    start = datetime.datetime.now(tz=timezone.utc) - datetime.timedelta(days=2)
+    params: dict[str, Any] = {
+        "project_id": [default_project.id],
+        "start": start,
+        "end": start + datetime.timedelta(days=1),
+    }
+    templates = []
+    for query, selected_columns, orderby in QUERIES:
+        _, template = QueryBuilderTemplate.compile(
+            Dataset.Discover,
+            params,
+            query=query,
+            selected_columns=selected_columns,
+            orderby=orderby,
+        )
+        templates.append(template)
+
+    def run():
+        if path == "resolve":
+            for query, selected_columns, orderby in QUERIES:
+                QueryBuilder(
+                    Dataset.Discover,
+                    params,
+                    query=query,
+                    selected_columns=selected_columns,
+                    orderby=orderby,
+                ).get_snql_query()
+        else:
+            for template in templates:
+                template.bind(params).get_snql_query()
+
+    benchmark(run)
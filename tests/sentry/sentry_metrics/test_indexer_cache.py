@@ -1,9 +1,11 @@
+import time
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 import pytest
 from django.conf import settings
 
-from sentry.sentry_metrics.indexer.cache import StringIndexerCache
+from sentry.sentry_metrics.indexer.cache import LocalLRUCache, StringIndexerCache
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.testutils.helpers.options import override_options
 from sentry.utils.cache import cache
@@ -239,3 +241,64 @@ def test_is_valid_timestamp() -> None:
 
     assert not indexer_cache._is_valid_timestamp(str(stale_ts))
     assert indexer_cache._is_valid_timestamp(str(new_ts))
+
+
+def test_local_cache_saves_round_trips(use_case_id: str) -> None:
+    local_indexer_cache = StringIndexerCache(
+        **{**settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS, "local_cache_size": 100},
+        partition_key=_PARTITION_KEY,
+    )
+    with override_options(
+        {
+            "sentry-metrics.indexer.read-new-cache-namespace": False,
+            "sentry-metrics.indexer.write-new-cache-namespace": False,
+        }
+    ), patch.object(
+        local_indexer_cache.cache, "get_many", wraps=local_indexer_cache.cache.get_many
+    ) as remote_get_many:
+        cache.clear()
+        namespace = "test"
+        values = {f"{use_case_id}:1:{i}": i for i in range(1, 51)}
+        local_indexer_cache.cache.set_many(
+            {local_indexer_cache._make_cache_key(k): v for k, v in values.items()},
+            version=local_indexer_cache.version,
+        )
+
+        # The first batch goes to the remote cache and populates the local tier
+        assert local_indexer_cache.get_many(namespace, values.keys()) == values
+        assert remote_get_many.call_count == 1
+
+        # Every following batch is served from memory
+        for _ in range(10):
+            assert local_indexer_cache.get_many(namespace, values.keys()) == values
+        assert remote_get_many.call_count == 1
+
+        # Only misses go to the remote cache
+        new_key = f"{use_case_id}:1:new"
+        assert local_indexer_cache.get_many(namespace, [*values, new_key]) == {
+            **values,
+            new_key: None,
+        }
+        assert remote_get_many.call_count == 2
+        assert list(remote_get_many.call_args[0][0]) == [
+            local_indexer_cache._make_cache_key(new_key)
+        ]
+
+        local_indexer_cache.delete(namespace, f"{use_case_id}:1:1")
+        assert local_indexer_cache.get(namespace, f"{use_case_id}:1:1") is None
+
+
+def test_local_lru_cache() -> None:
+    lru = LocalLRUCache(max_size=2)
+    assert lru.set("a", 1, ttl=60) == 0
+    assert lru.set("b", 2, ttl=60) == 0
+    assert lru.get("a") == 1
+    # "b" is the least recently used entry now
+    assert lru.set("c", 3, ttl=60) == 1
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    assert lru.get("c") == 3
+
+    with patch("time.monotonic", return_value=time.monotonic() + 61):
+        assert lru.get("a") is None
+    assert len(lru) == 1
@@ -571,3 +571,28 @@ def test_default_2022_10_27_strategy(spans: List[Span], expected: Mapping[str, L
         key: hash_values(values)
         for key, values in {**expected, "a" * 16: ["transaction name"]}.items()
     }
+
+
+def test_repeated_spans_are_grouped_once() -> None:
+    calls = []
+
+    def strategy(span: Span) -> Optional[List[str]]:
+        calls.append(span["span_id"])
+        return [span.get("description") or ""]
+
+    spans = [
+        SpanBuilder().with_span_id(c * 16).with_description("SELECT 1").build() for c in "bcd"
+    ] + [
+        SpanBuilder().with_span_id("e" * 16).with_description("SELECT 1").with_op("db").build(),
+        SpanBuilder()
+        .with_span_id("f" * 16)
+        .with_description("SELECT 1")
+        .with_fingerprint(["{{ default }}", "custom"])
+        .build(),
+    ]
+    event = {"transaction": "transaction name", "contexts": {"trace": {"span_id": "a" * 16}}}
+    results = SpanGroupingStrategy("test", [strategy]).execute({**event, "spans": spans})
+
+    assert calls == ["b" * 16, "e" * 16, "f" * 16]
+    assert results["b" * 16] == results["c" * 16] == results["d" * 16] == results["e" * 16]
+    assert results["f" * 16] == hash_values(["SELECT 1", "custom"])
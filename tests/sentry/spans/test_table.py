@@ -0,0 +1,74 @@
+import pytest
+
+from sentry.spans.table import SpanTable
+from sentry.testutils.performance_issues.event_generators import (
+    EVENTS,
+    create_event,
+    create_span,
+    modify_span_start,
+)
+from sentry.utils.performance_issues.base import get_span_duration, total_span_time
+
+
+def test_columns():
+    spans = [
+        {
+            "span_id": "a",
+            "op": "db",
+            "description": "SELECT 1",
+            "start_timestamp": 1,
+            "timestamp": 2,
+        },
+        {"span_id": "b", "parent_span_id": "a", "op": None, "start_timestamp": 1.5},
+        {"span_id": "c", "parent_span_id": "missing", "op": "db", "description": 5},
+    ]
+    table = SpanTable.from_event(create_event(spans))
+
+    assert len(table) == 3
+    assert table.ops == ["db", "", "db"]
+    assert table.ops[0] is table.ops[2]
+    assert table.descriptions == ["SELECT 1", "", ""]
+    assert list(table.durations) == [1000.0, -1500.0, 0.0]
+    assert list(table.parent_indices) == [-1, 0, -1]
+    assert table.index(spans[1]) == 1
+    assert table.index(dict(spans[1])) is None
+
+
+def test_empty_event():
+    table = SpanTable.from_event({"spans": None})
+    assert len(table) == 0
+    assert table.ops == []
+    assert list(table.durations) == []
+
+
+@pytest.mark.parametrize("event_name", sorted(EVENTS))
+def test_durations_match_timedelta(event_name):
+    spans = EVENTS[event_name].get("spans") or []
+    table = SpanTable(spans)
+    for span in spans:
+        assert table.duration(span) == get_span_duration(span).total_seconds() * 1000
+    if spans:
+        assert table.total_time(spans) == total_span_time(spans)
+
+
+def test_overlaps():
+    first = modify_span_start(create_span("db", 100), 0)
+    second = modify_span_start(create_span("db", 100), 50)
+    third = modify_span_start(create_span("db", 100), 150)
+    table = SpanTable([first, second, third])
+
+    assert table.overlaps(first, second)
+    assert not table.overlaps(first, third)
+    assert table.total_duration([first, second, third]) == pytest.approx(300)
+    assert table.max_duration([first, third]) == pytest.approx(100)
+    assert table.total_time([first, second, third]) == pytest.approx(250)
+
+
+def test_spans_outside_of_table():
+    span = modify_span_start(create_span("db", 100), 0)
+    other = modify_span_start(create_span("db", 200), 50)
+    table = SpanTable([span])
+
+    assert table.duration(other) == pytest.approx(200)
+    assert table.overlaps(span, other)
+    assert table.total_time([span, other]) == total_span_time([span, other])
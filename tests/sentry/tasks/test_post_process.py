@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import abc
+import threading
 import time
+import unittest
 import uuid
 from datetime import datetime, timedelta, timezone
 from hashlib import md5
@@ -56,12 +58,30 @@ from sentry.silo import SiloMode, unguarded_write
 from sentry.tasks.derive_code_mappings import SUPPORTED_LANGUAGES
 from sentry.tasks.merge import merge_groups
 from sentry.tasks.post_process import (
+    GENERIC_POST_PROCESS_PIPELINE,
+    GROUP_CATEGORY_POST_PROCESS_PIPELINE,
     ISSUE_OWNERS_PER_PROJECT_PER_MIN_RATELIMIT,
+    POST_PROCESS_STEP_DEPENDENCIES,
+    StepDependencies,
     feedback_filter_decorator,
+    fire_error_processed,
+    handle_auto_assignment,
+    handle_owner_assignment,
     locks,
     post_process_group,
+    process_code_mappings,
+    process_commits,
     process_event,
+    process_inbox_adds,
+    process_plugins,
+    process_replay_link,
+    process_rules,
+    process_service_hooks,
+    process_similarity,
+    process_snoozes,
     run_post_process_job,
+    schedule_pipeline,
+    sdk_crash_monitoring,
 )
 from sentry.testutils.cases import BaseTestCase, PerformanceIssueTestCase, SnubaTestCase, TestCase
 from sentry.testutils.helpers import with_feature
@@ -2612,3 +2632,84 @@ class PostProcessGroupFeedbackTest(
     @pytest.mark.skip(reason="those tests do not work with the given call_post_process_group impl")
     def test_processing_cache_cleared_with_commits(self):
         pass
+
+
+class SchedulePipelineTest(unittest.TestCase):
+    def test_dependent_steps_keep_their_order(self):
+        batches = schedule_pipeline(GROUP_CATEGORY_POST_PROCESS_PIPELINE[GroupCategory.ERROR])
+        position = {step: idx for idx, batch in enumerate(batches) for step in batch}
+        assert position[process_snoozes] < position[process_inbox_adds]
+        assert position[handle_owner_assignment] < position[handle_auto_assignment]
+        assert position[handle_auto_assignment] < position[process_rules]
+        assert position[process_rules] < position[process_service_hooks]
+        # undeclared steps run on their own
+        assert batches[position[fire_error_processed]] == [fire_error_processed]
+        assert sum(len(batch) for batch in batches) == len(
+            GROUP_CATEGORY_POST_PROCESS_PIPELINE[GroupCategory.ERROR]
+        )
+        assert len(batches) < len(GROUP_CATEGORY_POST_PROCESS_PIPELINE[GroupCategory.ERROR])
+
+    def test_conflicting_steps_never_share_a_batch(self):
+        pipelines = [*GROUP_CATEGORY_POST_PROCESS_PIPELINE.values(), GENERIC_POST_PROCESS_PIPELINE]
+        for pipeline in pipelines:
+            for batch in schedule_pipeline(pipeline):
+                if len(batch) == 1:
+                    continue
+                for idx, step in enumerate(batch):
+                    dependencies = POST_PROCESS_STEP_DEPENDENCIES.get(step)
+                    assert dependencies is not None, step
+                    for other in batch[idx + 1 :]:
+                        assert not dependencies.conflicts_with(
+                            POST_PROCESS_STEP_DEPENDENCIES[other]
+                        ), (step, other)
+
+        # these change the job's event or group in place, or run arbitrary plugins
+        batches = schedule_pipeline(GROUP_CATEGORY_POST_PROCESS_PIPELINE[GroupCategory.ERROR])
+        for step in (
+            process_commits,
+            process_plugins,
+            process_code_mappings,
+            process_similarity,
+            sdk_crash_monitoring,
+            process_replay_link,
+        ):
+            assert [step] in batches
+
+    def test_run_post_process_job_concurrently(self):
+        calls = []
+        barrier = threading.Barrier(2, timeout=5)
+
+        def read_a(job):
+            barrier.wait()
+            calls.append("read_a")
+
+        def read_b(job):
+            barrier.wait()
+            calls.append("read_b")
+
+        def write_a(job):
+            calls.append("write_a")
+            raise Exception("boom")
+
+        def undeclared(job):
+            calls.append("undeclared")
+
+        dependencies = {
+            read_a: StepDependencies(reads=frozenset(["a"])),
+            read_b: StepDependencies(reads=frozenset(["b"])),
+            write_a: StepDependencies(writes=frozenset(["a"])),
+        }
+        pipeline = [read_a, read_b, write_a, undeclared]
+        with patch.dict(POST_PROCESS_STEP_DEPENDENCIES, dependencies), patch(
+            "sentry.tasks.post_process.GENERIC_POST_PROCESS_PIPELINE", pipeline
+        ), override_options(
+            {
+                "post_process.parallel-pipeline-steps": True,
+                "post_process.parallel-pipeline-steps.workers": 4,
+            }
+        ):
+            assert schedule_pipeline(pipeline) == [[read_a, read_b], [write_a], [undeclared]]
+            run_post_process_job({"event": Mock(group=None), "is_reprocessed": False})
+
+        assert sorted(calls[:2]) == ["read_a", "read_b"]
+        assert calls[2:] == ["write_a", "undeclared"]
@@ -9,17 +9,21 @@ from sentry.db.postgres.transactions import in_test_hide_transaction_boundary
 from sentry.models.options.project_option import ProjectOption
 from sentry.models.project import Project
 from sentry.models.projectkey import ProjectKey, ProjectKeyStatus
+from sentry.quotas.base import QuotaConfig, QuotaScope
 from sentry.relay.projectconfig_cache.redis import RedisProjectConfigCache
 from sentry.relay.projectconfig_debounce_cache.redis import RedisProjectConfigDebounceCache
 from sentry.tasks.relay import (
     _schedule_invalidate_project_config,
     build_project_config,
+    compute_organization_configs,
+    compute_projectkey_config,
     invalidate_project_config,
     schedule_build_project_config,
     schedule_invalidate_project_config,
 )
 from sentry.testutils.hybrid_cloud import simulated_transaction_watermarks
 from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.testutils.skips import requires_pytest_benchmark
 
 
 def _cache_keys_for_project(project):
@@ -187,6 +191,66 @@ def test_generate(
     ]
 
 
+def _without_volatile_fields(config):
+    return {key: value for key, value in config.items() if key not in ("lastFetch", "rev")}
+
+
+@django_db_all
+def test_compute_organization_configs(
+    default_project,
+    default_organization,
+    default_projectkey,
+    default_team,
+    factories,
+    redis_cache,
+    django_cache,
+):
+    other_project = factories.create_project(
+        organization=default_organization, teams=[default_team]
+    )
+    second_key = factories.create_project_key(default_project)
+    disabled_key = factories.create_project_key(other_project)
+    disabled_key.update(status=ProjectKeyStatus.INACTIVE)
+    uncached_key = factories.create_project_key(other_project)
+    ProjectKey.objects.filter(project=other_project).exclude(
+        id__in=[disabled_key.id, uncached_key.id]
+    ).delete()
+
+    cached_keys = [default_projectkey, second_key, disabled_key]
+    redis_cache.set_many({key.public_key: {"dummy": True} for key in cached_keys})
+
+    def get_quotas(project, key=None, keys=None):
+        return [
+            QuotaConfig(id="p", scope=QuotaScope.PROJECT, scope_id=project.id, limit=1, window=1),
+            *(
+                QuotaConfig(id="k", scope=QuotaScope.KEY, scope_id=key.id, limit=1, window=1)
+                for key in keys or ()
+            ),
+        ]
+
+    with patch("sentry.quotas.backend.get_quotas", side_effect=get_quotas):
+        configs = compute_organization_configs(default_organization)
+        expected = {
+            key.public_key: compute_projectkey_config(ProjectKey.objects.get(id=key.id))
+            for key in cached_keys
+        }
+
+    assert set(configs) == set(expected)
+    for public_key, config in configs.items():
+        assert _without_volatile_fields(config) == _without_volatile_fields(expected[public_key])
+    assert configs[disabled_key.public_key] == {"disabled": True}
+    assert configs[second_key.public_key]["config"]["quotas"] == [
+        {
+            "id": "p",
+            "scope": "project",
+            "scopeId": str(default_project.id),
+            "limit": 1,
+            "window": 1,
+        },
+        {"id": "k", "scope": "key", "scopeId": str(second_key.id), "limit": 1, "window": 1},
+    ]
+
+
 @django_db_all
 def test_project_update_option(
     default_projectkey,
@@ -540,3 +604,27 @@ def test_invalidate_hierarchy(
     assert len(calls) == 1
     cache = redis_cache.get(default_projectkey)
     assert cache["disabled"] is False
+
+
+@requires_pytest_benchmark
+@django_db_all
+def test_benchmark_compute_organization_configs(
+    benchmark, default_organization, redis_cache, django_cache
+):
+    projects = Project.objects.bulk_create(
+        Project(organization=default_organization, name=f"p{i}", slug=f"p{i}") for i in range(5000)
+    )
+    keys = ProjectKey.objects.bulk_create(
+        ProjectKey(
+            project=project,
+            public_key=ProjectKey.generate_api_key(),
+            secret_key=ProjectKey.generate_api_key(),
+        )
+        for project in projects
+    )
+    redis_cache.set_many({key.public_key: {"dummy": True} for key in keys})
+
+    configs = benchmark.pedantic(
+        compute_organization_configs, args=(default_organization,), rounds=1
+    )
+    assert len(configs) == len(keys)
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+
+import pytest
+
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.tsdb.base import ONE_HOUR, ONE_MINUTE, BaseTSDB, TSDBModel
+from sentry.tsdb.columnar import SeriesMatrix
+from sentry.tsdb.inmemory import InMemoryTSDB
+
+
+def legacy_rollup(values, rollup):
+    result = {}
+    for key, points in values.items():
+        result[key] = []
+        last_new_ts = None
+        for (ts, count) in points:
+            new_ts = ts - (ts % rollup)
+            if new_ts == last_new_ts:
+                result[key][-1][1] += count
+            else:
+                result[key].append([new_ts, count])
+                last_new_ts = new_ts
+    return result
+
+
+class SeriesMatrixTest(TestCase):
+    def test_from_range(self):
+        matrix = SeriesMatrix.from_range({1: [(60, 1), (120, 2)], 2: [(60, 0), (120, 5)]})
+        assert matrix == SeriesMatrix([60, 120], {1: [1, 2], 2: [0, 5]})
+        assert matrix.to_range() == {1: [(60, 1), (120, 2)], 2: [(60, 0), (120, 5)]}
+        assert matrix.sums() == {1: 3, 2: 5}
+
+    def test_from_range_mismatched_series(self):
+        assert SeriesMatrix.from_range({1: [(60, 1)], 2: [(120, 1)]}) is None
+        assert SeriesMatrix.from_range({1: [(120, 1), (60, 1)]}) is None
+
+    def test_align(self):
+        matrix = SeriesMatrix.align({1: [(60, 1)], 2: [(120, 2), (60, 3)]})
+        assert matrix == SeriesMatrix([60, 120], {1: [1, 0], 2: [3, 2]})
+
+    def test_merge(self):
+        a = SeriesMatrix([60, 120], {1: [1, 2], 2: [3, 4]})
+        b = SeriesMatrix([60, 120], {2: [1, 1], 3: [5, 5]})
+        assert a.merge(b) == SeriesMatrix([60, 120], {1: [1, 2], 2: [4, 5], 3: [5, 5]})
+        # inputs are left untouched
+        assert a == SeriesMatrix([60, 120], {1: [1, 2], 2: [3, 4]})
+
+        c = SeriesMatrix([120, 180], {1: [1, 1]})
+        assert a.merge(c) == SeriesMatrix([60, 120, 180], {1: [1, 3, 1], 2: [3, 4, 0]})
+
+    def test_rollup(self):
+        pre_results = {1: [(1368889980, 5), (1368890040, 10), (1368893640, 7)]}
+        matrix = SeriesMatrix.from_range(pre_results)
+        assert matrix.rollup(3600).to_range() == {1: [(1368889200, 15), (1368892800, 7)]}
+        assert SeriesMatrix([], {}).rollup(3600) == SeriesMatrix([], {})
+
+    def test_rollup_matches_legacy(self):
+        values = {
+            key: [(ts, key * ts % 7) for ts in range(1368889980, 1368889980 + 86400, 60)]
+            for key in range(10)
+        }
+        assert BaseTSDB(rollups=((ONE_MINUTE, 1),)).rollup(values, ONE_HOUR) == legacy_rollup(
+            values, ONE_HOUR
+        )
+
+    def test_base_rollup_falls_back_for_mismatched_series(self):
+        values = {1: [(3600, 1), (3660, 2)], 2: [(7200, 3)]}
+        assert BaseTSDB(rollups=((ONE_MINUTE, 1),)).rollup(values, ONE_HOUR) == {
+            1: [[3600, 3]],
+            2: [[7200, 3]],
+        }
+
+
+class InMemoryTSDBTest(TestCase):
+    def setUp(self):
+        self.tsdb = InMemoryTSDB(rollups=((ONE_MINUTE, 60), (ONE_HOUR, 24)))
+        self.now = datetime(2023, 10, 1, 12, 30, tzinfo=timezone.utc)
+
+    def test_get_range_and_sums(self):
+        model = TSDBModel.group
+        for minutes in range(5):
+            timestamp = self.now - timedelta(minutes=minutes)
+            self.tsdb.incr(model, 1, timestamp=timestamp, count=minutes + 1)
+            self.tsdb.incr(model, 2, timestamp=timestamp, count=1, environment_id=5)
+
+        start = self.now - timedelta(minutes=4)
+        results = self.tsdb.get_range(model, [1, 2, 3], start, self.now, rollup=ONE_MINUTE)
+        epochs = [int((start + timedelta(minutes=i)).timestamp()) for i in range(5)]
+        assert results == {
+            1: list(zip(epochs, [5, 4, 3, 2, 1])),
+            2: list(zip(epochs, [1] * 5)),
+            3: list(zip(epochs, [0] * 5)),
+        }
+
+        assert self.tsdb.get_sums(model, [1, 2, 3], start, self.now, rollup=ONE_MINUTE) == {
+            1: 15,
+            2: 5,
+            3: 0,
+        }
+        assert self.tsdb.get_sums(
+            model, [1, 2], start, self.now, rollup=ONE_MINUTE, environment_id=5
+        ) == {1: 0, 2: 5}
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("path", ["legacy", "columnar"])
+def test_benchmark_rollup(path, benchmark):
+    values = {
+        key: [(ts, key % 13) for ts in range(1368889980, 1368889980 + 14 * 86400, ONE_HOUR)]
+        for key in range(500)
+    }
+    if path == "legacy":
+        benchmark(legacy_rollup, values, 86400)
+    else:
+        benchmark(BaseTSDB(rollups=((ONE_MINUTE, 1),)).rollup, values, 86400)
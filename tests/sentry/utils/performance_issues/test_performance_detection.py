@@ -14,8 +14,10 @@ from sentry.issues.grouptype import (
 )
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers import override_options
-from sentry.testutils.performance_issues.event_generators import get_event
+from sentry.testutils.performance_issues.event_generators import EVENTS, get_event
+from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.testutils.silo import no_silo_test, region_silo_test
+from sentry.testutils.skips import requires_pytest_benchmark
 from sentry.utils.performance_issues.base import (
     DETECTOR_TYPE_TO_GROUP_TYPE,
     DetectorType,
@@ -24,11 +26,15 @@ from sentry.utils.performance_issues.base import (
 from sentry.utils.performance_issues.detectors.n_plus_one_db_span_detector import (
     NPlusOneDBSpanDetector,
 )
+from sentry.utils.performance_issues.detectors.slow_db_query_detector import SlowDBQueryDetector
 from sentry.utils.performance_issues.performance_detection import (
+    DETECTOR_CLASSES,
     EventPerformanceProblem,
     _detect_performance_problems,
     detect_performance_problems,
     get_detection_settings,
+    run_detector_on_data,
+    run_detectors_on_data,
 )
 from sentry.utils.performance_issues.performance_problem import PerformanceProblem
 
@@ -719,3 +725,60 @@ class EventPerformanceProblemTest(TestCase):
 )
 def test_total_span_time(spans, duration):
     assert total_span_time(spans) == pytest.approx(duration, 0.01)
+
+
+def test_run_detectors_on_data_skips_irrelevant_ops():
+    settings = {
+        DetectorType.SLOW_DB_QUERY: [{"duration_threshold": 1000, "allowed_span_ops": ["db"]}]
+    }
+    event = {
+        "spans": [
+            {"span_id": "a", "op": "db.sql.query"},
+            {"span_id": "b", "op": "http.client"},
+            {"span_id": "c", "op": "db"},
+            {"span_id": "d"},
+        ]
+    }
+    detector = SlowDBQueryDetector(settings, event)
+    with patch.object(detector, "visit_span") as visit_span:
+        run_detectors_on_data([detector], event)
+
+    assert [c.args[0]["span_id"] for c in visit_span.call_args_list] == ["a", "c", "d"]
+
+
+@django_db_all
+@pytest.mark.parametrize("event_name", sorted(EVENTS))
+def test_run_detectors_on_data_matches_separate_runs(event_name):
+    settings = get_detection_settings()
+    event = get_event(event_name)
+
+    separate = [detector_class(settings, event) for detector_class in DETECTOR_CLASSES]
+    for detector in separate:
+        run_detector_on_data(detector, event)
+
+    fused = [detector_class(settings, event) for detector_class in DETECTOR_CLASSES]
+    run_detectors_on_data(fused, event)
+
+    assert [detector.stored_problems for detector in fused] == [
+        detector.stored_problems for detector in separate
+    ]
+
+
+@requires_pytest_benchmark
+@django_db_all
+@pytest.mark.parametrize("path", ["separate", "fused"])
+def test_benchmark_run_detectors(path, benchmark):
+    settings = get_detection_settings()
+    # A single transaction with the spans of all fixtures, several thousand spans in total.
+    event = get_event("n-plus-one-in-django-index-view")
+    event["spans"] = [span for name in sorted(EVENTS) for span in EVENTS[name].get("spans", [])] * 5
+
+    def run():
+        detectors = [detector_class(settings, event) for detector_class in DETECTOR_CLASSES]
+        if path == "separate":
+            for detector in detectors:
+                run_detector_on_data(detector, event)
+        else:
+            run_detectors_on_data(detectors, event)
+
+    benchmark(run)
@@ -1,12 +1,13 @@
 import time
 from copy import deepcopy
 from datetime import timedelta, timezone
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 from uuid import uuid4
 
 import pytest
 from django.utils.timezone import now
 
+from sentry import tsdb
 from sentry.issues.grouptype import PerformanceNPlusOneGroupType
 from sentry.models.rule import Rule
 from sentry.rules.conditions.event_frequency import (
@@ -17,6 +18,7 @@ from sentry.rules.conditions.event_frequency import (
 from sentry.testutils.abstract import Abstract
 from sentry.testutils.cases import PerformanceIssueTestCase, RuleTestCase, SnubaTestCase
 from sentry.testutils.helpers.datetime import before_now, freeze_time, iso_format
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.silo import region_silo_test
 from sentry.testutils.skips import requires_snuba
 from sentry.utils.samples import load_data
@@ -485,3 +487,77 @@ class PerfIssuePlatformIssueEventFrequencyPercentConditionTestCase(
     EventFrequencyPercentConditionTestCase,
 ):
     pass
+
+
+@freeze_time((now() - timedelta(days=2)).replace(hour=12, minute=40, second=0, microsecond=0))
+@region_silo_test
+class BatchedEventFrequencyQueryTestCase(ErrorEventMixin, RuleTestCase):
+    rule_cls = EventFrequencyCondition
+
+    def test_comparison_windows_are_queried_together(self):
+        events = [
+            self.add_event(
+                data={"fingerprint": [f"group-{i}"]},
+                project_id=self.project.id,
+                timestamp=before_now(minutes=1),
+            )
+            for i in range(3)
+        ]
+        wrapped_tsdb = Mock(wraps=tsdb)
+        rule = self.get_rule(
+            data={
+                "interval": "5m",
+                "value": 100,
+                "comparisonType": "percent",
+                "comparisonInterval": "1h",
+            },
+            tsdb=wrapped_tsdb,
+        )
+
+        with override_options({"rules.event-frequency.batch-queries": True}):
+            for event in events:
+                self.assertDoesNotPass(rule, event)
+
+            # Once the window moves on, the first evaluation resolves the comparison window of
+            # all known groups, the others are served from the cache.
+            wrapped_tsdb.get_sums.reset_mock()
+            with freeze_time(before_now(minutes=-2)):
+                for event in reversed(events):
+                    self.assertDoesNotPass(rule, event)
+
+        # The windows including the event are queried for each event's group alone
+        calls = [call[1] for call in wrapped_tsdb.get_sums.call_args_list]
+        assert [call["keys"] for call in calls if call["end"] > events[0].datetime] == [
+            [event.group_id] for event in reversed(events)
+        ]
+        comparison_calls = [call for call in calls if call["end"] <= events[0].datetime]
+        assert len(comparison_calls) == 1
+        assert set(comparison_calls[0]["keys"]) == {event.group_id for event in events}
+
+    def test_windows_including_the_event_are_not_batched(self):
+        events = [
+            self.add_event(
+                data={"fingerprint": [f"group-{i}"]},
+                project_id=self.project.id,
+                timestamp=before_now(minutes=1),
+            )
+            for i in range(2)
+        ]
+        wrapped_tsdb = Mock(wraps=tsdb)
+        rule = self.get_rule(data={"interval": "1h", "value": 1}, tsdb=wrapped_tsdb)
+
+        with override_options({"rules.event-frequency.batch-queries": True}):
+            self.assertDoesNotPass(rule, events[0])
+            self.assertDoesNotPass(rule, events[1])
+            self.add_event(
+                data={"fingerprint": ["group-0"]},
+                project_id=self.project.id,
+                timestamp=before_now(minutes=1),
+            )
+            self.assertPasses(rule, events[0])
+
+        assert [call[1]["keys"] for call in wrapped_tsdb.get_sums.call_args_list] == [
+            [events[0].group_id],
+            [events[1].group_id],
+            [events[0].group_id],
+        ]